@@ -0,0 +1,267 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable
+
+from data_generator.data_generator import TransactionGenerator
+from data_processor.data_processor import DataProcessor
+from data_processor.logging_setup import configure_logging
+from input_handler.input_handler import InputHandler
+from output_handler.output_handler import OutputHandler
+
+STAGES = ('input', 'processing', 'output', 'end_to_end')
+RESULTS_VERSION = 1
+
+
+def measure(run: Callable[[], int], measure_memory: bool = True) -> dict:
+    """
+    Runs a benchmark stage and measures its throughput and peak memory.
+
+    The stage is timed without tracemalloc, which slows allocations down, and then run a second
+    time under tracemalloc to record the peak of Python memory allocated by the stage itself.
+
+    Args:
+        run (Callable[[], int]): The stage; it returns the number of rows it handled.
+        measure_memory (bool): Whether to run the stage a second time to measure its peak memory.
+
+    Returns:
+        dict: The rows, seconds, rows_per_second and peak_memory_bytes (None when not measured).
+    """
+    started = time.perf_counter()
+    rows = run()
+    seconds = time.perf_counter() - started
+
+    peak_memory = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            run()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else None,
+        "peak_memory_bytes": peak_memory
+    }
+
+
+def run_benchmarks(input_file_path: str, output_dir: str, measure_memory: bool = True) -> dict:
+    """
+    Benchmarks InputHandler, DataProcessor and OutputHandler separately and end to end.
+
+    - input: streams every record of the input file with InputHandler.iter_records.
+    - processing: runs DataProcessor over records already read into memory.
+    - output: writes the three CSV outputs with OutputHandler.write_all.
+    - end_to_end: streams, processes and writes, like main.py.
+
+    Args:
+        input_file_path (str): The input CSV or JSON file.
+        output_dir (str): The directory the output files are written to.
+        measure_memory (bool): Whether to measure the peak memory of each stage.
+
+    Returns:
+        dict: The measurements of each stage, keyed by stage name.
+    """
+    def output_files():
+        return [os.path.join(output_dir, f'benchmark_{name}.csv')
+                for name in ('account_summaries', 'suspicious_transactions', 'transaction_statistics')]
+
+    def read_input():
+        return sum(1 for _ in InputHandler(input_file_path).iter_records())
+
+    records = list(InputHandler(input_file_path).iter_records())
+
+    def process():
+        DataProcessor(records).process_data()
+        return len(records)
+
+    results = DataProcessor(records).process_data()
+    output_handler = OutputHandler(results["account_summaries"], results["suspicious_transactions"],
+                                   results["transaction_statistics"])
+    output_rows = sum(len(results[key]) for key in results)
+
+    def write_output():
+        output_handler.write_all(*output_files())
+        return output_rows
+
+    def end_to_end():
+        processor = DataProcessor(InputHandler(input_file_path).iter_records())
+        processor.process_data()
+        OutputHandler(processor.account_summaries, processor.suspicious_transactions,
+                      processor.transaction_statistics).write_all(*output_files())
+        return processor.counters["rows_processed"]
+
+    stages = {
+        "input": read_input,
+        "processing": process,
+        "output": write_output,
+        "end_to_end": end_to_end
+    }
+    measurements = {}
+    for name in STAGES:
+        if name == "end_to_end":
+            # The in-memory records would otherwise count towards the end-to-end memory baseline
+            records = None
+        measurements[name] = measure(stages[name], measure_memory)
+    return measurements
+
+
+def benchmark(rows: int, file_format: str = 'csv', seed: int = 0, work_dir: str = None,
+              measure_memory: bool = True) -> dict:
+    """
+    Generates a synthetic input file and benchmarks it.
+
+    Args:
+        rows (int): The number of transactions in the generated input.
+        file_format (str): The input format, 'csv' or 'json'.
+        seed (int): The seed of the data generator, so runs on the same data can be compared.
+        work_dir (str): The directory for the input and output files. Defaults to a temporary
+            directory that is removed afterwards.
+        measure_memory (bool): Whether to measure the peak memory of each stage.
+
+    Returns:
+        dict: The benchmark results: the run parameters, the environment and the stage measurements.
+
+    Raises:
+        ValueError: If file_format is neither 'csv' nor 'json'.
+    """
+    if file_format not in ('csv', 'json'):
+        raise ValueError(f"Unsupported file format: {file_format}")
+
+    temporary_dir = None
+    if work_dir is None:
+        work_dir = temporary_dir = tempfile.mkdtemp(prefix='fdp_benchmark_')
+    try:
+        input_file_path = os.path.join(work_dir, f'benchmark_input.{file_format}')
+        generator = TransactionGenerator(seed)
+        if file_format == 'csv':
+            generator.write_csv(input_file_path, rows)
+        else:
+            generator.write_json(input_file_path, rows)
+
+        return {
+            "version": RESULTS_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "rows": rows,
+            "format": file_format,
+            "seed": seed,
+            "input_bytes": os.path.getsize(input_file_path),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "stages": run_benchmarks(input_file_path, work_dir, measure_memory)
+        }
+    finally:
+        if temporary_dir is not None:
+            shutil.rmtree(temporary_dir, ignore_errors=True)
+
+
+def compare(results: dict, baseline: dict) -> dict:
+    """
+    Compares the throughput and peak memory of two benchmark runs, stage by stage.
+
+    Args:
+        results (dict): The results of the current run.
+        baseline (dict): The results of an earlier run.
+
+    Returns:
+        dict: For every stage in both runs, the throughput ratio (above 1 is faster) and the
+        memory ratio (below 1 uses less memory), or None where a value is missing.
+    """
+    comparison = {}
+    for name, current in results["stages"].items():
+        previous = baseline["stages"].get(name)
+        if previous is None:
+            continue
+        comparison[name] = {
+            "throughput_ratio": _ratio(current["rows_per_second"], previous["rows_per_second"]),
+            "memory_ratio": _ratio(current["peak_memory_bytes"], previous["peak_memory_bytes"])
+        }
+    return comparison
+
+
+def _ratio(current, previous):
+    """
+    Returns current / previous, or None if either value is missing or previous is zero.
+    """
+    if not current or not previous:
+        return None
+    return current / previous
+
+
+def format_results(results: dict, comparison: dict = None) -> str:
+    """
+    Formats benchmark results as a table.
+
+    Args:
+        results (dict): The benchmark results.
+        comparison (dict): An optional comparison with a baseline run, as returned by compare.
+
+    Returns:
+        str: The formatted table.
+    """
+    lines = [f"{results['rows']} rows of {results['format']} (seed {results['seed']}, "
+             f"{results['input_bytes']} bytes), Python {results['python']}",
+             f"{'stage':<12}{'rows/sec':>14}{'seconds':>10}{'peak MiB':>10}"
+             + (f"{'speed':>9}{'memory':>9}" if comparison else "")]
+    for name, stage in results["stages"].items():
+        peak = stage["peak_memory_bytes"]
+        line = (f"{name:<12}{stage['rows_per_second'] or 0:>14,.0f}{stage['seconds']:>10.3f}"
+                f"{'-' if peak is None else format(peak / 2 ** 20, '.1f'):>10}")
+        if comparison:
+            ratios = comparison.get(name, {})
+            line += ''.join(f"{'-' if ratios.get(key) is None else format(ratios[key], '.2f') + 'x':>9}"
+                            for key in ('throughput_ratio', 'memory_ratio'))
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def main(argv: list = None) -> None:
+    """Runs the benchmark suite from the command line and saves the results as JSON.
+
+    Args:
+        argv (list): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the input, processing and output stages.')
+    parser.add_argument('--rows', type=int, default=100000, help='number of generated transactions (default: 100000)')
+    parser.add_argument('--format', choices=('csv', 'json'), default='csv', help='input format (default: csv)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the data generator (default: 0)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the tracemalloc pass, which runs every stage a second time')
+    parser.add_argument('--results', metavar='PATH',
+                        help='file the results are saved to (default: benchmark/results/<timestamp>.json)')
+    parser.add_argument('--compare', metavar='PATH', help='results file of an earlier run to compare against')
+    arguments = parser.parse_args(argv)
+
+    # Writing a warning for every suspicious transaction would make the console the bottleneck
+    configure_logging(logging.ERROR)
+    results = benchmark(arguments.rows, arguments.format, arguments.seed, measure_memory=not arguments.no_memory)
+
+    results_path = arguments.results
+    if results_path is None:
+        results_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+        os.makedirs(results_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        results_path = os.path.join(results_dir, f'{timestamp}_{arguments.format}_{arguments.rows}.json')
+    with open(results_path, 'w') as results_file:
+        json.dump(results, results_file, indent=2)
+
+    comparison = None
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            comparison = compare(results, json.load(baseline_file))
+    print(format_results(results, comparison))
+    print(f"Results saved to {results_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+import cProfile
+import json
+import os
+import pstats
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+METRICS_VERSION = 1
+
+
+class StageProfiler:
+    """
+    Records wall time, CPU time, rows/sec and peak allocated memory for each stage of a run.
+
+    Stages are measured one after another with the `stage` context manager. Memory is traced with
+    tracemalloc from the moment the profiler starts, so allocations are slower while it is active;
+    the peak reported for a stage is the most memory allocated on top of what was already allocated
+    when the stage started. A stage can also be run under cProfile, whose statistics are saved to a
+    .prof file that can be opened with pstats or snakeviz.
+
+    A stage that is streamed into another one, such as reading the rows a processing stage consumes,
+    is measured with `timed_rows`: the time spent producing its rows is recorded as its own stage
+    and taken out of the stage it ran in, so the run keeps its production code path.
+
+    Attributes:
+        stages (dict): The measurements of each finished stage, keyed by stage name.
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        """
+        Initializes the profiler and starts tracing memory allocations.
+
+        Args:
+            trace_memory (bool): Whether to measure the peak allocated memory of each stage.
+        """
+        self.__trace_memory = trace_memory
+        self.__stages = {}
+        self.__open_stages = []
+        self.__started_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracing = True
+
+    @property
+    def stages(self):
+        """
+        Gets the measurements of each finished stage.
+
+        Returns:
+            dict: Dictionaries with the wall_seconds, cpu_seconds, rows, rows_per_second,
+            peak_memory_bytes and, when profiled, profile_file of each stage.
+        """
+        return self.__stages
+
+    @contextmanager
+    def stage(self, name: str, profile_file: str = None):
+        """
+        Measures the code run inside the with block as one stage.
+
+        The block receives a dictionary in which it can set "rows" to the number of rows it handled.
+
+        Args:
+            name (str): The stage name, e.g. "read".
+            profile_file (str): If given, the stage runs under cProfile and its statistics are
+                saved to this file.
+
+        Returns:
+            Iterator[dict]: The stage measurement, completed when the block exits.
+        """
+        measurement = {"rows": None}
+        self.__open_stages.append(name)
+        if self.__trace_memory:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        profiler = cProfile.Profile() if profile_file else None
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield measurement
+        finally:
+            if profiler:
+                profiler.disable()
+            self.__open_stages.pop()
+            wall_seconds = time.perf_counter() - wall_started
+            cpu_seconds = time.process_time() - cpu_started
+            # Take out the time of the stages streamed into this one
+            for streamed in self.__stages.values():
+                if streamed.get("streamed_into") == name:
+                    wall_seconds -= streamed["wall_seconds"]
+                    cpu_seconds -= streamed["cpu_seconds"]
+            measurement["wall_seconds"] = wall_seconds
+            measurement["cpu_seconds"] = cpu_seconds
+            rows = measurement["rows"]
+            measurement["rows_per_second"] = rows / wall_seconds if rows is not None and wall_seconds else None
+            measurement["peak_memory_bytes"] = (tracemalloc.get_traced_memory()[1] - memory_before
+                                                if self.__trace_memory else None)
+            if profiler:
+                profiler.dump_stats(profile_file)
+                measurement["profile_file"] = profile_file
+            self.__stages[name] = measurement
+
+    def timed_rows(self, name: str, rows: Iterable) -> Iterator:
+        """
+        Yields the rows of an iterable and measures the time spent producing them as one stage.
+
+        The stage is recorded once the rows are exhausted (or the iterator is closed), with the wall and
+        CPU time spent in the iterable and the number of rows. Its peak memory is not separated from that
+        of the stage consuming the rows and is reported as None. If the rows are consumed inside another
+        stage, that stage's times exclude this one's.
+
+        Args:
+            name (str): The stage name, e.g. "read".
+            rows (Iterable): The rows, e.g. InputHandler.iter_records().
+
+        Returns:
+            Iterator: The same rows, in order.
+        """
+        measurement = {"rows": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0}
+        if self.__open_stages:
+            measurement["streamed_into"] = self.__open_stages[-1]
+        iterator = iter(rows)
+        wall_clock = time.perf_counter
+        cpu_clock = time.process_time
+        wall_seconds = cpu_seconds = 0.0
+        count = 0
+        try:
+            while True:
+                wall_started = wall_clock()
+                cpu_started = cpu_clock()
+                try:
+                    row = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    wall_seconds += wall_clock() - wall_started
+                    cpu_seconds += cpu_clock() - cpu_started
+                count += 1
+                yield row
+        finally:
+            measurement.update(rows=count, wall_seconds=wall_seconds, cpu_seconds=cpu_seconds,
+                               rows_per_second=count / wall_seconds if wall_seconds else None,
+                               peak_memory_bytes=None)
+            self.__stages[name] = measurement
+
+    def top_functions(self, name: str, limit: int = 20) -> list:
+        """
+        Lists the functions with the most cumulative time in a profiled stage.
+
+        Args:
+            name (str): The stage name.
+            limit (int): The maximum number of functions returned.
+
+        Returns:
+            list: Dictionaries with the function, calls, total_seconds and cumulative_seconds of each
+            function, or an empty list if the stage was not profiled.
+        """
+        profile_file = self.__stages.get(name, {}).get("profile_file")
+        if profile_file is None:
+            return []
+        statistics = pstats.Stats(profile_file).stats
+        ranked = sorted(statistics.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [{"function": f"{file_name}:{line}({function})", "calls": calls,
+                 "total_seconds": total_time, "cumulative_seconds": cumulative_time}
+                for (file_name, line, function), (_, calls, total_time, cumulative_time, _) in ranked]
+
+    def get_metrics(self) -> dict:
+        """
+        Gets every stage measurement together with the totals of the run.
+
+        Returns:
+            dict: The metrics, ready to be serialized as JSON.
+        """
+        return {
+            "version": METRICS_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "stages": self.__stages,
+            "total_wall_seconds": sum(stage["wall_seconds"] for stage in self.__stages.values()),
+            "total_cpu_seconds": sum(stage["cpu_seconds"] for stage in self.__stages.values()),
+            "top_functions": {name: self.top_functions(name) for name, stage in self.__stages.items()
+                              if "profile_file" in stage}
+        }
+
+    def write_metrics(self, file_path: str) -> None:
+        """
+        Writes the metrics to a JSON file atomically, so charting tools never read a partial file.
+
+        Args:
+            file_path (str): The path of the metrics JSON file.
+        """
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+        handle, temporary_path = tempfile.mkstemp(dir=directory, prefix=f'.{file_name}.', suffix='.tmp')
+        try:
+            os.chmod(temporary_path, 0o644)
+            with open(handle, 'w') as metrics_file:
+                json.dump(self.get_metrics(), metrics_file, indent=2)
+            os.replace(temporary_path, file_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    def stop(self) -> None:
+        """
+        Stops tracing memory allocations if this profiler started it.
+        """
+        if self.__started_tracing:
+            tracemalloc.stop()
+            self.__started_tracing = False
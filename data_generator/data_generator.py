@@ -0,0 +1,171 @@
+import argparse
+import csv
+import json
+import random
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Iterator
+
+COLUMNS = ['Transaction ID', 'Account number', 'Date', 'Transaction type', 'Amount', 'Currency', 'Description']
+
+TRANSACTION_TYPES = ['deposit', 'withdrawal', 'transfer']
+TRANSACTION_TYPE_WEIGHTS = [50, 35, 15]
+CURRENCIES = ['CAD', 'USD', 'XRP', 'LTC']
+CURRENCY_WEIGHTS = [80, 16, 2, 2]
+DESCRIPTIONS = {
+    'deposit': ['Salary', 'Bonus', 'Refund', 'Cash Deposit', 'Crypto Investment'],
+    'withdrawal': ['Groceries', 'Rent', 'Utilities', 'Shopping', 'Car Payment'],
+    'transfer': ['Transfer to Savings', 'Transfer to Checking', 'Loan Payment']
+}
+
+
+class TransactionGenerator:
+    """
+    Generates realistic, reproducible synthetic transactions.
+
+    Account activity is skewed (Zipf-like: a few accounts make most transactions), currencies are
+    mostly CAD with a small share of uncommon ones, and a configurable share of amounts is above
+    the large transaction threshold. The same seed always produces the same rows, so benchmark
+    runs can be compared.
+
+    Attributes:
+        seed (int): The random seed.
+        account_count (int): The number of distinct accounts.
+    """
+
+    def __init__(self, seed: int = 0, account_count: int = 10000, large_amount_share: float = 0.01,
+                 start_date: date = date(2023, 1, 1), days: int = 365, skew: float = 1.1):
+        """
+        Initializes the generator.
+
+        Args:
+            seed (int): The random seed.
+            account_count (int): The number of distinct accounts.
+            large_amount_share (float): The share of transactions with an amount above 10,000.
+            start_date (date): The date of the first transaction.
+            days (int): The number of days the transactions are spread over, in date order.
+            skew (float): The Zipf exponent of the account activity; 0 gives uniform activity.
+        """
+        if account_count < 1 or days < 1:
+            raise ValueError("account_count and days must be positive integers.")
+        self.__seed = seed
+        self.__account_count = account_count
+        self.__large_amount_share = large_amount_share
+        self.__start_date = start_date
+        self.__days = days
+        # Cumulative weights let random.choices pick an account with a binary search
+        self.__account_weights = list(accumulate(1 / rank ** skew for rank in range(1, account_count + 1)))
+
+    @property
+    def seed(self):
+        """
+        Gets the random seed.
+
+        Returns:
+            int: The seed.
+        """
+        return self.__seed
+
+    @property
+    def account_count(self):
+        """
+        Gets the number of distinct accounts.
+
+        Returns:
+            int: The number of accounts.
+        """
+        return self.__account_count
+
+    def iter_rows(self, row_count: int, batch_size: int = 10000) -> Iterator[dict]:
+        """
+        Lazily yields row_count transactions as dictionaries with the input file columns.
+
+        Args:
+            row_count (int): The number of transactions to generate.
+            batch_size (int): The number of random choices drawn at a time.
+
+        Returns:
+            Iterator[dict]: An iterator over the generated transactions, in date order.
+        """
+        generator = random.Random(self.__seed)
+        accounts = range(1001, 1001 + self.__account_count)
+        dates = [(self.__start_date + timedelta(days=day)).isoformat() for day in range(self.__days)]
+        generated = 0
+        while generated < row_count:
+            size = min(batch_size, row_count - generated)
+            account_numbers = generator.choices(accounts, cum_weights=self.__account_weights, k=size)
+            transaction_types = generator.choices(TRANSACTION_TYPES, TRANSACTION_TYPE_WEIGHTS, k=size)
+            currencies = generator.choices(CURRENCIES, CURRENCY_WEIGHTS, k=size)
+            for index in range(size):
+                transaction_type = transaction_types[index]
+                if generator.random() < self.__large_amount_share:
+                    amount = round(generator.uniform(10000.01, 50000), 2)
+                else:
+                    amount = round(generator.lognormvariate(5, 1.2), 2)
+                    amount = min(max(amount, 1.0), 10000.0)
+                yield {
+                    'Transaction ID': str(generated + index + 1),
+                    'Account number': str(account_numbers[index]),
+                    'Date': dates[(generated + index) * self.__days // row_count],
+                    'Transaction type': transaction_type,
+                    'Amount': f'{amount:.2f}',
+                    'Currency': currencies[index],
+                    'Description': generator.choice(DESCRIPTIONS[transaction_type])
+                }
+            generated += size
+
+    def write_csv(self, file_path: str, row_count: int) -> None:
+        """
+        Writes row_count transactions to a CSV file without holding them in memory.
+
+        Args:
+            file_path (str): The path of the CSV file.
+            row_count (int): The number of transactions to generate.
+        """
+        with open(file_path, 'w', newline='', buffering=1024 * 1024) as output_file:
+            writer = csv.writer(output_file)
+            writer.writerow(COLUMNS)
+            writer.writerows([row[column] for column in COLUMNS] for row in self.iter_rows(row_count))
+
+    def write_json(self, file_path: str, row_count: int) -> None:
+        """
+        Writes row_count transactions to a JSON array file, one record at a time.
+
+        Args:
+            file_path (str): The path of the JSON file.
+            row_count (int): The number of transactions to generate.
+        """
+        with open(file_path, 'w', buffering=1024 * 1024) as output_file:
+            output_file.write('[')
+            for index, row in enumerate(self.iter_rows(row_count)):
+                output_file.write(',\n' if index else '\n')
+                output_file.write(json.dumps(row))
+            output_file.write('\n]\n')
+
+
+def main(argv: list = None) -> None:
+    """Generates a synthetic transaction file from the command line.
+
+    Args:
+        argv (list): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description='Generate a synthetic transaction file.')
+    parser.add_argument('output', help='path of the file to write; the format follows the .csv or .json extension')
+    parser.add_argument('--rows', type=int, default=1000, help='number of transactions (default: 1000)')
+    parser.add_argument('--accounts', type=int, default=10000, help='number of distinct accounts (default: 10000)')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    parser.add_argument('--large-share', type=float, default=0.01,
+                        help='share of transactions above the large transaction threshold (default: 0.01)')
+    arguments = parser.parse_args(argv)
+
+    generator = TransactionGenerator(arguments.seed, arguments.accounts, arguments.large_share)
+    if arguments.output.endswith('.json'):
+        generator.write_json(arguments.output, arguments.rows)
+    elif arguments.output.endswith('.csv'):
+        generator.write_csv(arguments.output, arguments.rows)
+    else:
+        parser.error('the output file must have a .csv or .json extension')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,366 @@
+import math
+from typing import Iterable
+
+DEFAULT_COMPRESSION = 100
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class TDigest:
+    """
+    A merging t-digest: a constant-memory sketch of a distribution for estimating quantiles.
+
+    Values are buffered and periodically merged into at most about `compression` weighted centroids.
+    Centroids near the median may absorb many values while those near the tails stay small, so the
+    error of a quantile estimate shrinks towards the extremes: with the default compression of 100
+    the rank error is typically below 0.5% around the median and below 0.1% at P99. Digests built
+    on different shards can be merged, and the same values added in the same order (one at a time
+    or in batches) always give the same digest.
+
+    Attributes:
+    __compression (int): The compression parameter; larger values use more memory and are more accurate.
+    __centroids (list): The merged (mean, weight) centroids, sorted by mean.
+    __buffer (list): Values added since the last merge.
+    """
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION, centroids: list = None, buffer: list = None):
+        """
+        Initializes an empty digest, or restores one from its to_dict representation.
+        Parameters:
+        compression (int): The compression parameter.
+        centroids (list): (mean, weight) pairs sorted by mean.
+        buffer (list): Values not merged into the centroids yet.
+        """
+        if compression < 10:
+            raise ValueError("compression must be at least 10.")
+        self.__compression = compression
+        self.__centroids = [tuple(centroid) for centroid in centroids or []]
+        self.__buffer = list(buffer or [])
+        self.__buffer_capacity = 5 * compression
+
+    @property
+    def compression(self):
+        """
+        int: Returns the compression parameter.
+        """
+        return self.__compression
+
+    @property
+    def centroid_count(self):
+        """
+        int: Returns the number of centroids currently kept, a measure of the memory used.
+        """
+        return len(self.__centroids)
+
+    def add(self, value: float) -> None:
+        """
+        Adds one value to the digest.
+        Parameters:
+        value (float): The value.
+        """
+        self.__buffer.append(value)
+        if len(self.__buffer) >= self.__buffer_capacity:
+            self.__flush()
+
+    def add_many(self, values: Iterable[float]) -> None:
+        """
+        Adds values to the digest in order; equivalent to calling add for each value.
+        Parameters:
+        values (iterable): The values.
+        """
+        buffer = self.__buffer
+        capacity = self.__buffer_capacity
+        for value in values:
+            buffer.append(value)
+            if len(buffer) >= capacity:
+                self.__flush()
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """
+        Folds another digest into this one.
+        Parameters:
+        other (TDigest): The digest to merge. It is not modified.
+        Returns:
+        TDigest: This digest, to allow chaining.
+        """
+        self.__centroids = self.__compress(self.__centroids + other.__centroids
+                                           + [(value, 1) for value in self.__buffer + other.__buffer])
+        self.__buffer.clear()
+        return self
+
+    def quantile(self, q: float, minimum: float = None, maximum: float = None) -> float:
+        """
+        Estimates a quantile without changing the digest.
+        Parameters:
+        q (float): The quantile, between 0 and 1.
+        minimum (float): The exact smallest value, if known; used to interpolate the lowest ranks.
+        maximum (float): The exact largest value, if known; used to interpolate the highest ranks.
+        Returns:
+        float: The estimated value at quantile q, or None if the digest is empty.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1.")
+        centroids = self.__centroids
+        if self.__buffer:
+            centroids = self.__compress(centroids + [(value, 1) for value in self.__buffer])
+        if not centroids:
+            return None
+        if minimum is None:
+            minimum = centroids[0][0]
+        if maximum is None:
+            maximum = centroids[-1][0]
+        if len(centroids) == 1:
+            return centroids[0][0]
+
+        total = sum(weight for _, weight in centroids)
+        target = q * total
+        first_mean, first_weight = centroids[0]
+        if target < first_weight / 2:
+            return minimum + (first_mean - minimum) * target / (first_weight / 2)
+        cumulative = 0
+        for (left_mean, left_weight), (right_mean, right_weight) in zip(centroids, centroids[1:]):
+            left_center = cumulative + left_weight / 2
+            right_center = cumulative + left_weight + right_weight / 2
+            if target <= right_center:
+                return left_mean + (right_mean - left_mean) * (target - left_center) / (right_center - left_center)
+            cumulative += left_weight
+        last_mean, last_weight = centroids[-1]
+        last_center = total - last_weight / 2
+        return last_mean + (maximum - last_mean) * (target - last_center) / (last_weight / 2)
+
+    def to_dict(self) -> dict:
+        """
+        Returns a JSON-serializable representation of the digest, e.g. for checkpoints.
+        Returns:
+        dict: The compression, centroids and buffered values.
+        """
+        return {"compression": self.__compression,
+                "centroids": [list(centroid) for centroid in self.__centroids],
+                "buffer": list(self.__buffer)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TDigest":
+        """
+        Restores a digest saved with to_dict.
+        Parameters:
+        data (dict): The representation returned by to_dict.
+        Returns:
+        TDigest: The restored digest.
+        """
+        return cls(data["compression"], data["centroids"], data["buffer"])
+
+    def __flush(self) -> None:
+        """
+        Merges the buffered values into the centroids.
+        """
+        self.__centroids = self.__compress(self.__centroids + [(value, 1) for value in self.__buffer])
+        # Cleared in place because add_many holds a reference to the buffer
+        self.__buffer.clear()
+
+    def __compress(self, centroids: list) -> list:
+        """
+        Merges adjacent centroids as long as each one stays within one unit of the k1 scale function,
+        k(q) = compression / (2 * pi) * asin(2q - 1).
+        """
+        if not centroids:
+            return []
+        centroids.sort()
+        total = sum(weight for _, weight in centroids)
+        scale = self.__compression / (2 * math.pi)
+
+        def q_limit(weight_so_far):
+            k = scale * math.asin(2 * weight_so_far / total - 1) + 1
+            return total * (math.sin(min(k / scale, math.pi / 2)) + 1) / 2
+
+        merged = []
+        current_mean, current_weight = centroids[0]
+        weight_so_far = 0
+        limit = q_limit(0)
+        for mean, weight in centroids[1:]:
+            if weight_so_far + current_weight + weight <= limit:
+                current_weight += weight
+                current_mean += (mean - current_mean) * weight / current_weight
+            else:
+                merged.append((current_mean, current_weight))
+                weight_so_far += current_weight
+                limit = q_limit(weight_so_far)
+                current_mean, current_weight = mean, weight
+        merged.append((current_mean, current_weight))
+        return merged
+
+
+class AmountDistribution:
+    """
+    Streaming statistics of a set of amounts: count, min, max, mean and variance computed exactly
+    with Welford's online algorithm, plus quantiles estimated with a TDigest.
+    Memory use is constant whatever the number of amounts, and distributions built on different
+    shards can be merged (using Chan et al.'s formula for the variance).
+
+    Attributes:
+    __count (int): The number of amounts.
+    __minimum (float): The smallest amount.
+    __maximum (float): The largest amount.
+    __mean (float): The running mean.
+    __m2 (float): The running sum of squared differences from the mean.
+    __digest (TDigest): The quantile sketch.
+    """
+
+    def __init__(self, compression: int = DEFAULT_COMPRESSION):
+        """
+        Initializes an empty distribution.
+        Parameters:
+        compression (int): The compression parameter of the quantile sketch.
+        """
+        self.__count = 0
+        self.__minimum = None
+        self.__maximum = None
+        self.__mean = 0.0
+        self.__m2 = 0.0
+        self.__digest = TDigest(compression)
+
+    @property
+    def count(self):
+        """
+        int: Returns the number of amounts.
+        """
+        return self.__count
+
+    @property
+    def minimum(self):
+        """
+        float: Returns the smallest amount, or None if there are none.
+        """
+        return self.__minimum
+
+    @property
+    def maximum(self):
+        """
+        float: Returns the largest amount, or None if there are none.
+        """
+        return self.__maximum
+
+    @property
+    def mean(self):
+        """
+        float: Returns the mean amount, or None if there are none.
+        """
+        return self.__mean if self.__count else None
+
+    @property
+    def variance(self):
+        """
+        float: Returns the population variance of the amounts, or None if there are none.
+        """
+        return self.__m2 / self.__count if self.__count else None
+
+    def add(self, amount: float) -> None:
+        """
+        Adds one amount.
+        Parameters:
+        amount (float): The amount.
+        """
+        self.__count += 1
+        delta = amount - self.__mean
+        self.__mean += delta / self.__count
+        self.__m2 += delta * (amount - self.__mean)
+        if self.__minimum is None or amount < self.__minimum:
+            self.__minimum = amount
+        if self.__maximum is None or amount > self.__maximum:
+            self.__maximum = amount
+        self.__digest.add(amount)
+
+    def add_many(self, amounts: list) -> None:
+        """
+        Adds amounts in order; gives exactly the same result as calling add for each amount.
+        Parameters:
+        amounts (list): The amounts.
+        """
+        count, mean, m2 = self.__count, self.__mean, self.__m2
+        for amount in amounts:
+            count += 1
+            delta = amount - mean
+            mean += delta / count
+            m2 += delta * (amount - mean)
+        self.__count, self.__mean, self.__m2 = count, mean, m2
+        if amounts:
+            smallest, largest = min(amounts), max(amounts)
+            if self.__minimum is None or smallest < self.__minimum:
+                self.__minimum = smallest
+            if self.__maximum is None or largest > self.__maximum:
+                self.__maximum = largest
+        self.__digest.add_many(amounts)
+
+    def merge(self, other: "AmountDistribution") -> "AmountDistribution":
+        """
+        Folds another distribution into this one.
+        Parameters:
+        other (AmountDistribution): The distribution to merge. It is not modified.
+        Returns:
+        AmountDistribution: This distribution, to allow chaining.
+        """
+        if other.__count:
+            count = self.__count + other.__count
+            delta = other.__mean - self.__mean
+            self.__mean += delta * other.__count / count
+            self.__m2 += other.__m2 + delta * delta * self.__count * other.__count / count
+            self.__count = count
+            self.__minimum = other.__minimum if self.__minimum is None else min(self.__minimum, other.__minimum)
+            self.__maximum = other.__maximum if self.__maximum is None else max(self.__maximum, other.__maximum)
+            self.__digest.merge(other.__digest)
+        return self
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile of the amounts.
+        Parameters:
+        q (float): The quantile, between 0 and 1, e.g. 0.95 for P95.
+        Returns:
+        float: The estimated amount, or None if there are none.
+        """
+        return self.__digest.quantile(q, self.__minimum, self.__maximum)
+
+    def summary(self, quantiles: tuple = DEFAULT_QUANTILES) -> dict:
+        """
+        Returns the statistics as a dictionary, e.g. for the statistics output.
+        Parameters:
+        quantiles (tuple): The quantiles to estimate.
+        Returns:
+        dict: The count, min, max, mean, std_dev and one 'p<percent>' key per quantile (e.g. 'p95').
+        """
+        variance = self.variance
+        summary = {
+            "count": self.__count,
+            "min": self.__minimum,
+            "max": self.__maximum,
+            "mean": self.mean,
+            "std_dev": None if variance is None else math.sqrt(variance)
+        }
+        for q in quantiles:
+            summary[f"p{q * 100:g}"] = self.quantile(q)
+        return summary
+
+    def to_dict(self) -> dict:
+        """
+        Returns a JSON-serializable representation of the distribution, e.g. for checkpoints.
+        Returns:
+        dict: The exact statistics and the quantile sketch.
+        """
+        return {"count": self.__count, "min": self.__minimum, "max": self.__maximum,
+                "mean": self.__mean, "m2": self.__m2, "digest": self.__digest.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AmountDistribution":
+        """
+        Restores a distribution saved with to_dict.
+        Parameters:
+        data (dict): The representation returned by to_dict.
+        Returns:
+        AmountDistribution: The restored distribution.
+        """
+        distribution = cls()
+        distribution.__count = data["count"]
+        distribution.__minimum = data["min"]
+        distribution.__maximum = data["max"]
+        distribution.__mean = data["mean"]
+        distribution.__m2 = data["m2"]
+        distribution.__digest = TDigest.from_dict(data["digest"])
+        return distribution
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+from data_processor.data_processor import DataProcessor
+from input_handler.compression import COMPRESSIONS
+from input_handler.input_handler import InputHandler
+
+logger = logging.getLogger(__name__)
+
+INPUT_EXTENSIONS = tuple(f"{extension}{suffix}" for extension in ('.csv', '.json', '.ndjson', '.jsonl')
+                         for suffix in ('', *(f".{compression}" for compression in COMPRESSIONS)))
+
+
+def discover_input_files(directory: str) -> list:
+    """
+    Lists the input files of a directory (not its subdirectories) in name order.
+    Parameters:
+    directory (str): The directory to search.
+    Returns:
+    list: The paths of the .csv, .json and .ndjson (or .jsonl) files, compressed or not, in the directory.
+    Raises:
+    FileNotFoundError: If the directory does not exist.
+    """
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Directory: {directory} does not exist.")
+    return [os.path.join(directory, name) for name in names
+            if name.lower().endswith(INPUT_EXTENSIONS) and os.path.isfile(os.path.join(directory, name))]
+
+
+def process_file(file_path: str, processor_class: type = DataProcessor, processor_options: dict = None) -> dict:
+    """
+    Reads and processes one input file.
+    Runs inside a worker process, so it must stay a module-level function.
+    Parameters:
+    file_path (str): The path to the input file.
+    processor_class (type): The DataProcessor class used to process the file.
+    processor_options (dict): Keyword arguments passed to the processor, e.g. a rule_engine.
+    Returns:
+    dict: The state of the processor after processing the file, as returned by get_state.
+    """
+    processor = processor_class(InputHandler(file_path).iter_records(), **(processor_options or {}))
+    processor.process_data()
+    return processor.get_state()
+
+
+async def process_files(file_paths: list, workers: int = None, processor_class: type = DataProcessor,
+                        processor_options: dict = None, queue_size: int = None) -> DataProcessor:
+    """
+    Processes many input files concurrently and merges their results.
+    A producer puts the file paths on a bounded queue, and `workers` consumers each take a file
+    from the queue and hand it to a process pool, so every CPU reads and processes its own file.
+    The partial results are merged in the order of file_paths, whatever order they finish in.
+    Parameters:
+    file_paths (list): The paths of the input files.
+    workers (int): The number of worker processes. Defaults to the number of CPUs.
+    processor_class (type): The DataProcessor class used to process each file.
+    processor_options (dict): Keyword arguments passed to each processor, e.g. a rule_engine.
+    queue_size (int): The maximum number of files waiting on the queue. Defaults to twice `workers`.
+    Returns:
+    DataProcessor: A processor holding the merged results.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(file_paths) or 1))
+    loop = asyncio.get_running_loop()
+    file_queue = asyncio.Queue(maxsize=queue_size or 2 * workers)
+    results = [None] * len(file_paths)
+
+    async def produce():
+        for index, file_path in enumerate(file_paths):
+            await file_queue.put((index, file_path))
+        for _ in range(workers):
+            await file_queue.put(None)
+
+    async def consume(executor):
+        while True:
+            item = await file_queue.get()
+            if item is None:
+                return
+            index, file_path = item
+            results[index] = await loop.run_in_executor(executor, process_file, file_path,
+                                                        processor_class, processor_options)
+            logger.info("Processed file %s", file_path)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        await asyncio.gather(produce(), *(consume(executor) for _ in range(workers)))
+
+    partials = [processor_class.from_results(state) for state in results]
+    if not partials:
+        return processor_class([], **(processor_options or {}))
+    return reduce(DataProcessor.merge, partials[1:], partials[0])
+
+
+def process_directory(directory: str, workers: int = None, processor_class: type = DataProcessor,
+                      processor_options: dict = None) -> DataProcessor:
+    """
+    Processes every .csv and .json file of a directory concurrently and merges the results.
+    Parameters:
+    directory (str): The directory holding the input files.
+    workers (int): The number of worker processes. Defaults to the number of CPUs.
+    processor_class (type): The DataProcessor class used to process each file.
+    processor_options (dict): Keyword arguments passed to each processor, e.g. a rule_engine.
+    Returns:
+    DataProcessor: A processor holding the merged results.
+    """
+    file_paths = discover_input_files(directory)
+    logger.info("Found %d input files in %s", len(file_paths), directory)
+    return asyncio.run(process_files(file_paths, workers, processor_class, processor_options))
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+
+from data_processor.amount_distribution import AmountDistribution
+from data_processor.data_processor import DataProcessor
+from data_processor.rollups import TransactionRollups
+from data_processor.transaction import Transaction
+from input_handler.input_handler import InputHandler
+
+CHECKPOINT_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
+
+def save_checkpoint(file_path: str, data_processor: DataProcessor, inputs: dict) -> None:
+    """
+    Saves the state of a DataProcessor together with the position reached in each of its input files.
+    The checkpoint is written to a temporary file that is then renamed, so an interrupted run
+    never leaves a half-written checkpoint behind.
+    Parameters:
+    file_path (str): The path of the checkpoint file.
+    data_processor (DataProcessor): The processor whose state is saved.
+    inputs (dict): Maps the absolute path of every input file the state was computed from to a
+        dictionary with the 'offset' just past its last processed row and the 'last_transaction_id'.
+    """
+    checkpoint = {
+        "version": CHECKPOINT_VERSION,
+        "inputs": inputs,
+        # Account summaries are stored as a list because JSON object keys are always strings
+        "account_summaries": list(data_processor.account_summaries.values()),
+        "suspicious_transactions": [
+            transaction.to_row() if isinstance(transaction, Transaction) else transaction
+            for transaction in data_processor.suspicious_transactions
+        ],
+        "transaction_statistics": data_processor.transaction_statistics,
+        "suspicious_transaction_rules": data_processor.suspicious_transaction_rules,
+        "amount_statistics": None if data_processor.amount_statistics is None else {
+            dimension: {key: distribution.to_dict() for key, distribution in distributions.items()}
+            for dimension, distributions in data_processor.amount_statistics.items()},
+        "rollups": None if data_processor.rollups is None else data_processor.rollups.to_dict(),
+        "counters": data_processor.counters
+    }
+    temporary_path = f"{file_path}.tmp"
+    with open(temporary_path, 'w') as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+    os.replace(temporary_path, file_path)
+
+
+def load_checkpoint(file_path: str, processor_class: type = DataProcessor) -> tuple:
+    """
+    Loads a checkpoint written by save_checkpoint.
+    Parameters:
+    file_path (str): The path of the checkpoint file.
+    processor_class (type): The DataProcessor class used to hold the restored state.
+    Returns:
+    tuple: The restored DataProcessor and the dictionary mapping the absolute path of each input file
+        to its 'offset' and 'last_transaction_id', or (None, None) if the file does not exist.
+    Raises:
+    ValueError: If the checkpoint was written in an unsupported format.
+    """
+    try:
+        with open(file_path, 'r') as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+    except FileNotFoundError:
+        return None, None
+    if checkpoint.get("version") == 1:
+        # Version 1 tracked a single input file
+        inputs = {checkpoint["input_file"]: {key: checkpoint[key] for key in ("offset", "last_transaction_id")}}
+    elif checkpoint.get("version") == CHECKPOINT_VERSION:
+        inputs = checkpoint["inputs"]
+    else:
+        raise ValueError(f"Checkpoint: {file_path} has an unsupported version.")
+
+    results = {key: checkpoint[key] for key in ("transaction_statistics", "suspicious_transaction_rules", "counters")
+               if key in checkpoint}
+    results["account_summaries"] = {summary["account_number"]: summary for summary in checkpoint["account_summaries"]}
+    results["suspicious_transactions"] = checkpoint["suspicious_transactions"]
+    if checkpoint.get("amount_statistics") is not None:
+        results["amount_statistics"] = {
+            dimension: {key: AmountDistribution.from_dict(distribution) for key, distribution in distributions.items()}
+            for dimension, distributions in checkpoint["amount_statistics"].items()}
+    if checkpoint.get("rollups") is not None:
+        results["rollups"] = TransactionRollups.from_dict(checkpoint["rollups"])
+    data_processor = processor_class.from_results(results)
+    return data_processor, inputs
+
+
+def process_incrementally(input_file_path: str, checkpoint_path: str, processor_class: type = DataProcessor,
+                          processor_options: dict = None) -> DataProcessor:
+    """
+    Processes only the rows appended to a CSV file since the last checkpoint.
+    The checkpointed state is restored, the rows after the file's checkpointed offset are processed and
+    merged into it, and a new checkpoint is saved. A checkpoint keeps one offset per input file, so
+    other files (e.g. a batch resent under a new name) add their rows to the same results; a file the
+    checkpoint has not seen yet is processed from the start.
+    Only complete lines are processed, so a row that is still being appended is picked up next time.
+    If processor_options has a deduplicator, the IDs it has seen are committed right after the checkpoint
+    is saved, and rows already processed from any file are skipped.
+    If the file is now shorter than its checkpointed offset it is assumed to have been replaced and is
+    processed from the start. The results are kept when there is a deduplicator, as it skips the rows
+    that were already counted; without one they are only reset if the checkpoint covers no other file.
+    Parameters:
+    input_file_path (str): The path of the CSV input file.
+    checkpoint_path (str): The path of the checkpoint file.
+    processor_class (type): The DataProcessor class used to process the new rows.
+    processor_options (dict): Keyword arguments passed to the processor, e.g. a rule_engine.
+    Returns:
+    DataProcessor: A processor holding the results for the whole file.
+    Raises:
+    ValueError: If the input is not an uncompressed CSV file, or it was replaced by a shorter file while
+        the checkpoint also covers other files and there is no deduplicator to skip its rows already counted.
+    """
+    input_handler = InputHandler(input_file_path)
+    if input_handler.get_file_format() != 'csv' or input_handler.get_compression() is not None:
+        raise ValueError("Incremental processing requires an uncompressed .csv file.")
+
+    data_processor, inputs = load_checkpoint(checkpoint_path, processor_class)
+    inputs = inputs or {}
+    input_key = os.path.abspath(input_file_path)
+    position = inputs.get(input_key)
+    start = None
+    if position is not None:
+        if os.path.getsize(input_file_path) >= (position["offset"] or 0):
+            start = position["offset"]
+        elif (processor_options or {}).get("deduplicator") is not None:
+            # The seen IDs and the results stay in step: the rows already counted are skipped as duplicates
+            logger.warning("File: %s is shorter than the checkpoint offset; reprocessing it and skipping "
+                           "the transactions already processed.", input_file_path)
+        elif len(inputs) == 1:
+            logger.warning("File: %s is shorter than the checkpoint offset; reprocessing it.", input_file_path)
+            data_processor, inputs = None, {}
+        else:
+            raise ValueError(f"File: {input_file_path} is shorter than its offset in checkpoint {checkpoint_path}, "
+                             f"which also covers other files; without a deduplicator its rows already counted "
+                             f"cannot be told apart.")
+    if data_processor is None:
+        data_processor = processor_class([])
+
+    last_row = {}
+
+    def track_last_row(rows):
+        for row in rows:
+            last_row["row"] = row
+            yield row
+
+    new_rows = processor_class(track_last_row(input_handler.iter_csv_range(start, complete_lines_only=True)),
+                               **(processor_options or {}))
+    new_rows.process_data()
+    data_processor.merge(new_rows)
+
+    if "row" in last_row:
+        last_transaction_id = last_row["row"].get("Transaction ID")
+    else:
+        last_transaction_id = position["last_transaction_id"] if position else None
+    offset = input_handler.offset if input_handler.offset is not None else start
+    inputs[input_key] = {"offset": offset, "last_transaction_id": last_transaction_id}
+    save_checkpoint(checkpoint_path, data_processor, inputs)
+    logger.info("Checkpoint saved at offset %s", offset)
+    if new_rows.deduplicator is not None:
+        # The IDs are committed only now that the results of their transactions are saved
+        new_rows.deduplicator.flush()
+    return data_processor
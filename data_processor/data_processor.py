@@ -1,49 +1,109 @@
 
 import logging
+from typing import Callable, Iterable
+
+from data_processor.amount_distribution import DEFAULT_QUANTILES, AmountDistribution
+from data_processor.deduplicator import TransactionDeduplicator
+from data_processor.fx_rates import FXRateTable
+from data_processor.logging_setup import configure_logging
+from data_processor.rollups import TransactionRollups
+from data_processor.rule_engine import SuspiciousRuleEngine
+from data_processor.transaction import Transaction, as_transaction
+
+logger = logging.getLogger(__name__)
+
 class DataProcessor:
     """
     A class for processing transactional data to identify suspicious transactions,
     summarize account activities, and compute transaction statistics.
     Attributes:
-    __input_data (list): A list of transaction dictionaries.
+    __input_data (iterable): A list or iterator of transaction dictionaries.
     __account_summaries (dict): A dictionary mapping account numbers to their summaries.
     __suspicious_transactions (list): A list of transactions that are deemed suspicious.
+    __suspicious_transaction_rules (list): The names of the rules that fired for each suspicious transaction.
+    __rule_engine (SuspiciousRuleEngine): The rules used to flag suspicious transactions.
+    __observers (list): Detectors (e.g. VelocityDetector) that observe every processed transaction.
+    __suspicious_sink (callable): Receives suspicious transactions instead of the suspicious transactions list.
     __transaction_statistics (dict): A dictionary summarizing transaction statistics.
+    __amount_statistics (dict): Streaming amount distributions (min, max, variance and quantiles)
+        per transaction type and per currency, or None if not enabled.
+    __fx_rates (FXRateTable): The exchange rates used to normalize balances, or None.
+    __rollups (TransactionRollups): Totals per (day, account, transaction type), or None if not enabled.
+    __deduplicator (TransactionDeduplicator): Skips transactions whose Transaction ID was already seen, or None.
+    __counters (dict): Running counts of processed rows, of suspicious hits per reason and of
+        transactions without an exchange rate.
+    __missing_rate_currencies (set): The currencies already reported as missing an exchange rate.
+    __log_interval (int): Number of rows between two progress log messages.
 
     Constants:
     LARGE_TRANSACTION_THRESHOLD (int): Threshold amount above which transactions are considered large.
     UNCOMMON_CURRENCIES (list): List of currency codes considered uncommon.
+    These constants define the default rules when no rule engine is given.
     """
 
     LARGE_TRANSACTION_THRESHOLD = 10000
     UNCOMMON_CURRENCIES = ['XRP', 'LTC']
 
-    def __init__(self, input_data: list, log_level = logging.WARNING, log_format = None, log_file=None):
+    def __init__(self, input_data: Iterable[dict], log_level = logging.WARNING, log_format = None, log_file=None,
+                 log_interval: int = 100000, rule_engine: SuspiciousRuleEngine = None, observers: list = None,
+                 suspicious_sink: Callable = None, rollups: bool = False, fx_rates: FXRateTable = None,
+                 deduplicator: TransactionDeduplicator = None, amount_statistics: bool = False):
         """
         Initializes the DataProcessor with the given input data.
         Parameters:
-        input_data (list): A list of transaction dictionaries.
+        input_data (iterable): A list of transaction dictionaries, or an iterator such as
+            InputHandler.iter_records() so that the input is streamed instead of held in memory.
         log_level (int): Logging level.
         log_format (str): Format of the log messages.
         log_file (str): File path for logging output. Logs to console if not specified.
+        log_interval (int): Number of rows between two progress messages with the running counters.
+        rule_engine (SuspiciousRuleEngine): The rules used to flag suspicious transactions. Defaults to
+            LARGE_TRANSACTION_THRESHOLD and UNCOMMON_CURRENCIES.
+        observers (list): Objects with an observe(record) method, such as a VelocityDetector, that are
+            given every transaction processed by process_data in the same pass.
+        suspicious_sink (callable): If given, each suspicious transaction is passed to
+            suspicious_sink(transaction, fired_rules) as soon as it is flagged (e.g. to stream it to a file
+            with SuspiciousTransactionWriter.write) instead of being kept in suspicious_transactions.
+        rollups (bool): Also keep totals per (day, account, transaction type) in the same pass, from which
+            monthly rollups are derived.
+        fx_rates (FXRateTable): If given, every account summary also gets a normalized_balance: the balance
+            with each amount converted to the base currency at the rate of its transaction date. If a
+            transaction has no rate, the normalized_balance of its account is None and the transaction is
+            counted in counters["missing_fx_rates"].
+        deduplicator (TransactionDeduplicator): If given, transactions whose Transaction ID has already been
+            seen, in this run or a previous one, are skipped before they are processed.
+        amount_statistics (bool): Also keep the distribution of the amounts (min, max, variance and
+            quantiles) per transaction type and per currency in the same pass.
         """
         self.__input_data = input_data
         self.__account_summaries = {}
         self.__suspicious_transactions = []
+        self.__suspicious_transaction_rules = []
         self.__transaction_statistics = {}
-        # Default log format if none provided
-        if not log_format:
-            log_format = '%(asctime)s - %(levelname)s - %(message)s'
-       # Configure logging
-        if log_file:
-            logging.basicConfig(filename=log_file, level=log_level, format=log_format)
-        else:
-            logging.basicConfig(level=log_level, format=log_format) 
+        self.__amount_statistics = {"transaction_type": {}, "currency": {}} if amount_statistics else None
+        if rule_engine is None:
+            rule_engine = SuspiciousRuleEngine({"large_transaction_threshold": self.LARGE_TRANSACTION_THRESHOLD,
+                                                "uncommon_currencies": self.UNCOMMON_CURRENCIES})
+        self.__rule_engine = rule_engine
+        self.__observers = list(observers or [])
+        self.__suspicious_sink = suspicious_sink
+        self.__fx_rates = fx_rates
+        self.__deduplicator = deduplicator
+        self.__rollups = TransactionRollups() if rollups else None
+        if self.__rollups is not None:
+            # The rollups see every transaction like any other observer
+            self.__observers.append(self.__rollups)
+        self.__counters = {"rows_processed": 0, "suspicious_transactions": 0, "suspicious_reasons": {},
+                           "missing_fx_rates": 0}
+        self.__missing_rate_currencies = set()
+        self.__log_interval = log_interval
+        # Configure logging once; log records are written by a background thread
+        configure_logging(log_level, log_format, log_file)
 
     @property
     def input_data(self):
         """
-        list: Returns the input transaction data.
+        iterable: Returns the input transaction data.
         """
         return self.__input_data
     
@@ -61,6 +121,28 @@ class DataProcessor:
         """
         return self.__suspicious_transactions
     
+    @property
+    def suspicious_transaction_rules(self):
+        """
+        list: Returns the names of the rules that fired for each suspicious transaction,
+        in the same order as suspicious_transactions.
+        """
+        return self.__suspicious_transaction_rules
+
+    @property
+    def rule_engine(self):
+        """
+        SuspiciousRuleEngine: Returns the rules used to flag suspicious transactions.
+        """
+        return self.__rule_engine
+
+    @property
+    def observers(self):
+        """
+        list: Returns the detectors that observe every processed transaction.
+        """
+        return self.__observers
+
     @property
     def transaction_statistics(self):
         """
@@ -68,19 +150,58 @@ class DataProcessor:
         """
         return self.__transaction_statistics
 
+    @property
+    def amount_statistics(self):
+        """
+        dict: Returns the AmountDistribution of every transaction type (under "transaction_type") and
+        of every currency (under "currency"), or None if amount statistics are not enabled.
+        """
+        return self.__amount_statistics
+
+    @property
+    def fx_rates(self):
+        """
+        FXRateTable: Returns the exchange rates used to normalize balances, or None.
+        """
+        return self.__fx_rates
+
+    @property
+    def deduplicator(self):
+        """
+        TransactionDeduplicator: Returns the filter of already seen Transaction IDs, or None.
+        """
+        return self.__deduplicator
+
+    @property
+    def rollups(self):
+        """
+        TransactionRollups: Returns the totals per (day, account, transaction type), or None if
+        rollups are not enabled.
+        """
+        return self.__rollups
+
+    @property
+    def counters(self):
+        """
+        dict: Returns the number of rows processed, the number of suspicious transactions, the number
+        of suspicious hits per reason and the number of transactions without an exchange rate.
+        """
+        return self.__counters
+
 
     def process_data(self) -> dict:
         """
         Processes the input data to update account summaries, check for suspicious transactions,
         and update transaction statistics.
+        The input is consumed in a single pass, so an iterator input is only read once.
+        Each row is parsed into a Transaction record exactly once for the aggregate updates, the rules
+        and the observers; suspicious transactions are kept as the rows that were passed in.
         Returns:
         dict: A dictionary containing the account summaries, suspicious transactions, and transaction statistics.
         """
-        for row in self.__input_data:
-            self.update_account_summary(row)
-            self.check_suspicious_transactions(row)
-            self.update_transaction_statistics(row)
-        logging.info("Data Processing Complete")
+        self.process_rows(self.__input_data)
+        self.log_counters()
+        logger.info("Data Processing Complete")
 
         return {
             "account_summaries": self.__account_summaries,
@@ -88,65 +209,345 @@ class DataProcessor:
             "transaction_statistics": self.__transaction_statistics
         }
 
-    def update_account_summary(self, row: dict) -> None:
+    def process_rows(self, rows: Iterable[dict]) -> None:
+        """
+        Processes more rows on top of the current state, e.g. the rows appended to a file that is
+        being followed. Processing the input in several calls gives the same results as one call
+        to process_data.
+        Parameters:
+        rows (iterable): The transaction dictionaries or Transaction records to process.
+        """
+        if self.__deduplicator is not None:
+            rows = self.__deduplicator.filter(rows)
+        counters = self.__counters
+        log_interval = self.__log_interval
+        observers = self.__observers
+        evaluate = self.__rule_engine.evaluate_record
+        from_row = Transaction.from_row
+        add_to_account_summary = self.__add_to_account_summary
+        add_to_transaction_statistics = self.__add_to_transaction_statistics
+        # Checked once, so the two per-row debug messages cost nothing when they are not shown
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for row in rows:
+            # The row is parsed once and the record is passed down without being checked again
+            record = row if isinstance(row, Transaction) else from_row(row)
+            add_to_account_summary(record)
+            fired_rules = evaluate(record)
+            if fired_rules:
+                # The original row, so the suspicious outputs keep the input's formatting
+                self.record_suspicious_transaction(row, fired_rules)
+            add_to_transaction_statistics(record)
+            if debug:
+                logger.debug("Account summary updated: %s", record.account_number)
+                logger.debug("Updated transaction statistics for: %s", record.transaction_type)
+            for observer in observers:
+                observer.observe(record)
+            counters["rows_processed"] += 1
+            if counters["rows_processed"] % log_interval == 0:
+                self.log_counters()
+
+    @classmethod
+    def from_results(cls, results: dict) -> "DataProcessor":
+        """
+        Creates a DataProcessor holding already computed results, e.g. those returned by
+        process_data in another process.
+        Parameters:
+        results (dict): A dictionary containing the account summaries, suspicious transactions,
+            and transaction statistics.
+        Returns:
+        DataProcessor: A processor with no input data whose state is the given results.
+        """
+        processor = cls([])
+        processor.__account_summaries = results["account_summaries"]
+        processor.__suspicious_transactions = results["suspicious_transactions"]
+        processor.__transaction_statistics = results["transaction_statistics"]
+        processor.__suspicious_transaction_rules = results.get(
+            "suspicious_transaction_rules", [[] for _ in processor.__suspicious_transactions])
+        if "counters" in results:
+            processor.__counters = results["counters"]
+        processor.__amount_statistics = results.get("amount_statistics")
+        processor.__rollups = results.get("rollups")
+        return processor
+
+    def get_state(self) -> dict:
+        """
+        Returns the complete state of the processor, i.e. the results returned by process_data plus
+        the rules that fired for each suspicious transaction, the amount statistics, the rollups and the counters.
+        The state can be passed to from_results, e.g. to move it between processes.
+        Returns:
+        dict: The state of the processor.
+        """
+        return {
+            "account_summaries": self.__account_summaries,
+            "suspicious_transactions": self.__suspicious_transactions,
+            "transaction_statistics": self.__transaction_statistics,
+            "suspicious_transaction_rules": self.__suspicious_transaction_rules,
+            "amount_statistics": self.__amount_statistics,
+            "rollups": self.__rollups,
+            "counters": self.__counters
+        }
+
+    def merge(self, other: "DataProcessor") -> "DataProcessor":
+        """
+        Folds the results of another processor into this one.
+        Account totals and transaction statistics are added, amount distributions are merged and the other processor's suspicious
+        transactions are appended after this one's. The operation is associative, so partial results
+        (e.g. one per shard of a file) can be combined in any grouping; merging them in input order
+        gives the same results as processing the whole input with a single processor.
+        Parameters:
+        other (DataProcessor): The processor whose results are merged into this one. It is not modified.
+        Returns:
+        DataProcessor: This processor, to allow chaining.
+        """
+        for account_number, other_summary in other.account_summaries.items():
+            summary = self.__account_summaries.get(account_number)
+            if summary is None:
+                self.__account_summaries[account_number] = dict(
+                    other_summary, currency_balances=dict(other_summary.get("currency_balances", {})))
+            else:
+                summary["balance"] += other_summary["balance"]
+                summary["total_deposits"] += other_summary["total_deposits"]
+                summary["total_withdrawals"] += other_summary["total_withdrawals"]
+                currency_balances = summary.setdefault("currency_balances", {})
+                for currency, balance in other_summary.get("currency_balances", {}).items():
+                    currency_balances[currency] = currency_balances.get(currency, 0) + balance
+                if "normalized_balance" in other_summary:
+                    summary["normalized_balance"] = self.add_normalized(summary.get("normalized_balance", 0),
+                                                                        other_summary["normalized_balance"])
+
+        self.__suspicious_transactions.extend(other.suspicious_transactions)
+        self.__suspicious_transaction_rules.extend(other.suspicious_transaction_rules)
+
+        for transaction_type, other_statistics in other.transaction_statistics.items():
+            statistics = self.__transaction_statistics.get(transaction_type)
+            if statistics is None:
+                self.__transaction_statistics[transaction_type] = dict(other_statistics)
+            else:
+                statistics["total_amount"] += other_statistics["total_amount"]
+                statistics["transaction_count"] += other_statistics["transaction_count"]
+
+        if other.amount_statistics is not None:
+            if self.__amount_statistics is None:
+                self.__amount_statistics = {"transaction_type": {}, "currency": {}}
+            for dimension, other_distributions in other.amount_statistics.items():
+                distributions = self.__amount_statistics.setdefault(dimension, {})
+                for key, other_distribution in other_distributions.items():
+                    distributions.setdefault(key, AmountDistribution()).merge(other_distribution)
+
+        if other.rollups is not None:
+            if self.__rollups is None:
+                self.__rollups = TransactionRollups()
+            self.__rollups.merge(other.rollups)
+
+        self.__counters["rows_processed"] += other.counters["rows_processed"]
+        self.__counters["suspicious_transactions"] += other.counters["suspicious_transactions"]
+        reasons = self.__counters["suspicious_reasons"]
+        for reason, count in other.counters["suspicious_reasons"].items():
+            reasons[reason] = reasons.get(reason, 0) + count
+        self.__counters["missing_fx_rates"] = (self.__counters.get("missing_fx_rates", 0)
+                                               + other.counters.get("missing_fx_rates", 0))
+        return self
+
+    def update_account_summary(self, row: dict | Transaction) -> None:
         """
         Updates the summary information for an account based on a single transaction.
         Parameters:
-        row (dict): A dictionary representing a single transaction.
+        row (dict or Transaction): A single transaction.
         Updates and logs changes to account summaries.
         """
-        account_number = row['Account number']
-        transaction_type = row['Transaction type']
-        amount = float(row['Amount'])
+        record = as_transaction(row)
+        self.__add_to_account_summary(record)
+        logger.debug("Account summary updated: %s", record.account_number)
+
+    def __add_to_account_summary(self, record: Transaction) -> None:
+        """
+        Adds a parsed transaction to the summary of its account.
+        """
+        account_number = record.account_number
+        transaction_type = record.transaction_type
+        amount = record.amount
+        moves_balance = transaction_type == "deposit" or transaction_type == "withdrawal"
+        if moves_balance and self.__fx_rates is not None:
+            # Looked up before any state is changed
+            rate = self.normalization_rate(record.currency, record.date)
+            if rate is None:
+                self.__counters["missing_fx_rates"] += 1
         # Initialize account summary if not already present
-        if account_number not in self.__account_summaries:
-            self.__account_summaries[account_number] = {
-                "account_number": account_number,
-                "balance": 0,
-                "total_deposits": 0,
-                "total_withdrawals": 0
-            }
-        # Update account balance and totals based on transaction type    
+        summary = self.__account_summaries.get(account_number)
+        if summary is None:
+            summary = self.__account_summaries[account_number] = self.new_account_summary(account_number)
+        if not moves_balance:
+            return
+        # Update account balance and totals based on transaction type
         if transaction_type == "deposit":
-            self.__account_summaries[account_number]["balance"] += amount
-            self.__account_summaries[account_number]["total_deposits"] += amount
-        elif transaction_type == "withdrawal":
-            self.__account_summaries[account_number]["balance"] -= amount
-            self.__account_summaries[account_number]["total_withdrawals"] += amount
-        logging.info(f"Account summary updated: {account_number}")
+            summary["balance"] += amount
+            summary["total_deposits"] += amount
+            signed_amount = amount
+        else:
+            summary["balance"] -= amount
+            summary["total_withdrawals"] += amount
+            signed_amount = -amount
+        currency_balances = summary["currency_balances"]
+        currency_balances[record.currency] = currency_balances.get(record.currency, 0) + signed_amount
+        if self.__fx_rates is not None:
+            summary["normalized_balance"] = self.add_normalized(summary["normalized_balance"],
+                                                                None if rate is None else signed_amount * rate)
+
+    def normalization_rate(self, currency: str, day: str) -> float | None:
+        """
+        Returns the exchange rate used to normalize an amount to the base currency.
+        The first time a currency has no rate, a warning is logged.
+        Parameters:
+        currency (str): The currency of the amount.
+        day (str): The transaction date.
+        Returns:
+        float: The rate, or None if the exchange rates have no rate for the currency on or before the date.
+        """
+        try:
+            return self.__fx_rates.rate(currency, day)
+        except KeyError as error:
+            if currency not in self.__missing_rate_currencies:
+                self.__missing_rate_currencies.add(currency)
+                logger.warning("%s The normalized balance of the accounts it is used in is left empty.",
+                               error.args[0])
+            return None
+
+    @staticmethod
+    def add_normalized(balance: float | None, amount: float | None) -> float | None:
+        """
+        Adds a normalized amount to a normalized balance; once an amount has no rate the balance is unknown.
+        Parameters:
+        balance (float): The normalized balance, or None if it is unknown.
+        amount (float): The normalized amount, or None if it has no rate.
+        Returns:
+        float: The new normalized balance, or None if it is unknown.
+        """
+        if balance is None or amount is None:
+            return None
+        return balance + amount
+
+    def new_account_summary(self, account_number) -> dict:
+        """
+        Creates the empty summary of an account.
+        Parameters:
+        account_number: The account number.
+        Returns:
+        dict: The account number, zero balance and totals, an empty currency_balances dictionary and,
+        if exchange rates are configured, a zero normalized_balance.
+        """
+        summary = {
+            "account_number": account_number,
+            "balance": 0,
+            "total_deposits": 0,
+            "total_withdrawals": 0,
+            "currency_balances": {}
+        }
+        if self.__fx_rates is not None:
+            summary["normalized_balance"] = 0
+        return summary
+
     # A transaction is suspicious if above a threshold
-    def check_suspicious_transactions(self, row: dict) -> None:
+    def check_suspicious_transactions(self, row: dict | Transaction) -> None:
         """
         Checks if a transaction is suspicious and adds it to the list of suspicious transactions if so.
+        The transaction is added exactly as it was passed in, and the names of the rules that
+        fired are recorded in suspicious_transaction_rules.
         Parameters:
-        row (dict): A dictionary representing a single transaction.
+        row (dict or Transaction): A single transaction.
         """
-        amount = float(row['Amount'])
-        currency = row['Currency']
+        fired_rules = self.__rule_engine.evaluate(row)
+
+        if fired_rules:
+            self.record_suspicious_transaction(row, fired_rules)
 
-        if amount > self.LARGE_TRANSACTION_THRESHOLD or currency in self.UNCOMMON_CURRENCIES:
+    def record_suspicious_transaction(self, row: dict | Transaction, fired_rules: list) -> None:
+        """
+        Adds a transaction flagged by the rule engine to the suspicious transactions.
+        Parameters:
+        row (dict or Transaction): A single transaction.
+        fired_rules (list): The names of the rules that fired for the transaction.
+        """
+        if self.__suspicious_sink is not None:
+            self.__suspicious_sink(row, fired_rules)
+        else:
             self.__suspicious_transactions.append(row)
-            logging.warning(f"Suspicious transaction: {row}")
+            self.__suspicious_transaction_rules.append(fired_rules)
+        reasons = self.__counters["suspicious_reasons"]
+        for rule_name in fired_rules:
+            reasons[rule_name] = reasons.get(rule_name, 0) + 1
+        self.__counters["suspicious_transactions"] += 1
+        logger.warning("Suspicious transaction (%s): %s", ', '.join(fired_rules), row)
     # A transaction is suspicious if in uncommon currencies
-    def update_transaction_statistics(self, row: dict) -> None:
+    def update_transaction_statistics(self, row: dict | Transaction) -> None:
         """
         Updates statistics for a given transaction type.
         Parameters:
-        row (dict): A dictionary representing a single transaction.
+        row (dict or Transaction): A single transaction.
+        """
+        record = as_transaction(row)
+        self.__add_to_transaction_statistics(record)
+        logger.debug("Updated transaction statistics for: %s", record.transaction_type)
+
+    def __add_to_transaction_statistics(self, record: Transaction) -> None:
+        """
+        Adds a parsed transaction to the statistics of its transaction type.
         """
-        transaction_type = row['Transaction type']
-        amount = float(row['Amount'])
+        transaction_type = record.transaction_type
         # Initialize transaction type statistics if not already present
-        if transaction_type not in self.__transaction_statistics:
-            self.__transaction_statistics[transaction_type] = {
+        statistics = self.__transaction_statistics.get(transaction_type)
+        if statistics is None:
+            statistics = self.__transaction_statistics[transaction_type] = {
                 "total_amount": 0,
                 "transaction_count": 0
             }
         # Update total amount and transaction count for the type
-        self.__transaction_statistics[transaction_type]["total_amount"] += amount
-        self.__transaction_statistics[transaction_type]["transaction_count"] += 1
-        logging.info(f"Updated transaction statistics for: {transaction_type}")
+        statistics["total_amount"] += record.amount
+        statistics["transaction_count"] += 1
+        if self.__amount_statistics is not None:
+            self.amount_distribution("transaction_type", transaction_type).add(record.amount)
+            self.amount_distribution("currency", record.currency).add(record.amount)
     
+    def amount_distribution(self, dimension: str, key: str) -> AmountDistribution:
+        """
+        Returns the amount distribution of a transaction type or currency, creating it if needed.
+        Amount statistics must be enabled.
+        Parameters:
+        dimension (str): "transaction_type" or "currency".
+        key (str): The transaction type or currency code.
+        Returns:
+        AmountDistribution: The distribution of the amounts of that transaction type or currency.
+        """
+        distributions = self.__amount_statistics[dimension]
+        distribution = distributions.get(key)
+        if distribution is None:
+            distribution = distributions[key] = AmountDistribution()
+        return distribution
+
+    def get_amount_statistics(self, quantiles: tuple = DEFAULT_QUANTILES) -> dict:
+        """
+        Summarizes the amount distributions per transaction type and per currency.
+        The count, min, max, mean and standard deviation are exact; the quantiles are t-digest estimates.
+        Parameters:
+        quantiles (tuple): The quantiles to estimate, e.g. 0.95 for P95.
+        Returns:
+        dict: For each dimension ("transaction_type" and "currency"), a dictionary mapping each key to
+        its count, min, max, mean, std_dev and one 'p<percent>' entry per quantile (e.g. 'p95'), or an
+        empty dictionary if amount statistics are not enabled.
+        """
+        if self.__amount_statistics is None:
+            return {}
+        return {dimension: {key: distribution.summary(quantiles) for key, distribution in distributions.items()}
+                for dimension, distributions in self.__amount_statistics.items()}
+
+    def log_counters(self) -> None:
+        """
+        Logs the running counters in a single INFO message instead of one message per row.
+        """
+        logger.info("Processed %d rows, %d suspicious transactions (%s), %d without an exchange rate",
+                    self.__counters["rows_processed"], self.__counters["suspicious_transactions"],
+                    # A copy, as the record is formatted later by the log writer thread
+                    dict(self.__counters["suspicious_reasons"]), self.__counters.get("missing_fx_rates", 0))
+
     def get_average_transaction_amount(self, transaction_type: str) -> float:
         """
         Calculates the average amount for a given transaction type.
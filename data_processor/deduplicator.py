@@ -0,0 +1,354 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+from typing import Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+BLOOM_FILTER_VERSION = 1
+
+
+class BloomFilter:
+    """
+    A fixed-size set membership filter that may report false positives but never false negatives.
+
+    The filter is a bit array sized for an expected number of items and false positive rate;
+    each item sets `hash_count` bits chosen by double hashing one BLAKE2b digest. Memory use is
+    fixed when the filter is created: about 1.44 * log2(1 / error_rate) bits per expected item,
+    e.g. 18 MB for 10 million items at 0.1%. Adding more items than the expected number keeps
+    membership exact for the items added but raises the false positive rate.
+
+    Attributes:
+    __bit_count (int): The number of bits in the filter.
+    __hash_count (int): The number of bits set per item.
+    __bits (bytearray): The bit array.
+    __item_count (int): The number of items added that were certainly not in the filter yet.
+    __metadata (dict): JSON-serializable information saved and loaded with the filter.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initializes an empty filter.
+        Parameters:
+        capacity (int): The expected number of items.
+        error_rate (float): The false positive rate wanted once capacity items have been added.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be a positive integer.")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1.")
+        self.__capacity = capacity
+        self.__error_rate = error_rate
+        self.__bit_count = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.__hash_count = max(1, round(self.__bit_count / capacity * math.log(2)))
+        self.__bits = bytearray((self.__bit_count + 7) // 8)
+        self.__item_count = 0
+        self.__metadata = {}
+
+    @property
+    def capacity(self):
+        """
+        int: Returns the expected number of items.
+        """
+        return self.__capacity
+
+    @property
+    def error_rate(self):
+        """
+        float: Returns the false positive rate wanted at capacity.
+        """
+        return self.__error_rate
+
+    @property
+    def item_count(self):
+        """
+        int: Returns the number of items added that were certainly not in the filter yet; items that
+        collided with a false positive are not counted.
+        """
+        return self.__item_count
+
+    @property
+    def metadata(self):
+        """
+        dict: Returns information saved and loaded with the filter, e.g. what it was built from.
+        """
+        return self.__metadata
+
+    @property
+    def size_in_bytes(self):
+        """
+        int: Returns the size of the bit array.
+        """
+        return len(self.__bits)
+
+    def add(self, item: str) -> bool:
+        """
+        Adds an item.
+        Parameters:
+        item (str): The item.
+        Returns:
+        bool: True if the item may already have been in the filter, False if it certainly was not.
+        """
+        bits = self.__bits
+        present = True
+        for position in self.__positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                present = False
+                bits[position >> 3] |= mask
+        if not present:
+            self.__item_count += 1
+        return present
+
+    def __contains__(self, item: str) -> bool:
+        """
+        Checks whether an item may be in the filter.
+        """
+        bits = self.__bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self.__positions(item))
+
+    def save(self, file_path: str) -> None:
+        """
+        Saves the filter to a file. The filter is written to a temporary file that is then renamed,
+        so an interrupted save leaves the previous file intact.
+        Parameters:
+        file_path (str): The path of the filter file.
+        """
+        header = json.dumps({"version": BLOOM_FILTER_VERSION, "capacity": self.__capacity,
+                             "error_rate": self.__error_rate, "item_count": self.__item_count,
+                             "metadata": self.__metadata}).encode('utf-8')
+        temporary_path = f"{file_path}.tmp"
+        with open(temporary_path, 'wb') as filter_file:
+            filter_file.write(header + b'\n')
+            filter_file.write(self.__bits)
+        os.replace(temporary_path, file_path)
+
+    @classmethod
+    def load(cls, file_path: str) -> "BloomFilter":
+        """
+        Loads a filter saved with save.
+        Parameters:
+        file_path (str): The path of the filter file.
+        Returns:
+        BloomFilter: The loaded filter.
+        Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file was written in an unsupported format.
+        """
+        try:
+            with open(file_path, 'rb') as filter_file:
+                header = json.loads(filter_file.readline())
+                bits = filter_file.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File: {file_path} does not exist.")
+        except json.JSONDecodeError:
+            raise ValueError(f"File: {file_path} is not a Bloom filter.")
+        if header.get("version") != BLOOM_FILTER_VERSION:
+            raise ValueError(f"File: {file_path} has an unsupported version.")
+        bloom_filter = cls(header["capacity"], header["error_rate"])
+        if len(bits) != len(bloom_filter.__bits):
+            raise ValueError(f"File: {file_path} is truncated.")
+        bloom_filter.__bits[:] = bits
+        bloom_filter.__item_count = header["item_count"]
+        bloom_filter.__metadata = header.get("metadata", {})
+        return bloom_filter
+
+    def __positions(self, item: str):
+        """
+        Yields the bit positions of an item: h1 + i * h2 for i in range(hash_count).
+        """
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        bit_count = self.__bit_count
+        for index in range(self.__hash_count):
+            yield (first + index * second) % bit_count
+
+
+class TransactionDeduplicator:
+    """
+    Skips transactions whose Transaction ID has already been seen, in this run or a previous one.
+
+    Every ID is first checked against a BloomFilter held in memory. An ID the filter has certainly
+    not seen is new, which is the common case and costs no disk access. A probable hit is
+    confirmed against an exact SQLite table of every ID seen, so a false positive never drops a
+    transaction. New IDs are written to the table in batches. The memory used is the fixed size of
+    the filter plus one batch, however many IDs have been seen.
+
+    The new IDs are only committed by flush, which must be called once the results of the
+    transactions let through have been saved (e.g. with the checkpoint). Until then the batches are
+    held in an open SQLite transaction: closing the deduplicator without flushing, or a crash, rolls
+    them back, so the next run processes those transactions again instead of skipping them.
+
+    The filter is saved next to the database when the deduplicator is flushed, tagged with the
+    number of IDs in the database at that point; the database keeps the same count, updated in the
+    same transactions as the IDs. If the saved filter is missing or its count does not match the
+    database (e.g. after a crash between the two), it is rebuilt from the database when the
+    deduplicator is opened.
+
+    Attributes:
+    __db_path (str): The path of the SQLite database of seen IDs.
+    __filter_path (str): The path of the saved Bloom filter.
+    __bloom_filter (BloomFilter): The in-memory filter of seen IDs.
+    __pending (set): New IDs not written to the database yet.
+    __seen_count (int): The number of IDs in the database, including those not committed yet.
+    __duplicates (int): The number of duplicate transactions skipped.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS seen_transactions (
+            transaction_id TEXT PRIMARY KEY
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS dedup_state (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            seen_count INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO dedup_state VALUES (0, 0);
+    """
+
+    def __init__(self, db_path: str, capacity: int = 10000000, error_rate: float = 0.001, batch_size: int = 10000):
+        """
+        Opens (and if needed creates) the database and the filter.
+        Parameters:
+        db_path (str): The path of the SQLite database of seen IDs. The filter is saved to db_path + '.bloom'.
+        capacity (int): The expected number of distinct IDs; sizes a newly created filter.
+        error_rate (float): The false positive rate of a newly created filter at capacity.
+        batch_size (int): The number of new IDs written to the (uncommitted) database transaction at a time.
+        """
+        self.__db_path = db_path
+        self.__filter_path = f"{db_path}.bloom"
+        self.__batch_size = batch_size
+        self.__connection = sqlite3.connect(db_path)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.executescript(self.SCHEMA)
+        self.__pending = set()
+        self.__duplicates = 0
+
+        self.__seen_count = self.__connection.execute("SELECT seen_count FROM dedup_state").fetchone()[0]
+        try:
+            self.__bloom_filter = BloomFilter.load(self.__filter_path)
+        except (FileNotFoundError, ValueError):
+            self.__bloom_filter = None
+        if self.__bloom_filter is None or self.__bloom_filter.metadata.get("seen_count") != self.__seen_count:
+            if self.__seen_count:
+                logger.warning("Rebuilding the dedup filter from %s", db_path)
+            self.__rebuild_filter(max(capacity, self.__seen_count), error_rate)
+        if self.__seen_count > self.__bloom_filter.capacity:
+            logger.warning("Dedup filter holds %d IDs, more than its capacity of %d; more lookups will hit the database.",
+                           self.__seen_count, self.__bloom_filter.capacity)
+
+    @property
+    def db_path(self):
+        """
+        str: Returns the path of the SQLite database of seen IDs.
+        """
+        return self.__db_path
+
+    @property
+    def bloom_filter(self):
+        """
+        BloomFilter: Returns the in-memory filter of seen IDs.
+        """
+        return self.__bloom_filter
+
+    @property
+    def duplicates(self):
+        """
+        int: Returns the number of duplicate transactions skipped so far.
+        """
+        return self.__duplicates
+
+    def is_duplicate(self, transaction_id: str) -> bool:
+        """
+        Checks whether a Transaction ID has been seen before, and records it as seen.
+        Parameters:
+        transaction_id (str): The Transaction ID.
+        Returns:
+        bool: True if the ID had already been seen.
+        """
+        if not self.__bloom_filter.add(transaction_id):
+            self.__remember(transaction_id)
+            return False
+        # Probable hit: confirm it against the exact set of seen IDs
+        if transaction_id in self.__pending or self.__connection.execute(
+                "SELECT 1 FROM seen_transactions WHERE transaction_id = ?", (transaction_id,)).fetchone():
+            self.__duplicates += 1
+            return True
+        self.__remember(transaction_id)
+        return False
+
+    def filter(self, rows: Iterable) -> Iterator:
+        """
+        Lazily yields the rows whose Transaction ID has not been seen before.
+        Rows without a Transaction ID are always yielded.
+        Parameters:
+        rows (iterable): Transaction dictionaries or Transaction records.
+        Returns:
+        Iterator: The rows that are not duplicates, in input order.
+        """
+        for row in rows:
+            transaction_id = row["Transaction ID"]
+            if transaction_id in (None, '') or not self.is_duplicate(str(transaction_id)):
+                yield row
+            else:
+                logger.debug("Skipped duplicate transaction: %s", transaction_id)
+
+    def flush(self) -> None:
+        """
+        Commits the IDs seen since the last flush to the database and saves the filter.
+        Call it only once the results of the transactions that were let through have been saved.
+        """
+        self.__write_pending()
+        self.__connection.commit()
+        self.__bloom_filter.metadata["seen_count"] = self.__seen_count
+        self.__bloom_filter.save(self.__filter_path)
+        if self.__duplicates:
+            logger.info("Skipped %d duplicate transactions", self.__duplicates)
+
+    def close(self) -> None:
+        """
+        Closes the database. IDs seen since the last flush are discarded.
+        """
+        self.__connection.rollback()
+        self.__connection.close()
+
+    def __enter__(self) -> "TransactionDeduplicator":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # The IDs are only kept if the block that processed their transactions completed
+        if exc_type is None:
+            self.flush()
+        self.close()
+
+    def __remember(self, transaction_id: str) -> None:
+        """
+        Records a new ID, writing a batch to the database once enough are pending.
+        """
+        self.__pending.add(transaction_id)
+        if len(self.__pending) >= self.__batch_size:
+            self.__write_pending()
+
+    def __write_pending(self) -> None:
+        """
+        Writes the pending IDs to the open database transaction; they are committed by flush.
+        """
+        if self.__pending:
+            # Pending IDs were confirmed new, so every one of them is inserted
+            self.__connection.executemany("INSERT INTO seen_transactions VALUES (?)",
+                                          ((transaction_id,) for transaction_id in self.__pending))
+            self.__connection.execute("UPDATE dedup_state SET seen_count = seen_count + ?", (len(self.__pending),))
+            self.__seen_count += len(self.__pending)
+            self.__pending.clear()
+
+    def __rebuild_filter(self, capacity: int, error_rate: float) -> None:
+        """
+        Creates a filter holding every ID in the database.
+        """
+        self.__bloom_filter = BloomFilter(capacity, error_rate)
+        for (transaction_id,) in self.__connection.execute("SELECT transaction_id FROM seen_transactions"):
+            self.__bloom_filter.add(transaction_id)
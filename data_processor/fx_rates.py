@@ -0,0 +1,121 @@
+import bisect
+import csv
+from functools import lru_cache
+
+
+class FXRateTable:
+    """
+    Exchange rates keyed by (currency, date), used to normalize amounts to a base currency.
+
+    The rate of a currency on a date is the most recent rate published on or before that date, so
+    weekends and holidays use the previous business day's rate. Lookups go through an LRU cache
+    keyed by (currency, date): transactions arrive roughly in date order and use a handful of
+    currencies, so nearly every lookup is a cache hit and conversion costs one dictionary lookup
+    per row. Dates are compared as strings, so they must use a sortable format such as ISO 8601.
+
+    Attributes:
+    __base_currency (str): The currency amounts are converted to; its rate is always 1.
+    __dates (dict): Maps each currency to its sorted list of rate dates.
+    __rates (dict): Maps each currency to its rates, in the same order as its dates.
+    rate (callable): rate(currency, date) returns the rate of a currency on a date, through the LRU cache.
+    """
+
+    def __init__(self, rates: dict, base_currency: str = 'CAD', cache_size: int = 4096):
+        """
+        Initializes the table.
+        Parameters:
+        rates (dict): Maps (currency, date) tuples to the value of one unit of the currency in the base currency.
+        base_currency (str): The currency amounts are converted to.
+        cache_size (int): The number of (currency, date) lookups kept in the LRU cache.
+        """
+        self.__base_currency = base_currency
+        by_currency = {}
+        for (currency, day), rate in rates.items():
+            by_currency.setdefault(currency, []).append((day, float(rate)))
+        self.__dates = {}
+        self.__rates = {}
+        for currency, entries in by_currency.items():
+            entries.sort()
+            self.__dates[currency] = [day for day, _ in entries]
+            self.__rates[currency] = [rate for _, rate in entries]
+        self.__cache_size = cache_size
+        self.rate = lru_cache(maxsize=cache_size)(self.__find_rate)
+
+    def __getstate__(self) -> dict:
+        # The cache wraps a bound method and cannot be pickled, e.g. to send the table to worker processes
+        state = self.__dict__.copy()
+        del state['rate']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.rate = lru_cache(maxsize=self.__cache_size)(self.__find_rate)
+
+    @classmethod
+    def from_file(cls, file_path: str, base_currency: str = 'CAD', cache_size: int = 4096) -> "FXRateTable":
+        """
+        Loads rates from a CSV file with the columns Date, Currency and Rate.
+        Parameters:
+        file_path (str): The path to the CSV file.
+        base_currency (str): The currency amounts are converted to.
+        cache_size (int): The number of (currency, date) lookups kept in the LRU cache.
+        Returns:
+        FXRateTable: The loaded table.
+        Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If a row is missing a column or has an invalid rate.
+        """
+        try:
+            with open(file_path, 'r', newline='') as rates_file:
+                rows = list(csv.DictReader(rates_file))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File: {file_path} does not exist.")
+        rates = {}
+        for line_number, row in enumerate(rows, 2):
+            try:
+                rates[(row['Currency'], row['Date'])] = float(row['Rate'])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"File: {file_path} has an invalid rate on line {line_number}.")
+        return cls(rates, base_currency, cache_size)
+
+    @property
+    def base_currency(self):
+        """
+        str: Returns the currency amounts are converted to.
+        """
+        return self.__base_currency
+
+    @property
+    def currencies(self):
+        """
+        list: Returns the currencies with rates, not including the base currency.
+        """
+        return list(self.__dates)
+
+    def convert(self, amount: float, currency: str, day: str) -> float:
+        """
+        Converts an amount to the base currency at the rate of a date.
+        Parameters:
+        amount (float): The amount.
+        currency (str): The currency of the amount.
+        day (str): The transaction date.
+        Returns:
+        float: The amount in the base currency.
+        Raises:
+        KeyError: If there is no rate for the currency on or before the date.
+        """
+        return amount * self.rate(currency, day)
+
+    def __find_rate(self, currency: str, day: str) -> float:
+        """
+        Finds the rate of a currency on a date; wrapped by the LRU-cached `rate` method.
+        """
+        if currency == self.__base_currency:
+            return 1.0
+        dates = self.__dates.get(currency)
+        if dates is None:
+            raise KeyError(f"No exchange rate for currency {currency}.")
+        position = bisect.bisect_right(dates, day) - 1
+        if position < 0:
+            raise KeyError(f"No exchange rate for currency {currency} on or before {day}.")
+        return self.__rates[currency][position]
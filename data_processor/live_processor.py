@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+from typing import Callable
+
+from data_processor.data_processor import DataProcessor
+from input_handler.file_tailer import FileTailer
+
+logger = logging.getLogger(__name__)
+
+
+class LiveProcessor:
+    """
+    Keeps a resident DataProcessor up to date with a CSV file that is still being appended to.
+
+    Each poll reads the rows completed since the previous poll through a FileTailer and processes
+    them on top of the current state. Suspicious transactions among them are passed to the alert
+    writer (and flushed) in the same poll, so with the default poll interval they are reported
+    within about a second of being appended. Snapshots of the results are published less often:
+    once `snapshot_interval` seconds have passed or `snapshot_rows` rows have been processed since
+    the previous snapshot, whichever comes first, and only if something changed.
+
+    Attributes:
+    __tailer (FileTailer): Reads the new rows of the followed file.
+    __data_processor (DataProcessor): The resident processor holding the running results.
+    __publish (callable): Called with the processor to publish a snapshot, e.g. to write the outputs.
+    __alert_writer: Receives each suspicious transaction as soon as it is flagged, or None.
+    __poll_interval (float): Seconds to wait after a poll that found no new rows.
+    __snapshot_interval (float): Maximum seconds between two snapshots while rows keep arriving.
+    __snapshot_rows (int): Number of new rows after which a snapshot is published early.
+    __clock (callable): Returns the current time in seconds.
+    __rows_since_snapshot (int): Rows processed since the last snapshot.
+    __last_snapshot (float): Time of the last snapshot.
+    __snapshots (int): Number of snapshots published.
+    """
+
+    def __init__(self, input_file_path: str, data_processor: DataProcessor, publish: Callable,
+                 alert_writer=None, poll_interval: float = 0.2, snapshot_interval: float = 5.0,
+                 snapshot_rows: int = 10000, clock: Callable = time.monotonic):
+        """
+        Initializes the live processor. Nothing is read until the first poll.
+        Parameters:
+        input_file_path (str): The path of the CSV file to follow.
+        data_processor (DataProcessor): The processor the new rows are fed to, e.g. DataProcessor([]).
+            Pass it a rule engine, observers or rollups as usual.
+        publish (callable): Called as publish(data_processor) to publish a snapshot of the results.
+        alert_writer: An object with write(transaction, fired_rules) and flush() methods, such as a
+            SuspiciousTransactionWriter, that receives suspicious transactions as soon as they are flagged.
+        poll_interval (float): Seconds to wait after a poll that found no new rows.
+        snapshot_interval (float): Maximum seconds between two snapshots while rows keep arriving.
+        snapshot_rows (int): Number of new rows after which a snapshot is published early.
+        clock (callable): Returns the current time in seconds.
+        """
+        self.__tailer = FileTailer(input_file_path)
+        self.__data_processor = data_processor
+        self.__publish = publish
+        self.__alert_writer = alert_writer
+        self.__poll_interval = poll_interval
+        self.__snapshot_interval = snapshot_interval
+        self.__snapshot_rows = snapshot_rows
+        self.__clock = clock
+        self.__rows_since_snapshot = 0
+        self.__last_snapshot = clock()
+        self.__snapshots = 0
+
+    @property
+    def data_processor(self):
+        """
+        DataProcessor: Returns the resident processor holding the running results.
+        """
+        return self.__data_processor
+
+    @property
+    def tailer(self):
+        """
+        FileTailer: Returns the tailer reading the followed file.
+        """
+        return self.__tailer
+
+    @property
+    def snapshots(self):
+        """
+        int: Returns the number of snapshots published so far.
+        """
+        return self.__snapshots
+
+    def poll(self) -> int:
+        """
+        Processes the rows appended since the previous poll, reports the suspicious transactions
+        among them and publishes a snapshot if one is due.
+        Returns:
+        int: The number of new rows processed.
+        """
+        rows = self.__tailer.read_rows()
+        if rows:
+            data_processor = self.__data_processor
+            already_flagged = len(data_processor.suspicious_transactions)
+            data_processor.process_rows(rows)
+            if self.__alert_writer is not None:
+                flagged = data_processor.suspicious_transactions[already_flagged:]
+                fired_rules = data_processor.suspicious_transaction_rules[already_flagged:]
+                for transaction, rules in zip(flagged, fired_rules):
+                    self.__alert_writer.write(transaction, rules)
+                if flagged:
+                    self.__alert_writer.flush()
+            self.__rows_since_snapshot += len(rows)
+
+        if self.__rows_since_snapshot and (self.__rows_since_snapshot >= self.__snapshot_rows
+                                           or self.__clock() - self.__last_snapshot >= self.__snapshot_interval):
+            self.publish_snapshot()
+        return len(rows)
+
+    def publish_snapshot(self) -> None:
+        """
+        Publishes a snapshot of the current results right away.
+        """
+        self.__publish(self.__data_processor)
+        self.__snapshots += 1
+        self.__rows_since_snapshot = 0
+        self.__last_snapshot = self.__clock()
+        logger.info("Snapshot %d published after %d rows", self.__snapshots,
+                    self.__data_processor.counters["rows_processed"])
+
+    def run(self, stop_event: threading.Event = None) -> None:
+        """
+        Polls the file until stop_event is set (or forever), waiting poll_interval seconds whenever
+        there is nothing new. Polls that find rows are followed by another poll straight away, so a
+        backlog is caught up at full speed. Rows processed since the last snapshot are published
+        before returning.
+        Parameters:
+        stop_event (threading.Event): Set from another thread to stop following the file.
+        """
+        stop_event = stop_event or threading.Event()
+        try:
+            while not stop_event.is_set():
+                if not self.poll():
+                    stop_event.wait(self.__poll_interval)
+            if self.__rows_since_snapshot:
+                self.publish_snapshot()
+        finally:
+            self.__tailer.close()
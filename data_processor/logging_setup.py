@@ -0,0 +1,70 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+
+DEFAULT_LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener = None
+
+
+class DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """
+    A QueueHandler that puts records on the queue as they are, without formatting them.
+    The standard QueueHandler formats every record in the logging thread before queuing it, so that
+    it can be pickled; the queue used here never leaves the process, so formatting the message
+    (including the repr of its arguments) is left to the listener thread.
+    The arguments of a log call must therefore not be modified after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Returns the record unchanged, to be formatted by the listener's handler.
+        """
+        return record
+
+
+def configure_logging(log_level=logging.WARNING, log_format: str = None, log_file: str = None) -> None:
+    """
+    Configures the root logger to write log records from a background thread.
+    Log calls only put the unformatted record on an in-memory queue (see DeferredFormatQueueHandler);
+    a QueueListener thread formats the records and writes them to the console or to log_file, so
+    neither formatting nor slow log output (e.g. many suspicious transaction warnings) slows processing. Like logging.basicConfig, this does nothing if
+    the root logger already has handlers, so it is cheap to call for every DataProcessor.
+    Parameters:
+    log_level (int): Logging level.
+    log_format (str): Format of the log messages.
+    log_file (str): File path for logging output. Logs to console if not specified.
+    """
+    global _listener
+    root = logging.getLogger()
+    if root.handlers:
+        return
+
+    if log_file:
+        output_handler = logging.FileHandler(log_file)
+    else:
+        output_handler = logging.StreamHandler()
+    output_handler.setFormatter(logging.Formatter(log_format or DEFAULT_LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(DeferredFormatQueueHandler(log_queue))
+    root.setLevel(log_level)
+    _listener = logging.handlers.QueueListener(log_queue, output_handler)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    Stops the background log writer after it has written every queued record, and closes its output.
+    Registered to run at interpreter exit.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
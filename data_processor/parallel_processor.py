@@ -0,0 +1,59 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+from data_processor.data_processor import DataProcessor
+from input_handler.input_handler import InputHandler
+
+
+def process_shard(file_path: str, start: int, end: int, processor_class: type = DataProcessor,
+                  processor_options: dict = None) -> dict:
+    """
+    Processes the rows of one byte-range shard of a CSV file.
+    Runs inside a worker process, so it must stay a module-level function.
+    Parameters:
+    file_path (str): The path to the CSV file.
+    start (int): The byte offset of the first line of the shard.
+    end (int): The byte offset at which the shard ends.
+    processor_class (type): The DataProcessor class used to process the shard.
+    processor_options (dict): Keyword arguments passed to the processor, e.g. a rule_engine.
+    Returns:
+    dict: The state of the processor after processing the shard, as returned by get_state.
+    """
+    input_handler = InputHandler(file_path)
+    processor = processor_class(input_handler.iter_csv_range(start, end), **(processor_options or {}))
+    processor.process_data()
+    return processor.get_state()
+
+
+def process_file_in_parallel(file_path: str, workers: int = None, processor_class: type = DataProcessor,
+                             processor_options: dict = None) -> DataProcessor:
+    """
+    Processes a CSV file with a pool of worker processes.
+    The file is split into byte-range shards on line boundaries, each shard is processed by its own
+    DataProcessor and the partial results are merged in shard order, so the results match those of
+    a single DataProcessor run over the whole file.
+    Parameters:
+    file_path (str): The path to the CSV file.
+    workers (int): The number of worker processes. Defaults to the number of CPUs.
+    processor_class (type): The DataProcessor class used to process each shard.
+    processor_options (dict): Keyword arguments passed to each processor, e.g. a rule_engine.
+    Returns:
+    DataProcessor: A processor holding the merged results.
+    Raises:
+    ValueError: If the file is not an uncompressed CSV file.
+    """
+    input_handler = InputHandler(file_path)
+    if input_handler.get_file_format() != 'csv' or input_handler.get_compression() is not None:
+        raise ValueError("Parallel processing requires an uncompressed .csv file.")
+    workers = workers or os.cpu_count() or 1
+    shards = input_handler.get_csv_shards(workers)
+    if not shards:
+        return processor_class([], **(processor_options or {}))
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+        partial_results = executor.map(process_shard, [file_path] * len(shards),
+                                       [start for start, _ in shards], [end for _, end in shards],
+                                       [processor_class] * len(shards), [processor_options] * len(shards))
+        partials = [processor_class.from_results(results) for results in partial_results]
+    return reduce(DataProcessor.merge, partials[1:], partials[0])
@@ -0,0 +1,139 @@
+from array import array
+
+from data_processor.transaction import Transaction, as_transaction
+
+
+class TransactionRollups:
+    """
+    Pre-aggregated totals keyed by (day, account number, transaction type), kept during processing
+    so daily and monthly reports don't need another pass over the raw input.
+
+    The daily totals are stored compactly: a dictionary maps each key to a slot in two packed
+    arrays holding the total amount (float64) and transaction count (int64) of every key. Coarser
+    rollups such as (month, transaction type) are derived from the daily totals, never from the raw
+    rows, so they cost one pass over the (much smaller) daily table. Rollups of different shards or
+    files can be merged.
+
+    Attributes:
+    __slots (dict): Maps each (day, account number, transaction type) key to its slot in the arrays.
+    __totals (array): The total amount of each key.
+    __counts (array): The transaction count of each key.
+    """
+
+    def __init__(self):
+        """
+        Initializes empty rollups.
+        """
+        self.__slots = {}
+        self.__totals = array('d')
+        self.__counts = array('q')
+
+    def __len__(self) -> int:
+        """
+        Returns the number of (day, account number, transaction type) keys.
+        """
+        return len(self.__slots)
+
+    def observe(self, row: dict | Transaction) -> None:
+        """
+        Adds a transaction to the total of its day, account and transaction type.
+        Parameters:
+        row (dict or Transaction): A single transaction.
+        """
+        record = as_transaction(row)
+        self.add((record.date, record.account_number, record.transaction_type), record.amount, 1)
+
+    def add(self, key: tuple, total_amount: float, transaction_count: int) -> None:
+        """
+        Adds an amount and a count to a daily key.
+        Parameters:
+        key (tuple): The (day, account number, transaction type) key.
+        total_amount (float): The amount to add.
+        transaction_count (int): The number of transactions to add.
+        """
+        slot = self.__slots.get(key)
+        if slot is None:
+            self.__slots[key] = len(self.__totals)
+            self.__totals.append(total_amount)
+            self.__counts.append(transaction_count)
+        else:
+            self.__totals[slot] += total_amount
+            self.__counts[slot] += transaction_count
+
+    def daily(self) -> dict:
+        """
+        Returns the daily rollup.
+        Returns:
+        dict: Maps each (day, account number, transaction type) key, in order of first appearance,
+        to a dictionary with its total_amount and transaction_count.
+        """
+        totals = self.__totals
+        counts = self.__counts
+        return {key: {"total_amount": totals[slot], "transaction_count": counts[slot]}
+                for key, slot in self.__slots.items()}
+
+    def rollup(self, key_function) -> dict:
+        """
+        Derives a coarser rollup from the daily totals.
+        Parameters:
+        key_function (callable): Maps a (day, account number, transaction type) key to the coarser key;
+            daily keys mapped to the same coarser key are added together.
+        Returns:
+        dict: Maps each coarser key, in sorted order, to a dictionary with its total_amount and transaction_count.
+        """
+        totals = self.__totals
+        counts = self.__counts
+        coarse = {}
+        for key, slot in self.__slots.items():
+            coarse_key = key_function(key)
+            entry = coarse.get(coarse_key)
+            if entry is None:
+                coarse[coarse_key] = {"total_amount": totals[slot], "transaction_count": counts[slot]}
+            else:
+                entry["total_amount"] += totals[slot]
+                entry["transaction_count"] += counts[slot]
+        return {key: coarse[key] for key in sorted(coarse)}
+
+    def monthly(self) -> dict:
+        """
+        Returns the (month, transaction type) rollup, derived from the daily totals.
+        The month is the first seven characters of the date, e.g. '2023-03'.
+        Returns:
+        dict: Maps each (month, transaction type) key, in sorted order, to a dictionary with its
+        total_amount and transaction_count.
+        """
+        return self.rollup(lambda key: (key[0][:7], key[2]))
+
+    def merge(self, other: "TransactionRollups") -> "TransactionRollups":
+        """
+        Folds the rollups of another shard or file into these ones.
+        Parameters:
+        other (TransactionRollups): The rollups to merge. They are not modified.
+        Returns:
+        TransactionRollups: These rollups, to allow chaining.
+        """
+        for key, slot in other.__slots.items():
+            self.add(key, other.__totals[slot], other.__counts[slot])
+        return self
+
+    def to_dict(self) -> dict:
+        """
+        Returns a JSON-serializable representation of the rollups, e.g. for checkpoints.
+        Returns:
+        dict: The daily entries as [day, account number, transaction type, total amount, count] lists.
+        """
+        return {"daily": [[*key, self.__totals[slot], self.__counts[slot]] for key, slot in self.__slots.items()]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TransactionRollups":
+        """
+        Restores rollups saved with to_dict.
+        Parameters:
+        data (dict): The representation returned by to_dict.
+        Returns:
+        TransactionRollups: The restored rollups.
+        """
+        rollups = cls()
+        for day, account_number, transaction_type, total_amount, transaction_count in data["daily"]:
+            rollups.add((day, account_number, transaction_type), total_amount, transaction_count)
+        return rollups
@@ -0,0 +1,164 @@
+import json
+import re
+
+from data_processor.transaction import Transaction, as_transaction
+
+LARGE_TRANSACTION = "large_transaction"
+UNCOMMON_CURRENCY = "uncommon_currency"
+TRANSACTION_TYPE_LIMIT = "transaction_type_limit"
+
+
+class SuspiciousRuleEngine:
+    """
+    Evaluates configurable rules that flag suspicious transactions.
+    The rules are compiled once into dictionary and set lookups, plus a single regular expression
+    for all description keyword rules, so evaluating a transaction costs a handful of lookups
+    regardless of how many rules are configured.
+
+    Configuration keys (all optional):
+    large_transaction_threshold (float): Amount above which a transaction is large.
+    currency_thresholds (dict): Large transaction thresholds for specific currencies,
+        overriding large_transaction_threshold.
+    uncommon_currencies (list): Currency codes that are always flagged.
+    transaction_type_limits (dict): Maximum amount per transaction type, e.g. {"withdrawal": 5000}.
+    keyword_rules (dict): Maps a rule name to a list of keywords; a transaction whose description
+        contains one of the keywords (as a whole word, ignoring case) fires that rule.
+
+    Attributes:
+    __default_threshold (float): The large transaction threshold for currencies without their own.
+    __currency_thresholds (dict): Large transaction thresholds by currency.
+    __uncommon_currencies (frozenset): Currency codes that are always flagged.
+    __type_limits (dict): Maximum amounts by transaction type.
+    __keyword_pattern (re.Pattern): A single pattern matching every keyword rule, or None.
+    __keyword_groups (dict): Maps the pattern's group names to keyword rule names.
+    """
+
+    def __init__(self, config: dict = None):
+        """
+        Compiles the rules of the given configuration.
+        Parameters:
+        config (dict): The rule configuration, see the class documentation.
+        Raises:
+        ValueError: If the configuration contains unknown keys.
+        """
+        config = dict(config or {})
+        unknown_keys = set(config) - {"large_transaction_threshold", "currency_thresholds", "uncommon_currencies",
+                                      "transaction_type_limits", "keyword_rules"}
+        if unknown_keys:
+            raise ValueError(f"Unknown rule configuration keys: {', '.join(sorted(unknown_keys))}")
+
+        threshold = config.get("large_transaction_threshold")
+        self.__default_threshold = float('inf') if threshold is None else float(threshold)
+        self.__currency_thresholds = {currency: float(value)
+                                      for currency, value in config.get("currency_thresholds", {}).items()}
+        self.__uncommon_currencies = frozenset(config.get("uncommon_currencies", ()))
+        self.__type_limits = {transaction_type: float(value)
+                              for transaction_type, value in config.get("transaction_type_limits", {}).items()}
+
+        # One named group per keyword rule, combined into a single alternation
+        self.__keyword_groups = {}
+        alternatives = []
+        for index, (rule_name, keywords) in enumerate(config.get("keyword_rules", {}).items()):
+            if not keywords:
+                continue
+            group = f"rule{index}"
+            self.__keyword_groups[group] = rule_name
+            words = '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+            alternatives.append(f"(?P<{group}>\\b(?:{words})\\b)")
+        self.__keyword_pattern = re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "SuspiciousRuleEngine":
+        """
+        Loads the rule configuration from a JSON file.
+        Parameters:
+        file_path (str): The path to the JSON configuration file.
+        Returns:
+        SuspiciousRuleEngine: The compiled rule engine.
+        Raises:
+        FileNotFoundError: If the configuration file does not exist.
+        """
+        try:
+            with open(file_path, 'r') as config_file:
+                return cls(json.load(config_file))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File: {file_path} does not exist.")
+
+    @property
+    def rule_names(self):
+        """
+        list: Returns the names of the rules that can fire.
+        """
+        names = []
+        if self.__default_threshold != float('inf') or self.__currency_thresholds:
+            names.append(LARGE_TRANSACTION)
+        if self.__uncommon_currencies:
+            names.append(UNCOMMON_CURRENCY)
+        if self.__type_limits:
+            names.append(TRANSACTION_TYPE_LIMIT)
+        names.extend(dict.fromkeys(self.__keyword_groups.values()))
+        return names
+
+    @property
+    def has_keyword_rules(self):
+        """
+        bool: Returns whether any description keyword rule is configured.
+        """
+        return self.__keyword_pattern is not None
+
+    def threshold_for(self, currency: str) -> float:
+        """
+        Returns the large transaction threshold that applies to a currency.
+        """
+        return self.__currency_thresholds.get(currency, self.__default_threshold)
+
+    def limit_for(self, transaction_type: str) -> float:
+        """
+        Returns the maximum amount allowed for a transaction type (infinite if unlimited).
+        """
+        return self.__type_limits.get(transaction_type, float('inf'))
+
+    def is_uncommon(self, currency: str) -> bool:
+        """
+        Returns whether a currency is flagged as uncommon.
+        """
+        return currency in self.__uncommon_currencies
+
+    def match_keywords(self, description) -> list:
+        """
+        Returns the names of the keyword rules whose keywords appear in a description.
+        """
+        if self.__keyword_pattern is None or not description:
+            return []
+        return list(dict.fromkeys(self.__keyword_groups[match.lastgroup]
+                                  for match in self.__keyword_pattern.finditer(description)))
+
+    def evaluate(self, row: dict | Transaction) -> list:
+        """
+        Evaluates every rule against a single transaction.
+        Parameters:
+        row (dict or Transaction): A single transaction.
+        Returns:
+        list: The names of the rules that fired, empty if the transaction is not suspicious.
+        """
+        return self.evaluate_record(as_transaction(row))
+
+    def evaluate_record(self, record: Transaction) -> list:
+        """
+        Evaluates every rule against a transaction that is already a Transaction record, e.g. in the
+        per-row loop of DataProcessor, where the row has been parsed once.
+        Parameters:
+        record (Transaction): A single parsed transaction.
+        Returns:
+        list: The names of the rules that fired, empty if the transaction is not suspicious.
+        """
+        fired = []
+        if record.amount > self.__currency_thresholds.get(record.currency, self.__default_threshold):
+            fired.append(LARGE_TRANSACTION)
+        if record.currency in self.__uncommon_currencies:
+            fired.append(UNCOMMON_CURRENCY)
+        if record.transaction_type in self.__type_limits and record.amount > self.__type_limits[record.transaction_type]:
+            fired.append(TRANSACTION_TYPE_LIMIT)
+        if self.__keyword_pattern is not None:
+            fired.extend(self.match_keywords(record.description))
+        return fired
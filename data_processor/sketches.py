@@ -0,0 +1,453 @@
+import hashlib
+import heapq
+import math
+from functools import lru_cache
+
+from data_processor.transaction import Transaction, as_transaction
+
+
+class SpaceSaving:
+    """
+    Weighted Space-Saving sketch of the heaviest keys of a stream (Metwally et al.).
+
+    At most `capacity` keys are monitored. When a new key arrives and the table is full, the key
+    with the smallest count is evicted and the new key inherits that count as its error. Every
+    estimate is an upper bound on the true weight and overestimates it by at most its recorded
+    error, which is itself at most total_weight / capacity; any key whose true weight exceeds
+    total_weight / capacity is guaranteed to be monitored. Memory is O(capacity) and an update
+    is O(log capacity) amortized.
+
+    Attributes:
+    __capacity (int): The maximum number of monitored keys.
+    __counters (dict): Maps each monitored key to its [estimated weight, maximum overestimate].
+    __heap (list): (weight, key) entries used to find the smallest counter; stale entries are skipped.
+    __total_weight (float): The total weight of the stream.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initializes an empty sketch.
+        Parameters:
+        capacity (int): The maximum number of monitored keys.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be a positive integer.")
+        self.__capacity = capacity
+        self.__counters = {}
+        self.__heap = []
+        self.__total_weight = 0
+
+    @property
+    def capacity(self):
+        """
+        int: Returns the maximum number of monitored keys.
+        """
+        return self.__capacity
+
+    @property
+    def total_weight(self):
+        """
+        float: Returns the total weight of the stream.
+        """
+        return self.__total_weight
+
+    @property
+    def error_bound(self):
+        """
+        float: Returns the largest possible overestimate of any key, total_weight / capacity.
+        """
+        return self.__total_weight / self.__capacity
+
+    def add(self, key, weight: float = 1) -> None:
+        """
+        Adds weight to a key.
+        Parameters:
+        key: The key, e.g. an account number.
+        weight (float): The non-negative weight, e.g. a transaction amount.
+        """
+        self.__total_weight += weight
+        counter = self.__counters.get(key)
+        if counter is None:
+            if len(self.__counters) < self.__capacity:
+                counter = self.__counters[key] = [0, 0]
+            else:
+                evicted_key, evicted_weight = self.__pop_smallest()
+                del self.__counters[evicted_key]
+                counter = self.__counters[key] = [evicted_weight, evicted_weight]
+        counter[0] += weight
+        heapq.heappush(self.__heap, (counter[0], key))
+        if len(self.__heap) > 4 * self.__capacity:
+            # Drop the stale entries so the heap stays proportional to the capacity
+            self.__heap = [(weight, key) for key, (weight, _) in self.__counters.items()]
+            heapq.heapify(self.__heap)
+
+    def top(self, k: int) -> list:
+        """
+        Returns the k keys with the largest estimated weights.
+        Parameters:
+        k (int): The number of keys.
+        Returns:
+        list: (key, estimated weight, maximum overestimate) tuples, heaviest first. The true weight of
+        each key lies between estimated weight - maximum overestimate and the estimated weight.
+        """
+        ranked = heapq.nlargest(k, self.__counters.items(), key=lambda item: item[1][0])
+        return [(key, weight, error) for key, (weight, error) in ranked]
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Folds another sketch into this one (Agarwal et al.'s mergeable summaries).
+        A key missing from one sketch is credited with that sketch's smallest count, so estimates
+        remain upper bounds; the merged sketch keeps the `capacity` heaviest keys.
+        Parameters:
+        other (SpaceSaving): The sketch to merge. It is not modified.
+        Returns:
+        SpaceSaving: This sketch, to allow chaining.
+        """
+        own_floor = self.__floor()
+        other_floor = other.__floor()
+        combined = {}
+        for key in self.__counters.keys() | other.__counters.keys():
+            own_weight, own_error = self.__counters.get(key, (own_floor, own_floor))
+            other_weight, other_error = other.__counters.get(key, (other_floor, other_floor))
+            combined[key] = [own_weight + other_weight, own_error + other_error]
+        kept = heapq.nlargest(self.__capacity, combined.items(), key=lambda item: item[1][0])
+        self.__counters = dict(kept)
+        self.__heap = [(weight, key) for key, (weight, _) in self.__counters.items()]
+        heapq.heapify(self.__heap)
+        self.__total_weight += other.__total_weight
+        return self
+
+    def __floor(self) -> float:
+        """
+        Returns the smallest count if the table is full, since an unmonitored key may have that much
+        weight, or 0 otherwise.
+        """
+        if len(self.__counters) < self.__capacity:
+            return 0
+        return min(weight for weight, _ in self.__counters.values())
+
+    def __pop_smallest(self) -> tuple:
+        """
+        Removes the heap entry of the monitored key with the smallest count.
+        """
+        while True:
+            weight, key = heapq.heappop(self.__heap)
+            counter = self.__counters.get(key)
+            if counter is not None and counter[0] == weight:
+                return key, weight
+
+
+class ExactTopK:
+    """
+    Exact counterpart of SpaceSaving with the same interface, for checking it in tests.
+    It keeps the weight of every key, so its memory grows with the number of distinct keys.
+    """
+
+    def __init__(self):
+        self.__weights = {}
+        self.__total_weight = 0
+
+    @property
+    def total_weight(self):
+        """
+        float: Returns the total weight of the stream.
+        """
+        return self.__total_weight
+
+    @property
+    def error_bound(self):
+        """
+        float: Returns 0; the weights are exact.
+        """
+        return 0
+
+    def add(self, key, weight: float = 1) -> None:
+        """
+        Adds weight to a key.
+        """
+        self.__total_weight += weight
+        self.__weights[key] = self.__weights.get(key, 0) + weight
+
+    def top(self, k: int) -> list:
+        """
+        Returns the k heaviest keys as (key, weight, 0) tuples, heaviest first.
+        """
+        return [(key, weight, 0) for key, weight in heapq.nlargest(k, self.__weights.items(), key=lambda item: item[1])]
+
+    def merge(self, other: "ExactTopK") -> "ExactTopK":
+        """
+        Folds another counter into this one.
+        """
+        for key, weight in other.__weights.items():
+            self.__weights[key] = self.__weights.get(key, 0) + weight
+        self.__total_weight += other.__total_weight
+        return self
+
+
+@lru_cache(maxsize=65536)
+def _hash64(key: str) -> int:
+    """
+    Returns a stable 64-bit hash of a key; unlike hash(), it is the same in every process.
+    Cached because the same accounts appear over and over.
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch of the number of distinct keys in a stream (Flajolet et al.).
+
+    The sketch uses 2**precision one-byte registers whatever the number of keys, and its relative
+    standard error is 1.04 / sqrt(2**precision): about 1.6% at the default precision of 12 (4 KiB)
+    and 0.8% at 14 (16 KiB). Small cardinalities use linear counting and are nearly exact.
+    Sketches with the same precision merge without any loss by taking the register maxima.
+
+    Attributes:
+    __precision (int): The number of hash bits used to select a register.
+    __registers (bytearray): The maximum rank seen by each register.
+    """
+
+    def __init__(self, precision: int = 12):
+        """
+        Initializes an empty sketch.
+        Parameters:
+        precision (int): Between 4 and 18; uses 2**precision bytes.
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18.")
+        self.__precision = precision
+        self.__registers = bytearray(1 << precision)
+
+    @property
+    def precision(self):
+        """
+        int: Returns the precision of the sketch.
+        """
+        return self.__precision
+
+    @property
+    def relative_error(self):
+        """
+        float: Returns the relative standard error of the estimate.
+        """
+        return 1.04 / math.sqrt(len(self.__registers))
+
+    def add(self, key) -> None:
+        """
+        Adds a key.
+        Parameters:
+        key: The key, e.g. an account number.
+        """
+        hashed = _hash64(str(key))
+        index = hashed >> (64 - self.__precision)
+        remaining_bits = 64 - self.__precision
+        remainder = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - remainder.bit_length() + 1
+        if rank > self.__registers[index]:
+            self.__registers[index] = rank
+
+    def count(self) -> int:
+        """
+        Estimates the number of distinct keys added.
+        Returns:
+        int: The estimated number of distinct keys.
+        """
+        registers = self.__registers
+        size = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -register for register in registers)
+        zeros = registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Folds another sketch with the same precision into this one.
+        Parameters:
+        other (HyperLogLog): The sketch to merge. It is not modified.
+        Returns:
+        HyperLogLog: This sketch, to allow chaining.
+        Raises:
+        ValueError: If the precisions differ.
+        """
+        if other.__precision != self.__precision:
+            raise ValueError("Only sketches with the same precision can be merged.")
+        self.__registers = bytearray(map(max, self.__registers, other.__registers))
+        return self
+
+
+class ExactDistinctCounter:
+    """
+    Exact counterpart of HyperLogLog with the same interface, for checking it in tests.
+    It keeps every key, so its memory grows with the number of distinct keys.
+    """
+
+    def __init__(self):
+        self.__keys = set()
+
+    @property
+    def relative_error(self):
+        """
+        float: Returns 0; the count is exact.
+        """
+        return 0.0
+
+    def add(self, key) -> None:
+        """
+        Adds a key.
+        """
+        self.__keys.add(key)
+
+    def count(self) -> int:
+        """
+        Returns the number of distinct keys added.
+        """
+        return len(self.__keys)
+
+    def merge(self, other: "ExactDistinctCounter") -> "ExactDistinctCounter":
+        """
+        Folds another counter into this one.
+        """
+        self.__keys |= other.__keys
+        return self
+
+
+class TopAccounts:
+    """
+    Observer tracking the accounts with the largest volume of one transaction type, e.g. the top
+    100 accounts by withdrawal volume, with a SpaceSaving sketch (or exactly, for checking).
+    Attach it to a DataProcessor through its observers option.
+
+    Attributes:
+    __k (int): The number of accounts reported.
+    __transaction_type (str): The transaction type whose amounts are added up.
+    __counter (SpaceSaving or ExactTopK): The heavy-hitter counter.
+    """
+
+    def __init__(self, k: int = 100, transaction_type: str = "withdrawal", capacity: int = None, exact: bool = False):
+        """
+        Initializes the observer.
+        Parameters:
+        k (int): The number of accounts reported.
+        transaction_type (str): The transaction type whose amounts are added up.
+        capacity (int): The number of accounts monitored by the sketch. Defaults to 10 * k; a larger
+            capacity tightens the error bound total_volume / capacity.
+        exact (bool): Count every account exactly instead of using the sketch.
+        """
+        if k < 1:
+            raise ValueError("k must be a positive integer.")
+        self.__k = k
+        self.__transaction_type = transaction_type
+        self.__counter = ExactTopK() if exact else SpaceSaving(capacity or 10 * k)
+
+    @property
+    def transaction_type(self):
+        """
+        str: Returns the transaction type whose amounts are added up.
+        """
+        return self.__transaction_type
+
+    @property
+    def error_bound(self):
+        """
+        float: Returns the largest possible overestimate of an account's volume.
+        """
+        return self.__counter.error_bound
+
+    def observe(self, row: dict | Transaction) -> None:
+        """
+        Adds a transaction's amount to its account if it has the tracked transaction type.
+        Parameters:
+        row (dict or Transaction): A single transaction.
+        """
+        record = as_transaction(row)
+        if record.transaction_type == self.__transaction_type:
+            self.__counter.add(record.account_number, record.amount)
+
+    def top(self) -> list:
+        """
+        Returns the top accounts.
+        Returns:
+        list: Dictionaries with the account_number, volume (an upper bound of the true volume) and
+        max_overestimate of each account, largest volume first.
+        """
+        return [{"account_number": account_number, "volume": volume, "max_overestimate": error}
+                for account_number, volume, error in self.__counter.top(self.__k)]
+
+    def merge(self, other: "TopAccounts") -> "TopAccounts":
+        """
+        Folds the counts of another observer (e.g. of another shard) into this one.
+        """
+        self.__counter.merge(other.__counter)
+        return self
+
+
+class DailyActiveAccounts:
+    """
+    Observer estimating the number of distinct accounts with transactions on each day, with one
+    HyperLogLog sketch per day (or exactly, for checking).
+    Attach it to a DataProcessor through its observers option.
+
+    Attributes:
+    __precision (int): The precision of each day's HyperLogLog sketch.
+    __exact (bool): Whether every account is kept instead of using sketches.
+    __counters (dict): Maps each date to its distinct counter.
+    """
+
+    def __init__(self, precision: int = 12, exact: bool = False):
+        """
+        Initializes the observer.
+        Parameters:
+        precision (int): The precision of each day's sketch; every day uses 2**precision bytes.
+        exact (bool): Keep every account instead of using sketches.
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18.")
+        self.__precision = precision
+        self.__exact = exact
+        self.__counters = {}
+
+    @property
+    def relative_error(self):
+        """
+        float: Returns the relative standard error of each day's count.
+        """
+        return 0.0 if self.__exact else 1.04 / math.sqrt(1 << self.__precision)
+
+    def observe(self, row: dict | Transaction) -> None:
+        """
+        Adds a transaction's account to the accounts active on its date.
+        Parameters:
+        row (dict or Transaction): A single transaction.
+        """
+        record = as_transaction(row)
+        counter = self.__counters.get(record.date)
+        if counter is None:
+            counter = self.__counters[record.date] = self.__new_counter()
+        counter.add(record.account_number)
+
+    def counts(self) -> dict:
+        """
+        Returns the number of distinct active accounts of each day.
+        Returns:
+        dict: Maps each date, in date order, to its (estimated) number of distinct accounts.
+        """
+        return {day: self.__counters[day].count() for day in sorted(self.__counters)}
+
+    def merge(self, other: "DailyActiveAccounts") -> "DailyActiveAccounts":
+        """
+        Folds the counters of another observer (e.g. of another shard) into this one.
+        """
+        for day, other_counter in other.__counters.items():
+            counter = self.__counters.get(day)
+            if counter is None:
+                counter = self.__counters[day] = self.__new_counter()
+            counter.merge(other_counter)
+        return self
+
+    def __new_counter(self):
+        """
+        Creates the distinct counter of one day.
+        """
+        return ExactDistinctCounter() if self.__exact else HyperLogLog(self.__precision)
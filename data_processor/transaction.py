@@ -0,0 +1,122 @@
+class Transaction:
+    """
+    A compact, typed record for a single transaction, parsed once at ingest.
+    The amount is converted to a float once, so the processing code never re-parses the raw row.
+    The account number is always a string, so a JSON input (where it is a number) and a CSV input
+    of the same accounts give the same summary keys.
+    Records can still be read with the original column names (e.g. record['Amount']),
+    which keeps them usable wherever a transaction dictionary is expected.
+
+    Attributes:
+    transaction_id: The transaction ID.
+    account_number (str): The account number.
+    date: The transaction date.
+    transaction_type (str): The transaction type.
+    amount (float): The transaction amount.
+    currency (str): The currency code.
+    description (str): The transaction description.
+
+    Constants:
+    COLUMNS (dict): Maps the input column names to the attribute that holds each value.
+    """
+
+    __slots__ = ('transaction_id', 'account_number', 'date', 'transaction_type',
+                 'amount', 'currency', 'description')
+
+    COLUMNS = {
+        'Transaction ID': 'transaction_id',
+        'Account number': 'account_number',
+        'Date': 'date',
+        'Transaction type': 'transaction_type',
+        'Amount': 'amount',
+        'Currency': 'currency',
+        'Description': 'description'
+    }
+
+    def __init__(self, transaction_id, account_number, date, transaction_type: str,
+                 amount: float, currency: str, description: str):
+        """
+        Initializes the Transaction with already parsed values.
+        Parameters:
+        transaction_id: The transaction ID.
+        account_number: The account number.
+        date: The transaction date.
+        transaction_type (str): The transaction type.
+        amount (float): The transaction amount.
+        currency (str): The currency code.
+        description (str): The transaction description.
+        """
+        self.transaction_id = transaction_id
+        self.account_number = account_number
+        self.date = date
+        self.transaction_type = transaction_type
+        self.amount = amount
+        self.currency = currency
+        self.description = description
+
+    @classmethod
+    def from_row(cls, row: dict) -> "Transaction":
+        """
+        Parses a transaction dictionary (as read by InputHandler) into a Transaction.
+        Parameters:
+        row (dict): A dictionary representing a single transaction.
+        Returns:
+        Transaction: The parsed transaction record.
+        """
+        return cls(
+            row.get('Transaction ID'),
+            str(row['Account number']),
+            row.get('Date'),
+            row['Transaction type'],
+            float(row['Amount']),
+            row['Currency'],
+            row.get('Description')
+        )
+
+    def to_row(self) -> dict:
+        """
+        Converts the record back into a transaction dictionary keyed by the input column names.
+        Returns:
+        dict: A dictionary representing the transaction.
+        """
+        return {column: getattr(self, attribute) for column, attribute in self.COLUMNS.items()}
+
+    def __getitem__(self, column: str):
+        """
+        Returns the value of a column using its input column name.
+        Parameters:
+        column (str): The input column name, e.g. 'Amount'.
+        Returns:
+        The value of the column.
+        """
+        try:
+            return getattr(self, self.COLUMNS[column])
+        except KeyError:
+            raise KeyError(column) from None
+
+    def __eq__(self, other) -> bool:
+        """
+        Compares two records field by field.
+        """
+        if not isinstance(other, Transaction):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """
+        Returns a readable representation of the record.
+        """
+        return f"Transaction({self.to_row()!r})"
+
+
+def as_transaction(row) -> Transaction:
+    """
+    Returns the row as a Transaction, parsing it only if it is not one already.
+    Parameters:
+    row (dict or Transaction): A single transaction.
+    Returns:
+    Transaction: The parsed transaction record.
+    """
+    return row if isinstance(row, Transaction) else Transaction.from_row(row)
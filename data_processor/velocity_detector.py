@@ -0,0 +1,148 @@
+import logging
+from collections import deque
+from datetime import date
+
+from data_processor.transaction import Transaction, as_transaction
+
+logger = logging.getLogger(__name__)
+
+
+class VelocityDetector:
+    """
+    Flags accounts whose transactions within a sliding window of days exceed velocity limits,
+    e.g. structuring: many deposits just under the large transaction threshold in one day.
+    Each account keeps a deque of the (day, amount) pairs inside its window together with their
+    running count and total, so every transaction is an O(1) amortized update and only the
+    transactions of the current window are held in memory. Accounts whose window has emptied
+    out are pruned periodically. Rows are expected in (roughly) chronological order per account.
+
+    Attributes:
+    __window_days (int): The length of the sliding window in days.
+    __max_count (int): The maximum number of transactions allowed in a window.
+    __max_total (float): The maximum total amount allowed in a window.
+    __transaction_types (frozenset): The transaction types counted by the detector.
+    __windows (dict): Maps an account number to its [deque of (day, amount), total amount, last day].
+    __flagged_accounts (dict): Maps a flagged account number to details of its first violation.
+    """
+
+    def __init__(self, window_days: int = 1, max_count: int = None, max_total: float = None,
+                 transaction_types: tuple = ("deposit",), prune_interval: int = 100000):
+        """
+        Initializes the VelocityDetector.
+        Parameters:
+        window_days (int): The length of the sliding window in days (1 means a single calendar day).
+        max_count (int): The maximum number of transactions allowed in a window, or None for no limit.
+        max_total (float): The maximum total amount allowed in a window, or None for no limit.
+        transaction_types (tuple): The transaction types counted by the detector.
+        prune_interval (int): The number of observed transactions between two prunes of idle accounts.
+        Raises:
+        ValueError: If window_days is not positive or no limit is given.
+        """
+        if window_days < 1:
+            raise ValueError("window_days must be a positive integer.")
+        if max_count is None and max_total is None:
+            raise ValueError("At least one of max_count and max_total must be given.")
+        self.__window_days = window_days
+        self.__max_count = max_count
+        self.__max_total = max_total
+        self.__transaction_types = frozenset(transaction_types)
+        self.__prune_interval = prune_interval
+        self.__windows = {}
+        self.__flagged_accounts = {}
+        self.__day_cache = {}
+        self.__latest_day = None
+        self.__observed = 0
+
+    @property
+    def flagged_accounts(self):
+        """
+        dict: Returns the flagged accounts, mapping each account number to the window end date,
+        transaction count and total amount of its first violation and its number of violations.
+        """
+        return self.__flagged_accounts
+
+    @property
+    def tracked_account_count(self):
+        """
+        int: Returns the number of accounts with transactions in their current window.
+        """
+        return len(self.__windows)
+
+    def observe(self, row: dict | Transaction) -> bool:
+        """
+        Adds a transaction to its account's window and checks the velocity limits.
+        Parameters:
+        row (dict or Transaction): A single transaction.
+        Returns:
+        bool: True if the account's window exceeds a limit after this transaction.
+        """
+        record = as_transaction(row)
+        if record.transaction_type not in self.__transaction_types:
+            return False
+        day = self.__to_day(record.date)
+        if self.__latest_day is None or day > self.__latest_day:
+            self.__latest_day = day
+
+        window = self.__windows.get(record.account_number)
+        if window is None:
+            window = self.__windows[record.account_number] = [deque(), 0.0, day]
+        entries = window[0]
+        # Drop the transactions that have left the window
+        window_start = day - self.__window_days + 1
+        while entries and entries[0][0] < window_start:
+            window[1] -= entries.popleft()[1]
+        if not entries:
+            window[1] = 0.0  # reset to avoid accumulating rounding errors
+        entries.append((day, record.amount))
+        window[1] += record.amount
+        window[2] = max(window[2], day)
+
+        self.__observed += 1
+        if self.__observed % self.__prune_interval == 0:
+            self.prune()
+
+        exceeded = ((self.__max_count is not None and len(entries) > self.__max_count)
+                    or (self.__max_total is not None and window[1] > self.__max_total))
+        if exceeded:
+            self.__flag(record.account_number, record.date, len(entries), window[1])
+        return exceeded
+
+    def prune(self) -> None:
+        """
+        Forgets the accounts whose most recent transaction has left the window relative to the
+        latest date observed, so memory only grows with the number of recently active accounts.
+        """
+        if self.__latest_day is None:
+            return
+        window_start = self.__latest_day - self.__window_days + 1
+        idle_accounts = [account_number for account_number, window in self.__windows.items()
+                         if window[2] < window_start]
+        for account_number in idle_accounts:
+            del self.__windows[account_number]
+
+    def __to_day(self, value) -> int:
+        """
+        Converts an ISO date (e.g. '2023-03-01') to a day number, caching each distinct date string.
+        """
+        day = self.__day_cache.get(value)
+        if day is None:
+            day = self.__day_cache[value] = date.fromisoformat(str(value)[:10]).toordinal()
+        return day
+
+    def __flag(self, account_number, window_end, transaction_count: int, total_amount: float) -> None:
+        """
+        Records a velocity violation for an account.
+        """
+        flagged = self.__flagged_accounts.get(account_number)
+        if flagged is None:
+            self.__flagged_accounts[account_number] = {
+                "account_number": account_number,
+                "window_end": window_end,
+                "transaction_count": transaction_count,
+                "total_amount": total_amount,
+                "violations": 1
+            }
+            logger.warning("Velocity limit exceeded by account %s: %d transactions totalling %s by %s",
+                           account_number, transaction_count, total_amount, window_end)
+        else:
+            flagged["violations"] += 1
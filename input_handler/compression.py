@@ -0,0 +1,72 @@
+import bz2
+import gzip
+import lzma
+
+# Maps each supported compression extension to the module that reads and writes it
+COMPRESSIONS = {'gz': gzip, 'xz': lzma, 'bz2': bz2}
+# The compression levels each format accepts: bz2 has no level 0 (no compression)
+COMPRESSION_LEVELS = {'gz': range(0, 10), 'xz': range(0, 10), 'bz2': range(1, 10)}
+
+
+def get_compression(file_path: str):
+    """
+    Determines the compression of a file from its last extension, e.g. 'gz' for 'input.csv.gz'.
+
+    Args:
+        file_path (str): The path to the file.
+
+    Returns:
+        str: 'gz', 'xz' or 'bz2', or None if the file is not compressed.
+    """
+    extension = file_path.rsplit('.', 1)[-1].lower() if '.' in file_path else ''
+    return extension if extension in COMPRESSIONS else None
+
+
+def check_compression_level(compression: str, compression_level: int) -> None:
+    """
+    Checks that a compression level is accepted by a compression format.
+
+    Args:
+        compression (str): 'gz', 'xz' or 'bz2'.
+        compression_level (int): The compression level, or None for the default of the format.
+
+    Raises:
+        ValueError: If the compression is not supported or the level is out of its range.
+    """
+    levels = COMPRESSION_LEVELS.get(compression)
+    if levels is None:
+        raise ValueError(f"Unsupported compression: {compression}. Use one of: {', '.join(COMPRESSIONS)}.")
+    if compression_level is not None and compression_level not in levels:
+        raise ValueError(f"Compression level {compression_level} is not supported by {compression}; "
+                         f"use a level from {levels[0]} to {levels[-1]}.")
+
+
+def open_compressed(file, mode: str, compression: str, compression_level: int = None, newline: str = None):
+    """
+    Opens a compressed file so that it is compressed or decompressed while it is streamed.
+
+    Args:
+        file (str or file object): The path to the file, or a binary file object to read from or write to.
+            A file object is left open when the returned stream is closed.
+        mode (str): 'rt', 'wt', 'at', 'rb', 'wb' or 'ab'. Appending adds a new compressed stream to the file.
+        compression (str): 'gz', 'xz' or 'bz2'.
+        compression_level (int): The compression level when writing, from 0 (gz and xz) or 1 (bz2),
+            the fastest, to 9, the smallest. Defaults to the library's default for each format.
+            It is checked before the file is opened.
+        newline (str): Passed to the text wrapper in text modes, e.g. '' for CSV files.
+
+    Returns:
+        file object: A stream reading or writing uncompressed data.
+
+    Raises:
+        ValueError: If the compression is not supported, or the compression level is out of its range.
+    """
+    writing = 'w' in mode or 'a' in mode
+    check_compression_level(compression, compression_level if writing else None)
+    module = COMPRESSIONS[compression]
+    options = {}
+    if 't' in mode:
+        options.update(encoding='utf-8', newline=newline)
+    if compression_level is not None and writing:
+        options['preset' if module is lzma else 'compresslevel'] = compression_level
+    return module.open(file, mode, **options)
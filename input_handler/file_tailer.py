@@ -0,0 +1,163 @@
+import csv
+import os
+
+
+class FileTailer:
+    """
+    Follows a CSV file that another process keeps appending to, like `tail -F`.
+
+    Every call to `read_rows` returns the rows completed since the previous call. Bytes after the
+    last line break are kept back until the rest of their line has been written, so a row that is
+    being appended is never parsed half-written. Rotation is handled as well: when the path is
+    renamed away and a new file is created in its place, the rest of the old file is read before
+    switching to the new one, and when the file is truncated in place (copytruncate) it is read
+    again from the start. Every file must begin with its header line. Quoted fields containing
+    line breaks are not supported.
+
+    Attributes:
+        file_path (str): The full path to the followed CSV file.
+        header (list): The column names of the current file, or None until its header has been read.
+        offset (int): The byte offset just past the last complete line read from the current file.
+        rotations (int): The number of times the file was rotated or truncated.
+    """
+
+    def __init__(self, file_path: str, read_size: int = 1024 * 1024):
+        """
+        Initializes the tailer. The file is opened on the first call to `read_rows`, so it does not
+        need to exist yet.
+
+        Args:
+            file_path (str): The full path to the CSV file to follow.
+            read_size (int): The maximum number of bytes read by one call to `read_rows`, which
+                bounds the memory used while catching up with a large file.
+        """
+        self.__file_path = file_path
+        self.__read_size = read_size
+        self.__file = None
+        self.__identity = None
+        self.__header = None
+        self.__pending = b''
+        self.__offset = 0
+        self.__rotations = 0
+
+    @property
+    def file_path(self):
+        """
+        Gets the path to the followed file.
+
+        Returns:
+            str: The file path.
+        """
+        return self.__file_path
+
+    @property
+    def header(self):
+        """
+        Gets the column names of the current file.
+
+        Returns:
+            list: The column names, or None if the header has not been read yet.
+        """
+        return self.__header
+
+    @property
+    def offset(self):
+        """
+        Gets the byte offset just past the last complete line read from the current file.
+
+        Returns:
+            int: The byte offset.
+        """
+        return self.__offset
+
+    @property
+    def rotations(self):
+        """
+        Gets the number of times the file was rotated or truncated while it was followed.
+
+        Returns:
+            int: The number of rotations.
+        """
+        return self.__rotations
+
+    def read_rows(self) -> list:
+        """
+        Reads the rows completed since the previous call, without waiting for new ones.
+
+        Returns:
+            list: The new rows as dictionaries keyed by the column headers. The list is empty if
+                nothing new has been written or the file does not exist (yet).
+        """
+        if self.__file is None and not self.__open():
+            return []
+        rows = self.__read_lines()
+        if not rows and self.__rotated():
+            # Finish the old file first: once it has been rotated away nothing more will be added
+            # to it, so a last line without a line break is complete as well.
+            rows = self.__read_lines(final=True)
+            self.close()
+            self.__rotations += 1
+            if self.__open():
+                rows.extend(self.__read_lines())
+        return rows
+
+    def close(self) -> None:
+        """
+        Closes the current file. The next call to `read_rows` opens the path again from the start.
+        """
+        if self.__file is not None:
+            self.__file.close()
+        self.__file = None
+        self.__header = None
+        self.__pending = b''
+        self.__offset = 0
+
+    def __enter__(self) -> "FileTailer":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __open(self) -> bool:
+        """
+        Opens the file at the followed path, returning False if it does not exist.
+        """
+        try:
+            self.__file = open(self.__file_path, 'rb')
+        except FileNotFoundError:
+            return False
+        status = os.fstat(self.__file.fileno())
+        self.__identity = (status.st_dev, status.st_ino)
+        return True
+
+    def __rotated(self) -> bool:
+        """
+        Checks whether the path now refers to another file, or the file is shorter than what was read.
+        """
+        try:
+            status = os.stat(self.__file_path)
+        except FileNotFoundError:
+            # Renamed away and not recreated yet: keep the old file until the new one appears
+            return False
+        if (status.st_dev, status.st_ino) != self.__identity:
+            return True
+        if status.st_size < self.__offset + len(self.__pending):
+            # Truncated in place: whatever was pending belongs to the old contents
+            self.__pending = b''
+            return True
+        return False
+
+    def __read_lines(self, final: bool = False) -> list:
+        """
+        Reads up to read_size bytes and parses the complete lines among them, keeping the rest pending.
+        """
+        data = self.__pending + self.__file.read(self.__read_size)
+        end = len(data) if final else data.rfind(b'\n') + 1
+        self.__pending = data[end:]
+        if not end:
+            return []
+        self.__offset += end
+        lines = data[:end].decode('utf-8').splitlines()
+        if self.__header is None:
+            self.__header = next(csv.reader([lines.pop(0).lstrip('\ufeff')]), None)
+        return list(csv.DictReader(lines, fieldnames=self.__header))
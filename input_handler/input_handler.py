@@ -1,12 +1,21 @@
 import csv
 import json
+import os
+from typing import Iterator
+
+from input_handler.compression import get_compression, open_compressed
+
+# Extensions of JSON Lines files: one JSON document (transaction) per line
+NDJSON_FORMATS = ('ndjson', 'jsonl')
 
 class InputHandler:
     """
     Handles input operations for reading data from specified file paths.
     
-    This class supports reading from both CSV and JSON file formats. It provides methods to read data
-    into a structured list and determine the file format based on the file extension.
+    This class supports reading from CSV, JSON and NDJSON (JSON Lines) file formats. It provides methods to read data
+    into a structured list, to stream it one record at a time, and to determine the file format based
+    on the file extension. Files compressed with gzip, xz or bz2 (e.g. 'input.csv.gz') are
+    decompressed while they are streamed, without writing the uncompressed data to disk.
 
     Attributes:
         file_path (str): The full path to the file from which data is to be read.
@@ -20,6 +29,7 @@ class InputHandler:
             file_path (str): The full path to the file that data will be read from.
         """
         self.__file_path = file_path
+        self.__offset = None
 
     @property
     def file_path(self):
@@ -31,27 +41,50 @@ class InputHandler:
         """
         return self.__file_path
 
+    @property
+    def offset(self):
+        """
+        Gets the byte offset just past the rows consumed so far from `iter_csv_range`.
+
+        Returns:
+            int: The byte offset, or None if no CSV range has been read yet.
+        """
+        return self.__offset
+
     def get_file_format(self) -> str:
         """
         Determines the file format by extracting the extension from the file path.
+        A compression extension is skipped, so 'input.csv.gz' is a 'csv' file.
         
         Returns:
             str: The file extension (e.g., 'csv', 'json') of the file. If no extension is present,
                  an empty string is returned.
         """
-        return self.__file_path.split('.')[-1] if '.' in self.__file_path else ''
+        file_path = self.__file_path
+        if self.get_compression() is not None:
+            file_path = file_path.rsplit('.', 1)[0]
+        return file_path.split('.')[-1] if '.' in file_path else ''
+
+    def get_compression(self) -> str:
+        """
+        Determines the compression of the file from its last extension.
+
+        Returns:
+            str: 'gz', 'xz' or 'bz2', or None if the file is not compressed.
+        """
+        return get_compression(self.__file_path)
 
     def read_input_data(self) -> list:
         """
-        Reads data from the file based on its format (either CSV or JSON).
+        Reads data from the file based on its format (CSV, JSON or NDJSON).
         
-        This method dispatches to either `read_csv_data` or `read_json_data` depending on the file format.
+        This method dispatches to `read_csv_data`, `read_json_data` or `read_ndjson_data` depending on the file format.
         
         Returns:
             list: A list of dictionaries where each dictionary represents a row of data.
         
         Raises:
-            ValueError: If the file format is neither 'csv' nor 'json'.
+            ValueError: If the file format is not 'csv', 'json', 'ndjson' or 'jsonl'.
         """
         data = []
         file_format = self.get_file_format()
@@ -59,8 +92,10 @@ class InputHandler:
             data = self.read_csv_data()
         elif file_format == 'json':
             data = self.read_json_data()
+        elif file_format in NDJSON_FORMATS:
+            data = self.read_ndjson_data()
         else:
-            raise ValueError("Unsupported file format. Please provide a .csv or .json file.")
+            raise ValueError("Unsupported file format. Please provide a .csv, .json or .ndjson file.")
         return data
 
     def read_csv_data(self) -> list:
@@ -75,16 +110,7 @@ class InputHandler:
         Raises:
             FileNotFoundError: If the CSV file specified does not exist.
         """
-        input_data = []
-        try:
-            with open(self.__file_path, 'r') as input_file:
-                reader = csv.DictReader(input_file)
-                for row in reader:
-                    input_data.append(row)
-            return input_data
-        
-        except FileNotFoundError:
-            raise FileNotFoundError(f"File: {self.__file_path} does not exist.")
+        return list(self.iter_csv_records())
 
     def read_json_data(self) -> list:
         """
@@ -97,9 +123,273 @@ class InputHandler:
         Raises:
             FileNotFoundError: If the JSON file specified does not exist.
         """
+        with self.__open_text() as input_file:
+            input_data = json.load(input_file)
+        return input_data
+
+    def read_ndjson_data(self) -> list:
+        """
+        Reads data from an NDJSON (JSON Lines) file, where every line holds one JSON document.
+
+        Returns:
+            list: The documents of the file, in order.
+
+        Raises:
+            FileNotFoundError: If the NDJSON file specified does not exist.
+            ValueError: If a line is not valid JSON.
+        """
+        return list(self.iter_ndjson_records())
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Lazily yields records from the file based on its format (CSV, JSON or NDJSON).
+
+        Unlike `read_input_data`, the file is never held in memory as a whole, so the memory
+        used stays flat regardless of the size of the input file.
+
+        Returns:
+            Iterator[dict]: An iterator over dictionaries where each dictionary represents a row of data.
+
+        Raises:
+            ValueError: If the file format is not 'csv', 'json', 'ndjson' or 'jsonl'.
+        """
+        file_format = self.get_file_format()
+        if file_format == 'csv':
+            return self.iter_csv_records()
+        elif file_format == 'json':
+            return self.iter_json_records()
+        elif file_format in NDJSON_FORMATS:
+            return self.iter_ndjson_records()
+        else:
+            raise ValueError("Unsupported file format. Please provide a .csv, .json or .ndjson file.")
+
+    def iter_csv_records(self) -> Iterator[dict]:
+        """
+        Lazily yields the rows of a CSV file as dictionaries keyed by the column headers.
+
+        Returns:
+            Iterator[dict]: An iterator over the rows of the CSV file.
+
+        Raises:
+            FileNotFoundError: If the CSV file specified does not exist.
+        """
+        with self.__open_text(newline='') as input_file:
+            yield from csv.DictReader(input_file)
+
+    def iter_json_records(self, chunk_size: int = 65536) -> Iterator[dict]:
+        """
+        Lazily yields the elements of a JSON file whose top-level value is an array.
+
+        The file is read in chunks of `chunk_size` characters and each array element is decoded
+        as soon as it is complete, so only one element (plus one chunk) is held in memory at a time.
+
+        Args:
+            chunk_size (int): The number of characters read from the file at a time.
+
+        Returns:
+            Iterator[dict]: An iterator over the elements of the top-level JSON array.
+
+        Raises:
+            FileNotFoundError: If the JSON file specified does not exist.
+            ValueError: If the top-level JSON value is not an array or the document is malformed.
+        """
+        input_file = self.__open_text()
+
+        decoder = json.JSONDecoder()
+        with input_file:
+            buffer = ''
+            position = 0
+            at_eof = False
+            expecting = '['
+
+            while True:
+                # Skip whitespace, reading more of the file whenever the buffer runs dry
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position == len(buffer):
+                    if at_eof:
+                        raise ValueError(f"File: {self.__file_path} ended before the JSON array was closed.")
+                    chunk = input_file.read(chunk_size)
+                    at_eof = not chunk
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+
+                char = buffer[position]
+                if expecting == '[':
+                    if char != '[':
+                        raise ValueError(f"File: {self.__file_path} does not contain a top-level JSON array.")
+                    position += 1
+                    expecting = 'value or ]'
+                elif char == ']':
+                    if expecting == 'value':
+                        raise ValueError(f"File: {self.__file_path} has a trailing comma in the JSON array.")
+                    return
+                elif expecting == ',':
+                    if char != ',':
+                        raise ValueError(f"File: {self.__file_path} has a malformed JSON array near '{char}'.")
+                    position += 1
+                    expecting = 'value'
+                else:
+                    try:
+                        value, end = decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError:
+                        if at_eof:
+                            raise ValueError(f"File: {self.__file_path} contains malformed JSON.")
+                        value, end = None, None
+                    # A value ending exactly at the end of the buffer may have been cut short
+                    if end is None or (end == len(buffer) and not at_eof):
+                        chunk = input_file.read(chunk_size)
+                        at_eof = not chunk
+                        buffer = buffer[position:] + chunk
+                        position = 0
+                        continue
+                    yield value
+                    position = end
+                    expecting = ','
+
+    def iter_ndjson_records(self) -> Iterator[dict]:
+        """
+        Lazily yields the documents of an NDJSON (JSON Lines) file, reading it one line at a time.
+
+        Unlike a JSON array, the file never has to be scanned for the end of a document: each line is
+        decoded on its own, so only one line is held in memory at a time. Blank lines are skipped.
+
+        Returns:
+            Iterator[dict]: An iterator over the documents of the file.
+
+        Raises:
+            FileNotFoundError: If the NDJSON file specified does not exist.
+            ValueError: If a line is not valid JSON.
+        """
+        decode = json.JSONDecoder().decode
+        with self.__open_text() as input_file:
+            for line_number, line in enumerate(input_file, 1):
+                if line.isspace() or not line:
+                    continue
+                try:
+                    yield decode(line)
+                except json.JSONDecodeError:
+                    raise ValueError(f"File: {self.__file_path} contains malformed JSON on line {line_number}.")
+
+    def get_csv_shards(self, shard_count: int) -> list:
+        """
+        Splits the data rows of a CSV file into byte ranges that start and end on line boundaries.
+
+        Each range can be read independently with `iter_csv_range`, which makes it possible to
+        process one file with several processes. Quoted fields containing line breaks are not
+        supported, as a shard boundary could fall inside them.
+
+        Args:
+            shard_count (int): The number of shards wanted. Fewer shards are returned for small files.
+
+        Returns:
+            list: A list of (start, end) byte offset tuples covering every data row exactly once.
+
+        Raises:
+            FileNotFoundError: If the CSV file specified does not exist.
+            ValueError: If shard_count is not a positive integer, or the file is compressed.
+        """
+        if shard_count < 1:
+            raise ValueError("shard_count must be a positive integer.")
+        self.__require_uncompressed("split into byte ranges")
+        try:
+            input_file = open(self.__file_path, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File: {self.__file_path} does not exist.")
+        with input_file:
+            input_file.readline()
+            data_start = input_file.tell()
+            file_size = os.fstat(input_file.fileno()).st_size
+            boundaries = [data_start]
+            for shard in range(1, shard_count):
+                target = data_start + (file_size - data_start) * shard // shard_count
+                if target <= boundaries[-1]:
+                    continue
+                # Move to the start of the first line beginning at or after the target offset
+                input_file.seek(target - 1)
+                input_file.readline()
+                boundary = input_file.tell()
+                if boundaries[-1] < boundary < file_size:
+                    boundaries.append(boundary)
+            boundaries.append(file_size)
+        return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+    def iter_csv_range(self, start: int = None, end: int = None,
+                       complete_lines_only: bool = False) -> Iterator[dict]:
+        """
+        Lazily yields the rows of a CSV file whose lines start within the byte range [start, end).
+
+        The header line is always read first to get the column names, so `start` must be the offset
+        of a line start after the header, such as the offsets returned by `get_csv_shards` or a
+        previously recorded `offset`. While the rows are read, `offset` is kept just past the rows
+        already consumed; a row counts as consumed once the next one is requested, so a fully read
+        range leaves it at the end of the last row, which is where a later run can resume.
+
+        Args:
+            start (int): The byte offset of the first line to read. Defaults to the first data row.
+            end (int): The byte offset at which reading stops. Defaults to the end of the file.
+            complete_lines_only (bool): Stops before a last line that has no line break yet, which
+                happens when the file is being appended to while it is read.
+
+        Returns:
+            Iterator[dict]: An iterator over the rows of the range.
+
+        Raises:
+            FileNotFoundError: If the CSV file specified does not exist.
+            ValueError: If the file is compressed, as byte offsets cannot be sought in it.
+        """
+        self.__require_uncompressed("read from a byte offset")
         try:
-            with open(self.__file_path, 'r') as input_file:
-                input_data = json.load(input_file)
-            return input_data
+            input_file = open(self.__file_path, 'rb')
         except FileNotFoundError:
-            raise FileNotFoundError(f"File: {self.__file_path} does not exist.")
\ No newline at end of file
+            raise FileNotFoundError(f"File: {self.__file_path} does not exist.")
+
+        def lines():
+            position = input_file.tell() if start is None else start
+            input_file.seek(position)
+            self.__offset = position
+            while end is None or position < end:
+                line = input_file.readline()
+                if not line or (complete_lines_only and not line.endswith(b'\n')):
+                    return
+                position += len(line)
+                yield line.decode('utf-8')
+                # The row built from this line has been consumed once the next line is requested
+                self.__offset = position
+
+        with input_file:
+            header = next(csv.reader([input_file.readline().decode('utf-8-sig')]), None)
+            if header is None:
+                return
+            for row in csv.DictReader(lines(), fieldnames=header):
+                yield row
+
+    def __open_text(self, newline: str = None):
+        """
+        Opens the file for reading text, decompressing it while it is read if it is compressed.
+
+        Args:
+            newline (str): Passed to the text stream, e.g. '' for CSV files.
+
+        Returns:
+            file object: The open text stream.
+
+        Raises:
+            FileNotFoundError: If the file specified does not exist.
+        """
+        compression = self.get_compression()
+        try:
+            if compression is None:
+                return open(self.__file_path, 'r', newline=newline) if newline is not None else open(self.__file_path, 'r')
+            return open_compressed(self.__file_path, 'rt', compression, newline=newline)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File: {self.__file_path} does not exist.")
+
+    def __require_uncompressed(self, operation: str) -> None:
+        """
+        Raises a ValueError if the file is compressed, naming the operation that needs random access.
+        """
+        if self.get_compression() is not None:
+            raise ValueError(f"File: {self.__file_path} is compressed and cannot be {operation}; "
+                             f"read it with iter_records instead.")
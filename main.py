@@ -1,48 +1,409 @@
 import os
 import logging
+import argparse
+import threading
+from contextlib import nullcontext
+from functools import partial
 
 from input_handler.input_handler import InputHandler
+from input_handler.compression import COMPRESSION_LEVELS, get_compression
 from data_processor.data_processor import DataProcessor
-from output_handler.output_handler import OutputHandler
+from data_processor.columnar_processor import ColumnarDataProcessor
+from data_processor.parallel_processor import process_file_in_parallel
+from data_processor.checkpoint import process_incrementally
+from data_processor.batch_processor import process_directory
+from data_processor.live_processor import LiveProcessor
+from data_processor.rule_engine import SuspiciousRuleEngine
+from data_processor.velocity_detector import VelocityDetector
+from data_processor.fx_rates import FXRateTable
+from data_processor.deduplicator import TransactionDeduplicator
+from data_processor.sketches import DailyActiveAccounts, TopAccounts
+from output_handler.output_handler import (OUTPUT_FORMATS, OutputHandler, SuspiciousTransactionWriter,
+                                           write_csv_atomically, write_json_atomically)
+from output_handler.account_store import AccountStore
+from benchmark.stage_profiler import StageProfiler
+from query_service.query_service import QueryService
 
-def main() -> None:
+def parse_arguments(argv: list = None) -> argparse.Namespace:
+    """Parses the command line options.
+
+    Args:
+        argv (list): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description='Process financial transaction data.')
+    parser.add_argument('--input', metavar='PATH',
+                        help='input .csv, .json or .ndjson/.jsonl (one JSON object per line) file '
+                             '(default: input/input_data.csv next to this script)')
+    parser.add_argument('--input-dir', metavar='DIR',
+                        help='process every .csv, .json and .ndjson/.jsonl file in DIR concurrently and merge the results')
+    parser.add_argument('--engine', choices=['row', 'columnar'], default='row',
+                        help='process the rows one at a time, or in NumPy column batches (requires NumPy; '
+                             'same results, faster on large inputs) (default: row)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of processes used to process the input (default: 1; with --input-dir, one per CPU)')
+    parser.add_argument('--checkpoint', metavar='PATH',
+                        help='resume from this checkpoint file and only process rows appended since the last run; '
+                             'the checkpoint keeps one position per input file, so several files can be processed '
+                             'into the same results')
+    parser.add_argument('--rules', metavar='PATH',
+                        help='JSON file with the suspicious transaction rules (default: built-in rules)')
+    parser.add_argument('--velocity-window-days', type=int, default=1, metavar='DAYS',
+                        help='length of the per-account sliding window used for velocity checks (default: 1)')
+    parser.add_argument('--velocity-max-count', type=int, metavar='N',
+                        help='flag accounts with more than N deposits within the velocity window')
+    parser.add_argument('--velocity-max-total', type=float, metavar='AMOUNT',
+                        help='flag accounts whose deposits within the velocity window total more than AMOUNT; '
+                             'flagged accounts are written to the velocity flags output')
+    parser.add_argument('--top-accounts', type=int, metavar='K',
+                        help='report the K accounts with the largest withdrawal volume (approximate, bounded memory)')
+    parser.add_argument('--daily-active-accounts', action='store_true',
+                        help='report the number of distinct active accounts per day (approximate, bounded memory)')
+    parser.add_argument('--rollups', action='store_true',
+                        help='also write totals per (day, account, transaction type) and per (month, transaction type)')
+    parser.add_argument('--amount-statistics', action='store_true',
+                        help='also write the min, max, mean, standard deviation and percentiles of the amounts '
+                             'per transaction type and per currency')
+    parser.add_argument('--fx-rates', metavar='PATH',
+                        help='CSV file of exchange rates (Date, Currency, Rate) used to add a balance normalized '
+                             'to the base currency to the account summaries')
+    parser.add_argument('--base-currency', default='CAD',
+                        help='currency the --fx-rates rates convert to (default: CAD)')
+    parser.add_argument('--dedup', metavar='PATH',
+                        help='skip transactions whose Transaction ID was already seen, in this run or a previous one; '
+                             'the seen IDs are kept in the SQLite database PATH and a Bloom filter at PATH.bloom. '
+                             'Requires --checkpoint, which carries the results of the previous runs over, so that '
+                             'the outputs are not limited to the transactions new to this run')
+    parser.add_argument('--dedup-capacity', type=int, default=10000000, metavar='N',
+                        help='expected number of distinct Transaction IDs, which sizes the --dedup Bloom filter '
+                             '(default: 10000000, about 18 MB)')
+    parser.add_argument('--follow', action='store_true',
+                        help='keep following the input CSV file as it grows (and is rotated), publishing refreshed '
+                             'outputs periodically and suspicious transactions as soon as they are appended; stop with Ctrl+C')
+    parser.add_argument('--poll-interval', type=float, default=0.2, metavar='SECONDS',
+                        help='with --follow, how long to wait before checking the input again when nothing is new (default: 0.2)')
+    parser.add_argument('--snapshot-interval', type=float, default=5.0, metavar='SECONDS',
+                        help='with --follow, maximum time between two refreshes of the outputs (default: 5)')
+    parser.add_argument('--snapshot-rows', type=int, default=10000, metavar='N',
+                        help='with --follow, refresh the outputs early once N new rows have been processed (default: 10000)')
+    parser.add_argument('--serve', type=int, metavar='PORT',
+                        help='serve the results as JSON over HTTP on PORT; with --follow they are refreshed with every '
+                             'snapshot, otherwise the final results are served until Ctrl+C')
+    parser.add_argument('--serve-host', default='127.0.0.1', metavar='HOST',
+                        help='interface the --serve service listens on (default: 127.0.0.1)')
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS, default='csv',
+                        help='format of the output files: csv, json (one array per file) or ndjson (one object per '
+                             'line); the JSON records use the CSV column names as keys (default: csv)')
+    parser.add_argument('--compress', choices=['gz', 'xz', 'bz2'],
+                        help='compress the outputs while they are written (the files get a .gz, .xz or .bz2 extension); '
+                             'compressed inputs such as .csv.gz are always decompressed while they are read')
+    parser.add_argument('--compression-level', type=int, choices=range(10), metavar='LEVEL',
+                        help='with --compress, from 0 (gz and xz) or 1 (bz2), the fastest, to 9, the smallest files '
+                             '(default: the format default)')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='stream suspicious transactions to their output file as soon as they are flagged')
+    parser.add_argument('--binary', action='store_true',
+                        help='also write the account summaries and transaction statistics in the binary columnar format')
+    parser.add_argument('--store', metavar='PATH',
+                        help='also load the account summaries and transaction statistics into this SQLite database')
+    parser.add_argument('--profile', action='store_true',
+                        help='record the time, CPU time, rows/sec and peak memory of the read, process and write '
+                             'stages in a metrics JSON file next to the outputs; the input is still streamed, so '
+                             'the read time is measured inside the process stage and has no peak memory of its own')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='with --profile, also run cProfile around the processing stage')
+    arguments = parser.parse_args(argv)
+    if arguments.compression_level is not None and not arguments.compress:
+        parser.error('--compression-level requires --compress')
+    levels = COMPRESSION_LEVELS.get(arguments.compress)
+    if arguments.compression_level is not None and arguments.compression_level not in levels:
+        parser.error(f'--compress {arguments.compress} accepts a --compression-level from {levels[0]} to {levels[-1]}')
+    if arguments.cprofile and not arguments.profile:
+        parser.error('--cprofile requires --profile')
+    if arguments.profile and (arguments.input_dir or arguments.checkpoint or arguments.pipeline or arguments.workers > 1):
+        parser.error('--profile cannot be combined with --input-dir, --checkpoint, --pipeline or --workers')
+    if arguments.follow and (arguments.input_dir or arguments.checkpoint or arguments.pipeline or arguments.profile
+                             or arguments.workers > 1):
+        parser.error('--follow cannot be combined with --input-dir, --checkpoint, --pipeline, --profile or --workers')
+    if arguments.input and get_compression(arguments.input) and (arguments.follow or arguments.checkpoint
+                                                                  or arguments.workers > 1):
+        parser.error('--follow, --checkpoint and --workers need random access to the input and cannot read a '
+                     'compressed file')
+    if arguments.input and (arguments.follow or arguments.checkpoint or arguments.workers > 1) \
+            and InputHandler(arguments.input).get_file_format() != 'csv':
+        parser.error('--follow, --checkpoint and --workers can only read a .csv input')
+    if arguments.follow and arguments.engine == 'columnar':
+        parser.error('--follow processes the appended rows one poll at a time and cannot use --engine columnar')
+    if arguments.input_dir and (arguments.input or arguments.checkpoint or arguments.pipeline):
+        parser.error('--input-dir cannot be combined with --input, --checkpoint or --pipeline')
+    if arguments.pipeline and (arguments.checkpoint or arguments.workers > 1):
+        parser.error('--pipeline cannot be combined with --checkpoint or --workers')
+    if arguments.checkpoint and arguments.workers > 1:
+        parser.error('--checkpoint cannot be combined with --workers')
+    velocity_enabled = arguments.velocity_max_count is not None or arguments.velocity_max_total is not None
+    if velocity_enabled and (arguments.workers > 1 or arguments.input_dir or arguments.checkpoint):
+        parser.error('velocity checks need a single pass over the whole file and cannot be combined with '
+                     '--workers, --input-dir or --checkpoint')
+    if arguments.dedup and not arguments.checkpoint:
+        parser.error('--dedup requires --checkpoint: the transactions seen by previous runs are skipped, so only '
+                     'the checkpointed results of those runs keep the outputs complete')
+    if (arguments.top_accounts or arguments.daily_active_accounts) and (arguments.workers > 1 or arguments.input_dir
+                                                                        or arguments.checkpoint):
+        parser.error('--top-accounts and --daily-active-accounts need a single pass over the whole file '
+                     'and cannot be combined with --workers, --input-dir or --checkpoint')
+    return arguments
+
+def main(argv: list = None) -> None:
     """Main function to read input data, process it, and write the results to output files.
 
-    - Reads input data from a CSV file using InputHandler.
-    - Processes the data using DataProcessor.
-    - Writes the processed data to CSV and JSON files using OutputHandler.
+    - Streams input data from a CSV file using InputHandler.
+    - Processes the data using DataProcessor as it is read (or ColumnarDataProcessor with
+      --engine columnar), or with a pool of processes over shards of the file when --workers is greater than 1.
+    - With --checkpoint, only the rows appended since the previous run are processed; one checkpoint
+      can accumulate the results of several input files.
+    - With --input-dir, every file of a directory is processed concurrently and the results are merged.
+    - With --dedup, transactions whose Transaction ID was already seen (in this run or a previous one)
+      are skipped, using a persisted Bloom filter backed by an exact SQLite set of the seen IDs.
+      It requires --checkpoint, and the seen IDs are committed together with the checkpoint.
+    - With --follow, the input CSV file is followed as it grows: new rows are processed as they are
+      appended, suspicious transactions are appended to an alerts file within about a second and the
+      outputs are refreshed periodically until the program is stopped. The alerts of earlier runs are
+      kept; as a restart reads the file from the start again, their transactions are alerted again.
+    - With --serve, a read-only HTTP service answers JSON queries about the account summaries,
+      transaction statistics and suspicious transactions from snapshots of the results.
+    - With --pipeline, suspicious transactions are written while the input is processed
+      and only the aggregate tables are written at the end.
+    - With --velocity-max-count or --velocity-max-total, accounts with too many or too large deposits
+      within a sliding window are written to a velocity flags output.
+    - With --top-accounts and --daily-active-accounts, bounded-memory sketches report the accounts with
+      the largest withdrawal volume and the distinct active accounts per day.
+    - With --rollups, daily totals per account and transaction type and the monthly totals
+      derived from them are written as well.
+    - With --amount-statistics, the distribution of the amounts per transaction type and per
+      currency (min, max, mean, standard deviation and percentiles) is written as well.
+    - Balances are also written per currency; with --fx-rates, account summaries get a balance
+      normalized to the base currency.
+    - With --profile, the time spent reading, processing and writing is measured per stage (the
+      input is still streamed while it is processed) and the metrics of each stage are written to a
+      JSON file next to the outputs.
+    - Reads CSV, JSON and NDJSON (JSON Lines) inputs; compressed inputs (.csv.gz, .ndjson.xz, ...)
+      are decompressed while they are streamed.
+    - Writes the processed data to CSV, JSON or NDJSON files (--output-format) using OutputHandler,
+      serializing one record at a time, compressed with --compress.
     """
+    arguments = parse_arguments(argv)
 
     # Retrieves the directory name of the current script or module file.
     current_dir = os.path.dirname(os.path.abspath(__file__))
 
     # Joins the current directory, the relative path to the input folder and the filename 
     # to create a complete path to the file.
-    input_file_path = os.path.join(current_dir, 'input\\input_data.csv')
-
-    input_handler = InputHandler(input_file_path)
-    input_data = input_handler.read_input_data()
+    input_file_path = arguments.input or os.path.join(current_dir, 'input', 'input_data.csv')
 
      # Specify the log file path and the logging level.
-    log_file_path = os.path.join(current_dir, 'logs\\fdp_team_3.log')  
-    data_processor = DataProcessor(input_data)
-    
-    processed_data = data_processor.process_data()
+    log_file_path = os.path.join(current_dir, 'logs', 'fdp_team_3.log')
 
     output_file_prefix = 'output_data'
-    output_handler = OutputHandler(processed_data['account_summaries'], processed_data['suspicious_transactions'], processed_data['transaction_statistics'])
-
+    output_extension = f'.{arguments.output_format}' + (f'.{arguments.compress}' if arguments.compress else '')
+    compression_options = {"compression": arguments.compress, "compression_level": arguments.compression_level}
+    if arguments.output_format == 'csv':
+        write_table = partial(write_csv_atomically, **compression_options)
+    else:
+        write_table = partial(write_json_atomically, lines=arguments.output_format == 'ndjson', **compression_options)
 
     # Joins the current directory, the relative path to the output folder and the filename 
     # to create a complete path to each of the output files.
-    account_summaries_file = os.path.join(current_dir,f'output\\{output_file_prefix}_account_summaries.csv')
-    suspicious_transactions_file = os.path.join(current_dir,f'output\\{output_file_prefix}_suspicious_transactions.csv')
-    transaction_statistics_file = os.path.join(current_dir,f'output\\{output_file_prefix}_transaction_statistics.csv')
+    account_summaries_file = os.path.join(current_dir, 'output', f'{output_file_prefix}_account_summaries{output_extension}')
+    suspicious_transactions_file = os.path.join(current_dir, 'output', f'{output_file_prefix}_suspicious_transactions{output_extension}')
+    transaction_statistics_file = os.path.join(current_dir, 'output', f'{output_file_prefix}_transaction_statistics{output_extension}')
+    amount_statistics_file = (os.path.join(current_dir, 'output', f'{output_file_prefix}_amount_statistics{output_extension}')
+                              if arguments.amount_statistics else None)
+    currency_balances_file = os.path.join(current_dir, 'output', f'{output_file_prefix}_currency_balances{output_extension}')
+    # Alerts are read while they are appended, which a JSON array does not allow, so JSON output uses NDJSON here
+    alerts_format = 'csv' if arguments.output_format == 'csv' else 'ndjson'
+    suspicious_alerts_file = os.path.join(current_dir, 'output', f'{output_file_prefix}_suspicious_alerts.{alerts_format}')
+
+    processor_options = {}
+    observers = []
+    if arguments.rules:
+        processor_options["rule_engine"] = SuspiciousRuleEngine.from_file(arguments.rules)
+    velocity_detector = None
+    if arguments.velocity_max_count is not None or arguments.velocity_max_total is not None:
+        # Flagged accounts are written to their own output and reported as warnings in the log.
+        velocity_detector = VelocityDetector(arguments.velocity_window_days, arguments.velocity_max_count,
+                                             arguments.velocity_max_total)
+        observers.append(velocity_detector)
+    top_accounts = TopAccounts(arguments.top_accounts) if arguments.top_accounts else None
+    daily_active_accounts = DailyActiveAccounts() if arguments.daily_active_accounts else None
+    observers.extend(observer for observer in (top_accounts, daily_active_accounts) if observer is not None)
+    if observers:
+        processor_options["observers"] = observers
+    if arguments.rollups:
+        processor_options["rollups"] = True
+    if arguments.amount_statistics:
+        processor_options["amount_statistics"] = True
+    if arguments.fx_rates:
+        processor_options["fx_rates"] = FXRateTable.from_file(arguments.fx_rates, arguments.base_currency)
+    deduplicator = TransactionDeduplicator(arguments.dedup, arguments.dedup_capacity) if arguments.dedup else None
+    if deduplicator:
+        processor_options["deduplicator"] = deduplicator
+
+    processor_class = ColumnarDataProcessor if arguments.engine == 'columnar' else DataProcessor
+    profiler = StageProfiler() if arguments.profile else None
+    query_service = QueryService(arguments.serve_host, arguments.serve) if arguments.serve is not None else None
+    if query_service:
+        query_service.start()
+
+    if arguments.profile:
+        # Stream the input as in a normal run; the time spent reading it is measured as its own stage.
+        profile_file = os.path.join(current_dir, 'output', f'{output_file_prefix}_process.prof') if arguments.cprofile else None
+        with profiler.stage('process', profile_file) as stage:
+            records = profiler.timed_rows('read', InputHandler(input_file_path).iter_records())
+            data_processor = processor_class(records, **processor_options)
+            data_processor.process_data()
+            stage["rows"] = data_processor.counters["rows_processed"]
+    elif arguments.input_dir:
+        # Read and process the files concurrently, one worker process per file at a time.
+        data_processor = process_directory(arguments.input_dir, arguments.workers if arguments.workers > 1 else None,
+                                           processor_class, processor_options)
+    elif arguments.checkpoint:
+        # Restore the previous run's state and only process the rows appended since then.
+        data_processor = process_incrementally(input_file_path, arguments.checkpoint, processor_class,
+                                               processor_options)
+    elif arguments.follow:
+        def publish(processor):
+            # Each snapshot replaces the output files atomically, so readers never see a partial file.
+            write_outputs(arguments, OutputHandler(processor.account_summaries, processor.suspicious_transactions,
+                                                   processor.transaction_statistics, processor.get_amount_statistics(),
+                                                   output_format=arguments.output_format,
+                                                   suspicious_transaction_rules=processor.suspicious_transaction_rules,
+                                                   **compression_options),
+                          processor, account_summaries_file, suspicious_transactions_file, transaction_statistics_file,
+                          amount_statistics_file, currency_balances_file)
+            if query_service:
+                query_service.publish(processor)
 
+        # Keep one processor resident and feed it the rows appended to the file until interrupted.
+        data_processor = DataProcessor([], **processor_options)
+        if query_service:
+            query_service.publish(data_processor)
+        # Alerts are appended in place so they can be read as soon as they are flushed; a restart keeps
+        # the alerts already written
+        with SuspiciousTransactionWriter(suspicious_alerts_file, output_format=alerts_format,
+                                         atomic=False) as alert_writer:
+            live_processor = LiveProcessor(input_file_path, data_processor, publish, alert_writer,
+                                           arguments.poll_interval, arguments.snapshot_interval, arguments.snapshot_rows)
+            try:
+                live_processor.run()
+            except KeyboardInterrupt:
+                pass
+    elif arguments.pipeline:
+        input_handler = InputHandler(input_file_path)
+        # Fuse reading, processing and writing: suspicious transactions go straight to their file.
+        with SuspiciousTransactionWriter(suspicious_transactions_file, output_format=arguments.output_format,
+                                         **compression_options) as suspicious_writer:
+            data_processor = processor_class(input_handler.iter_records(), suspicious_sink=suspicious_writer.write,
+                                             **processor_options)
+            data_processor.process_data()
+    elif arguments.workers > 1:
+        # Process byte-range shards of the file in parallel and merge the partial results.
+        data_processor = process_file_in_parallel(input_file_path, arguments.workers, processor_class,
+                                                  processor_options)
+    else:
+        input_handler = InputHandler(input_file_path)
+        # Stream the records so the whole input file is never held in memory.
+        data_processor = processor_class(input_handler.iter_records(), **processor_options)
+        data_processor.process_data()
 
-    output_handler.write_account_summaries_to_csv(account_summaries_file)
-    output_handler.write_suspicious_transactions_to_csv(suspicious_transactions_file)
-    output_handler.write_transaction_statistics_to_csv(transaction_statistics_file)
+    output_handler = OutputHandler(data_processor.account_summaries, data_processor.suspicious_transactions,
+                                   data_processor.transaction_statistics, data_processor.get_amount_statistics(),
+                                   output_format=arguments.output_format,
+                                   suspicious_transaction_rules=data_processor.suspicious_transaction_rules,
+                                   **compression_options)
+
+    with profiler.stage('write') if profiler else nullcontext({}) as stage:
+        stage["rows"] = (len(data_processor.account_summaries) + len(data_processor.suspicious_transactions)
+                         + len(data_processor.transaction_statistics))
+        write_outputs(arguments, output_handler, data_processor, account_summaries_file,
+                      suspicious_transactions_file, transaction_statistics_file, amount_statistics_file,
+                      currency_balances_file)
+
+    if data_processor.rollups is not None:
+        write_table(os.path.join(current_dir, 'output', f'{output_file_prefix}_daily_rollups{output_extension}'),
+                    ['Date', 'Account number', 'Transaction type', 'Total amount', 'Transaction count'],
+                    ([*key, totals['total_amount'], totals['transaction_count']]
+                     for key, totals in data_processor.rollups.daily().items()))
+        write_table(os.path.join(current_dir, 'output', f'{output_file_prefix}_monthly_rollups{output_extension}'),
+                    ['Month', 'Transaction type', 'Total amount', 'Transaction count'],
+                    ([*key, totals['total_amount'], totals['transaction_count']]
+                     for key, totals in data_processor.rollups.monthly().items()))
+    if velocity_detector:
+        write_table(os.path.join(current_dir, 'output', f'{output_file_prefix}_velocity_flags{output_extension}'),
+                    ['Account number', 'Window end', 'Transaction count', 'Total amount', 'Violations'],
+                    ([account['account_number'], account['window_end'], account['transaction_count'],
+                      account['total_amount'], account['violations']]
+                     for account in velocity_detector.flagged_accounts.values()))
+    if top_accounts:
+        write_table(os.path.join(current_dir, 'output', f'{output_file_prefix}_top_accounts{output_extension}'),
+                    ['Rank', 'Account number', 'Withdrawal volume', 'Maximum overestimate'],
+                    ([rank, account['account_number'], account['volume'], account['max_overestimate']]
+                     for rank, account in enumerate(top_accounts.top(), 1)))
+    if daily_active_accounts:
+        write_table(os.path.join(current_dir, 'output', f'{output_file_prefix}_daily_active_accounts{output_extension}'),
+                    ['Date', 'Distinct accounts'], daily_active_accounts.counts().items())
+
+    if deduplicator:
+        # The seen IDs were committed with the checkpoint.
+        deduplicator.close()
+
+    if query_service:
+        query_service.publish(data_processor)
+        if not arguments.follow:
+            # Keep serving the final results until interrupted.
+            try:
+                threading.Event().wait()
+            except KeyboardInterrupt:
+                pass
+        query_service.stop()
+
+    if profiler:
+        profiler.write_metrics(os.path.join(current_dir, 'output', f'{output_file_prefix}_metrics.json'))
+        profiler.stop()
+
+def write_outputs(arguments: argparse.Namespace, output_handler: OutputHandler, data_processor: DataProcessor,
+                  account_summaries_file: str, suspicious_transactions_file: str,
+                  transaction_statistics_file: str, amount_statistics_file: str,
+                  currency_balances_file: str) -> None:
+    """Writes the processed data to the output files selected by the command line options.
+
+    Args:
+        arguments (argparse.Namespace): The parsed options.
+        output_handler (OutputHandler): The handler holding the processed data.
+        data_processor (DataProcessor): The processor holding the processed data.
+        account_summaries_file (str): The path of the account summaries file.
+        suspicious_transactions_file (str): The path of the suspicious transactions file.
+        transaction_statistics_file (str): The path of the transaction statistics file.
+        amount_statistics_file (str): The path of the amount statistics (percentiles) file, or None to skip it.
+        currency_balances_file (str): The path of the per-currency balances file.
+    """
+    # Write the outputs concurrently; each file appears atomically once it is complete.
+    # In pipeline mode the suspicious transactions file has already been written.
+    output_handler.write_all(account_summaries_file,
+                             None if arguments.pipeline else suspicious_transactions_file,
+                             transaction_statistics_file, amount_statistics_file=amount_statistics_file,
+                             currency_balances_file=currency_balances_file)
+    if arguments.binary:
+        # The binary files sit next to the other outputs, without their (possibly compressed) extension
+        output_handler.write_account_summaries_to_binary(
+            account_summaries_file[:account_summaries_file.rindex(f'.{arguments.output_format}')] + '.bin')
+        output_handler.write_transaction_statistics_to_binary(
+            transaction_statistics_file[:transaction_statistics_file.rindex(f'.{arguments.output_format}')] + '.bin')
+    if arguments.store:
+        # Index the results for point lookups without reprocessing the input.
+        with AccountStore(arguments.store) as account_store:
+            account_store.load(data_processor.account_summaries, data_processor.transaction_statistics)
 
 if __name__ == '__main__':
     main()
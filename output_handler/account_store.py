@@ -0,0 +1,133 @@
+import sqlite3
+from itertools import islice
+
+
+class AccountStore:
+    """
+    An embedded SQLite store of processing results for fast point lookups.
+
+    Account summaries and transaction statistics are bulk-loaded with batched `executemany`
+    inside a single transaction into tables keyed (and therefore indexed) by account number and
+    transaction type, so a single account or transaction type can be read back in milliseconds
+    without reprocessing the input. Loading replaces the stored rows of the accounts and types
+    being loaded.
+
+    Attributes:
+    - db_path (str): The path of the SQLite database file.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS account_summaries (
+            account_number TEXT PRIMARY KEY,
+            balance REAL NOT NULL,
+            total_deposits REAL NOT NULL,
+            total_withdrawals REAL NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS transaction_statistics (
+            transaction_type TEXT PRIMARY KEY,
+            total_amount REAL NOT NULL,
+            transaction_count INTEGER NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Opens (and if needed creates) the store.
+
+        Parameters:
+        - db_path (str): The path of the SQLite database file.
+        """
+        self.__db_path = db_path
+        self.__connection = sqlite3.connect(db_path)
+        self.__connection.row_factory = sqlite3.Row
+        # WAL lets readers query the store while a load is running
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.executescript(self.SCHEMA)
+
+    @property
+    def db_path(self):
+        """
+        Returns the path of the SQLite database file.
+
+        Returns:
+        - str: The database path.
+        """
+        return self.__db_path
+
+    def load(self, account_summaries: dict, transaction_statistics: dict, batch_size: int = 10000) -> None:
+        """
+        Bulk-load account summaries and transaction statistics, e.g. the results of DataProcessor.process_data.
+
+    Parameters:
+    - account_summaries (dict): A dictionary of dictionaries containing account summaries.
+    - transaction_statistics (dict): A dictionary of dictionaries containing transaction statistics.
+    - batch_size (int): The number of rows passed to each executemany call.
+
+    Returns:
+    - None
+        """
+        summary_rows = ((str(account_number), summary['balance'], summary['total_deposits'], summary['total_withdrawals'])
+                        for account_number, summary in account_summaries.items())
+        statistic_rows = ((str(transaction_type), statistic['total_amount'], statistic['transaction_count'])
+                          for transaction_type, statistic in transaction_statistics.items())
+        with self.__connection:
+            self.__execute_in_batches(
+                "INSERT OR REPLACE INTO account_summaries VALUES (?, ?, ?, ?)", summary_rows, batch_size)
+            self.__execute_in_batches(
+                "INSERT OR REPLACE INTO transaction_statistics VALUES (?, ?, ?)", statistic_rows, batch_size)
+
+    def get_account_summary(self, account_number) -> dict:
+        """
+        Returns the summary of one account.
+
+        Parameters:
+        - account_number: The account number.
+
+        Returns:
+        - dict: The account summary with the same keys as DataProcessor.account_summaries, or None.
+        """
+        row = self.__connection.execute(
+            "SELECT * FROM account_summaries WHERE account_number = ?", (str(account_number),)).fetchone()
+        return None if row is None else dict(row)
+
+    def get_transaction_statistics(self, transaction_type: str) -> dict:
+        """
+        Returns the statistics of one transaction type, including the average amount.
+
+        Parameters:
+        - transaction_type (str): The transaction type.
+
+        Returns:
+        - dict: The total amount, transaction count and average amount, or None.
+        """
+        row = self.__connection.execute(
+            "SELECT * FROM transaction_statistics WHERE transaction_type = ?", (transaction_type,)).fetchone()
+        if row is None:
+            return None
+        statistics = dict(row)
+        count = statistics['transaction_count']
+        statistics['average_amount'] = statistics['total_amount'] / count if count else 0
+        return statistics
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self.__connection.close()
+
+    def __execute_in_batches(self, statement: str, rows, batch_size: int) -> None:
+        """
+        Runs executemany over successive batches of rows.
+        """
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return
+            self.__connection.executemany(statement, batch)
+
+    def __enter__(self) -> "AccountStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
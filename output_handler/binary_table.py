@@ -0,0 +1,321 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+MAGIC = b'FDPBIN1\x00'
+ALIGNMENT = 8
+
+FLOAT64 = 'f8'
+INT64 = 'i8'
+FIXED_BYTES = 'bytes'
+
+
+def _padding(size: int) -> int:
+    """
+    Returns the number of zero bytes needed to align a section of the given size.
+    """
+    return -size % ALIGNMENT
+
+
+def write_binary_table(file_path: str, columns: list, key_column: str = None) -> None:
+    """
+    Write a table in a fixed-width binary columnar format.
+
+    Layout: the magic bytes, the length of a JSON header as a little-endian uint32, the header
+    itself, then every column as one packed array (little-endian float64 or int64, or fixed-width
+    NUL-padded UTF-8 strings), each aligned to 8 bytes. The header records the row count and the
+    type, width and offset (relative to the end of the aligned header) of every column. When
+    key_column is given, the rows are sorted by that column so readers can find a key with a
+    binary search. The file is written to a temporary file and renamed, so it appears complete
+    or not at all.
+
+    Parameters:
+    - file_path (str): The path of the binary file.
+    - columns (list): (name, type, values) tuples where type is FLOAT64, INT64 or FIXED_BYTES and
+      values is a sequence with one value per row.
+    - key_column (str): The name of a FIXED_BYTES column to sort the rows by, or None.
+
+    Returns:
+    - None
+
+    Raises:
+    - ValueError: If the columns have different lengths or an unknown type.
+    """
+    row_count = len(columns[0][2]) if columns else 0
+    if any(len(values) != row_count for _, _, values in columns):
+        raise ValueError("Every column must have the same number of values.")
+
+    encoded = []
+    for name, column_type, values in columns:
+        if column_type == FIXED_BYTES:
+            values = [str(value).encode('utf-8') for value in values]
+        elif column_type not in (FLOAT64, INT64):
+            raise ValueError(f"Unknown column type: {column_type}")
+        encoded.append((name, column_type, values))
+
+    order = range(row_count)
+    if key_column is not None:
+        key_values = next(values for name, _, values in encoded if name == key_column)
+        order = sorted(range(row_count), key=key_values.__getitem__)
+
+    # Pack every column; fixed-width strings use the width of the longest value
+    sections = []
+    descriptors = []
+    for name, column_type, values in encoded:
+        ordered = [values[index] for index in order]
+        if column_type == FIXED_BYTES:
+            width = max((len(value) for value in ordered), default=0) or 1
+            data = b''.join(value.ljust(width, b'\x00') for value in ordered)
+        else:
+            width = 8
+            packed = array('d' if column_type == FLOAT64 else 'q', ordered)
+            if packed.itemsize != 8:
+                raise ValueError("This platform does not have 8-byte integers.")
+            if struct.pack('=H', 1) != struct.pack('<H', 1):
+                packed.byteswap()
+            data = packed.tobytes()
+        descriptors.append({"name": name, "type": column_type, "width": width})
+        sections.append(data)
+
+    # Column offsets are relative to the start of the data, which follows the aligned header
+    offset = 0
+    for descriptor, data in zip(descriptors, sections):
+        descriptor["offset"] = offset
+        offset += len(data) + _padding(len(data))
+    header = {"row_count": row_count, "key_column": key_column, "columns": descriptors}
+    header_bytes = json.dumps(header).encode('utf-8')
+
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    handle, temporary_path = tempfile.mkstemp(dir=directory, prefix=f'.{file_name}.', suffix='.tmp')
+    try:
+        os.chmod(temporary_path, 0o644)
+        with open(handle, 'wb') as output_file:
+            output_file.write(MAGIC)
+            output_file.write(struct.pack('<I', len(header_bytes)))
+            output_file.write(header_bytes)
+            output_file.write(b'\x00' * _padding(output_file.tell()))
+            for data in sections:
+                output_file.write(data)
+                output_file.write(b'\x00' * _padding(len(data)))
+            output_file.flush()
+            os.fsync(output_file.fileno())
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+class _FixedBytesColumn:
+    """
+    A read-only sequence view of a fixed-width string column, decoded on access.
+    """
+
+    def __init__(self, buffer: memoryview, width: int, row_count: int):
+        self.__buffer = buffer
+        self.__width = width
+        self.__row_count = row_count
+
+    def raw(self, index: int) -> bytes:
+        """
+        Returns the NUL-stripped bytes of a value.
+        """
+        start = index * self.__width
+        return bytes(self.__buffer[start:start + self.__width]).rstrip(b'\x00')
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self.__row_count:
+            raise IndexError(index)
+        return self.raw(index).decode('utf-8')
+
+    def __len__(self) -> int:
+        return self.__row_count
+
+
+class _RawKeys:
+    """
+    A sequence of the raw bytes of a key column, used for binary searches.
+    """
+
+    def __init__(self, column: _FixedBytesColumn):
+        self.__column = column
+
+    def __getitem__(self, index: int) -> bytes:
+        return self.__column.raw(index)
+
+    def __len__(self) -> int:
+        return len(self.__column)
+
+
+class BinaryTableReader:
+    """
+    Reads a table written by write_binary_table through a read-only memory map.
+
+    Numeric columns are returned as memoryviews straight over the mapped file (no copy and no
+    parsing), and rows can be found by key in O(log n) with a binary search over the sorted key
+    column. Use it as a context manager, and release any column views before it is closed.
+
+    Attributes:
+    - file_path (str): The path of the binary file.
+    - row_count (int): The number of rows in the table.
+    - key_column (str): The column the rows are sorted by, or None.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Maps the file and reads its header.
+
+        Parameters:
+        - file_path (str): The path of the binary file.
+
+        Raises:
+        - FileNotFoundError: If the file does not exist.
+        - ValueError: If the file is not a binary table.
+        """
+        self.__file_path = file_path
+        try:
+            self.__file = open(file_path, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File: {file_path} does not exist.")
+        try:
+            self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self.__map[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"File: {file_path} is not a binary table.")
+            header_length = struct.unpack_from('<I', self.__map, len(MAGIC))[0]
+            header_start = len(MAGIC) + 4
+            header = json.loads(self.__map[header_start:header_start + header_length].decode('utf-8'))
+            data_start = header_start + header_length
+            self.__data_start = data_start + _padding(data_start)
+        except BaseException:
+            self.close()
+            raise
+        self.__row_count = header["row_count"]
+        self.__key_column = header["key_column"]
+        self.__columns = {descriptor["name"]: descriptor for descriptor in header["columns"]}
+        self.__view = memoryview(self.__map)
+
+    @property
+    def file_path(self):
+        """
+        Returns the path of the binary file.
+        """
+        return self.__file_path
+
+    @property
+    def row_count(self):
+        """
+        Returns the number of rows in the table.
+        """
+        return self.__row_count
+
+    @property
+    def key_column(self):
+        """
+        Returns the name of the column the rows are sorted by, or None.
+        """
+        return self.__key_column
+
+    @property
+    def column_names(self):
+        """
+        Returns the names of the columns in file order.
+        """
+        return list(self.__columns)
+
+    def column(self, name: str):
+        """
+        Returns a zero-copy view of a column.
+
+        Parameters:
+        - name (str): The column name.
+
+        Returns:
+        - memoryview or sequence: A memoryview of float64 ('d') or int64 ('q') values for numeric
+          columns, or a read-only sequence of str for fixed-width string columns.
+
+        Raises:
+        - KeyError: If the column does not exist.
+        """
+        descriptor = self.__columns[name]
+        start = self.__data_start + descriptor["offset"]
+        buffer = self.__view[start:start + descriptor["width"] * self.__row_count]
+        if descriptor["type"] == FIXED_BYTES:
+            return _FixedBytesColumn(buffer, descriptor["width"], self.__row_count)
+        if struct.pack('=H', 1) != struct.pack('<H', 1):
+            # Big-endian platform: the values have to be converted, so this copies
+            values = array('d' if descriptor["type"] == FLOAT64 else 'q', buffer)
+            values.byteswap()
+            return memoryview(values)
+        return buffer.cast('d' if descriptor["type"] == FLOAT64 else 'q')
+
+    def find(self, key) -> int:
+        """
+        Finds the row index of a key with a binary search over the sorted key column.
+
+        Parameters:
+        - key: The key value, e.g. an account number.
+
+        Returns:
+        - int: The row index, or None if the key is not in the table.
+
+        Raises:
+        - ValueError: If the table has no key column.
+        """
+        if self.__key_column is None:
+            raise ValueError(f"File: {self.__file_path} has no key column.")
+        keys = _RawKeys(self.column(self.__key_column))
+        target = str(key).encode('utf-8')
+        index = bisect.bisect_left(keys, target)
+        if index < len(keys) and keys[index] == target:
+            return index
+        return None
+
+    def row(self, index: int) -> dict:
+        """
+        Returns one row as a dictionary keyed by column name.
+
+        Parameters:
+        - index (int): The row index.
+
+        Returns:
+        - dict: The values of the row.
+        """
+        if not 0 <= index < self.__row_count:
+            raise IndexError(index)
+        return {name: self.column(name)[index] for name in self.__columns}
+
+    def lookup(self, key) -> dict:
+        """
+        Returns the row of a key, or None if the key is not in the table.
+
+        Parameters:
+        - key: The key value, e.g. an account number.
+
+        Returns:
+        - dict: The values of the row, or None.
+        """
+        index = self.find(key)
+        return None if index is None else self.row(index)
+
+    def close(self) -> None:
+        """
+        Unmaps and closes the file.
+        """
+        view = getattr(self, '_BinaryTableReader__view', None)
+        if view is not None:
+            view.release()
+            self.__view = None
+        if getattr(self, '_BinaryTableReader__map', None) is not None:
+            self.__map.close()
+            self.__map = None
+        self.__file.close()
+
+    def __enter__(self) -> "BinaryTableReader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
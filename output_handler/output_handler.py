@@ -1,19 +1,49 @@
 import csv
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+
+from input_handler.compression import check_compression_level, open_compressed
+from output_handler.binary_table import FIXED_BYTES, FLOAT64, INT64, write_binary_table
+
+ACCOUNT_SUMMARY_COLUMNS = ['Account number', 'Balance', 'Total Deposits', 'Total Withdrawals']
+NORMALIZED_BALANCE_COLUMN = 'Normalized Balance'
+CURRENCY_BALANCE_COLUMNS = ['Account number', 'Currency', 'Balance']
+SUSPICIOUS_TRANSACTION_COLUMNS = ['Transaction ID', 'Account number', 'Date', 'Transaction type', 'Amount', 'Currency', 'Description']
+# The names of the rules that flagged each suspicious transaction, separated by ';'
+FIRED_RULES_COLUMN = 'Fired rules'
+SUSPICIOUS_OUTPUT_COLUMNS = SUSPICIOUS_TRANSACTION_COLUMNS + [FIRED_RULES_COLUMN]
+TRANSACTION_STATISTICS_COLUMNS = ['Transaction type', 'Total amount', 'Transaction count']
+AMOUNT_STATISTICS_COLUMNS = ['Dimension', 'Key', 'Count', 'Min', 'Max', 'Mean', 'Standard deviation', 'P50', 'P95', 'P99']
+# 'json' writes one JSON array per file, 'ndjson' one JSON object per line (JSON Lines)
+OUTPUT_FORMATS = ('csv', 'json', 'ndjson')
 
 class OutputHandler:
     """
      A class to handle output operations such as writing account summaries, suspicious transactions, 
-    and transaction statistics to CSV files.
+    and transaction statistics to CSV, JSON or NDJSON files.
 
     Attributes:
     - account_summaries (dict): A dictionary of dictionaries containing account summaries.
     - suspicious_transactions (list): A list of dictionaries containing suspicious transactions.
     - transaction_statistics (dict): A dictionary of dictionaries containing transaction statistics.
+    - amount_statistics (dict): Amount distributions per transaction type and per currency, or None.
+    - compression (str): 'gz', 'xz' or 'bz2' to compress the CSV outputs while they are written, or None.
+    - compression_level (int): The compression level, from 0 (gz and xz) or 1 (bz2) to 9, or None for the default.
+    - output_format (str): The format write_all writes the outputs in: 'csv', 'json' or 'ndjson'.
+    - suspicious_transaction_rules (list): The names of the rules that fired for each suspicious transaction.
     """
 
     def __init__(self, account_summaries: dict, 
                        suspicious_transactions: list, 
-                       transaction_statistics: dict) -> None:
+                       transaction_statistics: dict,
+                       amount_statistics: dict = None,
+                       compression: str = None,
+                       compression_level: int = None,
+                       output_format: str = 'csv',
+                       suspicious_transaction_rules: list = None) -> None:
         """
          Initialize OutputHandler with account summaries, suspicious transactions, and transaction statistics.
 
@@ -21,10 +51,31 @@ class OutputHandler:
         - account_summaries (dict): A dictionary of dictionaries containing account summaries.
         - suspicious_transactions (list): A list of dictionaries containing suspicious transactions.
         - transaction_statistics (dict): A dictionary of dictionaries containing transaction statistics.
+        - amount_statistics (dict): Amount distributions per transaction type and per currency, as returned
+          by DataProcessor.get_amount_statistics, or None.
+        - compression (str): 'gz', 'xz' or 'bz2' to compress the CSV outputs while they are written, or None.
+          The file paths are used as given, so they should end with the matching extension (e.g. '.csv.gz').
+        - compression_level (int): The compression level, from 0 for gz and xz or 1 for bz2 (fastest,
+          least CPU) to 9 (smallest files), or None for the default of the format.
+        - output_format (str): The format write_all writes the outputs in: 'csv', 'json' (one array per file)
+          or 'ndjson' (one object per line). The JSON records use the CSV column names as keys.
+        - suspicious_transaction_rules (list): The names of the rules that fired for each suspicious transaction,
+          in the same order, as kept by DataProcessor.suspicious_transaction_rules. They are written to the
+          Fired rules column; it is left empty for transactions without rules.
         """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}. Use one of: {', '.join(OUTPUT_FORMATS)}.")
+        if compression is not None:
+            # Fail before any output is written rather than in the middle of write_all
+            check_compression_level(compression, compression_level)
         self.__account_summaries = account_summaries
         self.__suspicious_transactions = suspicious_transactions
         self.__transaction_statistics = transaction_statistics
+        self.__amount_statistics = amount_statistics or {}
+        self.__compression = compression
+        self.__compression_level = compression_level
+        self.__output_format = output_format
+        self.__suspicious_transaction_rules = suspicious_transaction_rules or []
     
     @property
     def account_summaries(self):
@@ -56,6 +107,36 @@ class OutputHandler:
         """
         return self.__transaction_statistics
 
+    @property
+    def amount_statistics(self):
+        """
+        Returns the amount distributions.
+
+        Returns:
+        - dict: The amount distributions per transaction type and per currency.
+        """
+        return self.__amount_statistics
+
+    @property
+    def compression(self):
+        """
+        Returns the compression of the CSV outputs.
+
+        Returns:
+        - str: 'gz', 'xz' or 'bz2', or None if the outputs are not compressed.
+        """
+        return self.__compression
+
+    @property
+    def output_format(self):
+        """
+        Returns the format write_all writes the outputs in.
+
+        Returns:
+        - str: 'csv', 'json' or 'ndjson'.
+        """
+        return self.__output_format
+
     def write_account_summaries_to_csv(self, file_path: str) -> None:
         """
          Write account summaries to a CSV file.
@@ -66,17 +147,12 @@ class OutputHandler:
     Returns:
     - None
         """
-        with open(file_path, 'w', newline='') as output_file:
+        with self.__open_output(file_path) as output_file:
             writer = csv.writer(output_file)
-            writer.writerow(['Account number', 'Balance', 'Total Deposits', 'Total Withdrawals'])
+            writer.writerow(self.__account_summary_columns())
 
-            for account_number, summary in self.__account_summaries.items():
-                writer.writerow([
-                    account_number,
-                    summary['balance'],
-                    summary['total_deposits'],
-                    summary['total_withdrawals']
-                ])
+            for row in self.__account_summary_rows():
+                writer.writerow(row)
 
     def write_suspicious_transactions_to_csv(self, file_path: str) -> None:
         """
@@ -88,20 +164,12 @@ class OutputHandler:
     Returns:
     - None
         """
-        with open(file_path, 'w', newline='') as output_file:
+        with self.__open_output(file_path) as output_file:
             writer = csv.writer(output_file)
-            writer.writerow(['Transaction ID', 'Account number', 'Date', 'Transaction type', 'Amount', 'Currency', 'Description'])
-
-            for transaction in self.__suspicious_transactions:
-                writer.writerow([
-                    transaction['Transaction ID'],
-                    transaction['Account number'],
-                    transaction['Date'],
-                    transaction['Transaction type'],
-                    transaction['Amount'],
-                    transaction['Currency'],
-                    transaction['Description']
-                ])
+            writer.writerow(SUSPICIOUS_OUTPUT_COLUMNS)
+
+            for row in self.__suspicious_transaction_rows():
+                writer.writerow(row)
 
     def write_transaction_statistics_to_csv(self, file_path: str) -> None:
         """
@@ -113,13 +181,521 @@ class OutputHandler:
     Returns:
     - None
         """        
-        with open(file_path, 'w', newline='') as output_file:
+        with self.__open_output(file_path) as output_file:
             writer = csv.writer(output_file)
-            writer.writerow(['Transaction type', 'Total amount', 'Transaction count'])
-
-            for transaction_type, statistic in self.__transaction_statistics.items():
-                writer.writerow([
-                    transaction_type,
-                    statistic['total_amount'],
-                    statistic['transaction_count']
-                ])
\ No newline at end of file
+            writer.writerow(TRANSACTION_STATISTICS_COLUMNS)
+
+            for row in self.__transaction_statistic_rows():
+                writer.writerow(row)
+
+    def write_amount_statistics_to_csv(self, file_path: str) -> None:
+        """
+        Write the amount distributions (count, min, max, mean, standard deviation and percentiles) to a CSV file.
+
+    There is one row per transaction type and one per currency, told apart by the Dimension column.
+
+    Parameters:
+    - file_path (str): The path to the CSV file where the amount statistics will be written.
+    
+    Returns:
+    - None
+        """
+        with self.__open_output(file_path) as output_file:
+            writer = csv.writer(output_file)
+            writer.writerow(AMOUNT_STATISTICS_COLUMNS)
+
+            for row in self.__amount_statistic_rows():
+                writer.writerow(row)
+
+    def write_currency_balances_to_csv(self, file_path: str) -> None:
+        """
+        Write the balance of every account in each of its currencies to a CSV file.
+
+    Parameters:
+    - file_path (str): The path to the CSV file where the currency balances will be written.
+    
+    Returns:
+    - None
+        """
+        with self.__open_output(file_path) as output_file:
+            writer = csv.writer(output_file)
+            writer.writerow(CURRENCY_BALANCE_COLUMNS)
+
+            for row in self.__currency_balance_rows():
+                writer.writerow(row)
+
+    def write_account_summaries_to_json(self, file_path: str, lines: bool = False) -> None:
+        """
+        Write account summaries to a JSON file, one object per account keyed by the CSV column names.
+
+    Parameters:
+    - file_path (str): The path to the JSON file where the account summaries will be written.
+    - lines (bool): True to write one object per line (NDJSON) instead of a JSON array.
+    
+    Returns:
+    - None
+        """
+        with self.__open_output(file_path) as output_file:
+            write_json_records(output_file, self.__account_summary_columns(), self.__account_summary_rows(), lines)
+
+    def write_suspicious_transactions_to_json(self, file_path: str, lines: bool = False) -> None:
+        """
+        Write suspicious transactions to a JSON file, in the same shape as a JSON input file.
+
+    Parameters:
+    - file_path (str): The path to the JSON file where the suspicious transactions will be written.
+    - lines (bool): True to write one object per line (NDJSON) instead of a JSON array.
+    
+    Returns:
+    - None
+        """
+        with self.__open_output(file_path) as output_file:
+            write_json_records(output_file, SUSPICIOUS_OUTPUT_COLUMNS, self.__suspicious_transaction_rows(), lines)
+
+    def write_transaction_statistics_to_json(self, file_path: str, lines: bool = False) -> None:
+        """
+        Write transaction statistics to a JSON file, one object per transaction type.
+
+    Parameters:
+    - file_path (str): The path to the JSON file where the transaction statistics will be written.
+    - lines (bool): True to write one object per line (NDJSON) instead of a JSON array.
+    
+    Returns:
+    - None
+        """
+        with self.__open_output(file_path) as output_file:
+            write_json_records(output_file, TRANSACTION_STATISTICS_COLUMNS, self.__transaction_statistic_rows(), lines)
+
+    def write_all(self, account_summaries_file: str, suspicious_transactions_file: str,
+                  transaction_statistics_file: str, buffer_size: int = 1024 * 1024,
+                  amount_statistics_file: str = None, currency_balances_file: str = None) -> None:
+        """
+        Write the account summaries, suspicious transactions and transaction statistics concurrently,
+    in the output format of the handler.
+
+    Each output is streamed row by row through a large buffer into a temporary file in the
+    same directory, which is then renamed over the target path. The rename is atomic, so anyone
+    watching the output directory sees either the previous file or the complete new one.
+
+    Parameters:
+    - account_summaries_file (str): The path of the account summaries file, or None to skip it.
+    - suspicious_transactions_file (str): The path of the suspicious transactions file, or None to skip it.
+    - transaction_statistics_file (str): The path of the transaction statistics file, or None to skip it.
+    - buffer_size (int): The size in bytes of each file's write buffer.
+    - amount_statistics_file (str): The path of the amount statistics file, or None to skip it.
+    - currency_balances_file (str): The path of the per-currency balances file, or None to skip it.
+    
+    Returns:
+    - None
+        """
+        outputs = [
+            (account_summaries_file, self.__account_summary_columns(), self.__account_summary_rows),
+            (suspicious_transactions_file, SUSPICIOUS_OUTPUT_COLUMNS, self.__suspicious_transaction_rows),
+            (transaction_statistics_file, TRANSACTION_STATISTICS_COLUMNS, self.__transaction_statistic_rows),
+            (amount_statistics_file, AMOUNT_STATISTICS_COLUMNS, self.__amount_statistic_rows),
+            (currency_balances_file, CURRENCY_BALANCE_COLUMNS, self.__currency_balance_rows)
+        ]
+        outputs = [output for output in outputs if output[0] is not None]
+        if not outputs:
+            return
+        if self.__output_format == 'csv':
+            write_atomically, options = write_csv_atomically, {}
+        else:
+            write_atomically, options = write_json_atomically, {"lines": self.__output_format == 'ndjson'}
+        with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+            futures = [executor.submit(write_atomically, file_path, header, rows(), buffer_size,
+                                       self.__compression, self.__compression_level, **options)
+                       for file_path, header, rows in outputs]
+            # Wait for every output and re-raise the first error
+            for future in futures:
+                future.result()
+
+    def write_account_summaries_to_binary(self, file_path: str) -> None:
+        """
+        Write account summaries in the binary columnar format, sorted by account number.
+
+    The file can be read with output_handler.binary_table.BinaryTableReader, which memory-maps it
+    and looks accounts up with a binary search. Amounts are stored as exact float64 values.
+
+    Parameters:
+    - file_path (str): The path to the binary file where the account summaries will be written.
+    
+    Returns:
+    - None
+        """
+        summaries = list(self.__account_summaries.items())
+        write_binary_table(file_path, [
+            ('account_number', FIXED_BYTES, [account_number for account_number, _ in summaries]),
+            ('balance', FLOAT64, [summary['balance'] for _, summary in summaries]),
+            ('total_deposits', FLOAT64, [summary['total_deposits'] for _, summary in summaries]),
+            ('total_withdrawals', FLOAT64, [summary['total_withdrawals'] for _, summary in summaries])
+        ], key_column='account_number')
+
+    def write_transaction_statistics_to_binary(self, file_path: str) -> None:
+        """
+        Write transaction statistics in the binary columnar format, sorted by transaction type.
+
+    Parameters:
+    - file_path (str): The path to the binary file where the transaction statistics will be written.
+    
+    Returns:
+    - None
+        """
+        statistics = list(self.__transaction_statistics.items())
+        write_binary_table(file_path, [
+            ('transaction_type', FIXED_BYTES, [transaction_type for transaction_type, _ in statistics]),
+            ('total_amount', FLOAT64, [statistic['total_amount'] for _, statistic in statistics]),
+            ('transaction_count', INT64, [statistic['transaction_count'] for _, statistic in statistics])
+        ], key_column='transaction_type')
+
+    def __open_output(self, file_path: str):
+        """
+        Opens an output file for writing, compressing it on the fly if a compression is set.
+        """
+        if self.__compression is None:
+            return open(file_path, 'w', newline='')
+        return open_compressed(file_path, 'wt', self.__compression, self.__compression_level, newline='')
+
+    def __has_normalized_balances(self) -> bool:
+        """
+        Returns whether the account summaries have a balance normalized to a base currency.
+        """
+        return any('normalized_balance' in summary for summary in self.__account_summaries.values())
+
+    def __account_summary_columns(self) -> list:
+        """
+        Returns the header of the account summaries, with a normalized balance column when there is one.
+        """
+        if self.__has_normalized_balances():
+            return ACCOUNT_SUMMARY_COLUMNS + [NORMALIZED_BALANCE_COLUMN]
+        return ACCOUNT_SUMMARY_COLUMNS
+
+    def __account_summary_rows(self):
+        """
+        Yields the account summaries as CSV rows.
+        """
+        normalized = self.__has_normalized_balances()
+        for account_number, summary in self.__account_summaries.items():
+            row = [
+                account_number,
+                summary['balance'],
+                summary['total_deposits'],
+                summary['total_withdrawals']
+            ]
+            if normalized:
+                row.append(summary.get('normalized_balance'))
+            yield row
+
+    def __currency_balance_rows(self):
+        """
+        Yields the balance of every account in every currency as CSV rows.
+        """
+        for account_number, summary in self.__account_summaries.items():
+            for currency, balance in summary.get('currency_balances', {}).items():
+                yield [account_number, currency, balance]
+
+    def __suspicious_transaction_rows(self):
+        """
+        Yields the suspicious transactions as CSV rows.
+        """
+        rules = self.__suspicious_transaction_rules
+        for index, transaction in enumerate(self.__suspicious_transactions):
+            fired_rules = rules[index] if index < len(rules) else ()
+            yield [transaction[column] for column in SUSPICIOUS_TRANSACTION_COLUMNS] + [';'.join(fired_rules)]
+
+    def __transaction_statistic_rows(self):
+        """
+        Yields the transaction statistics as CSV rows.
+        """
+        for transaction_type, statistic in self.__transaction_statistics.items():
+            yield [
+                transaction_type,
+                statistic['total_amount'],
+                statistic['transaction_count']
+            ]
+
+    def __amount_statistic_rows(self):
+        """
+        Yields the amount distributions as CSV rows.
+        """
+        for dimension, distributions in self.__amount_statistics.items():
+            for key, summary in distributions.items():
+                yield [
+                    dimension,
+                    key,
+                    summary['count'],
+                    summary['min'],
+                    summary['max'],
+                    summary['mean'],
+                    summary['std_dev'],
+                    summary.get('p50'),
+                    summary.get('p95'),
+                    summary.get('p99')
+                ]
+
+
+def write_csv_atomically(file_path: str, header: list, rows, buffer_size: int = 1024 * 1024,
+                         compression: str = None, compression_level: int = None) -> None:
+    """
+    Write a CSV file so that it appears at its path complete or not at all.
+
+    The rows are written to a hidden temporary file in the target directory, flushed to disk and
+    then renamed over the target path.
+
+    Parameters:
+    - file_path (str): The path of the CSV file.
+    - header (list): The header row.
+    - rows (iterable): The data rows.
+    - buffer_size (int): The size in bytes of the write buffer.
+    - compression (str): 'gz', 'xz' or 'bz2' to compress the file while it is written, or None.
+    - compression_level (int): The compression level, or None for the default of the format.
+
+    Returns:
+    - None
+    """
+    with _atomic_output(file_path, buffer_size, compression, compression_level) as output_file:
+        writer = csv.writer(output_file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def write_json_atomically(file_path: str, header: list, rows, buffer_size: int = 1024 * 1024,
+                          compression: str = None, compression_level: int = None, lines: bool = False) -> None:
+    """
+    Write a JSON or NDJSON file so that it appears at its path complete or not at all.
+
+    The rows are turned into objects keyed by the header and serialized one at a time, so the
+    document is never built in memory. The file is written like write_csv_atomically.
+
+    Parameters:
+    - file_path (str): The path of the JSON file.
+    - header (list): The column names, used as the keys of every object.
+    - rows (iterable): The data rows.
+    - buffer_size (int): The size in bytes of the write buffer.
+    - compression (str): 'gz', 'xz' or 'bz2' to compress the file while it is written, or None.
+    - compression_level (int): The compression level, or None for the default of the format.
+    - lines (bool): True to write one object per line (NDJSON) instead of a JSON array.
+
+    Returns:
+    - None
+    """
+    with _atomic_output(file_path, buffer_size, compression, compression_level) as output_file:
+        write_json_records(output_file, header, rows, lines)
+
+
+def write_json_records(output_file, header: list, rows, lines: bool = False) -> None:
+    """
+    Serialize rows to an open text file as JSON objects keyed by the header, one row at a time.
+
+    A JSON array is written with one object per line, so both forms can be read back as input
+    (see InputHandler.iter_json_records and iter_ndjson_records) without holding the whole file.
+
+    Parameters:
+    - output_file (file object): The text file to write to.
+    - header (list): The column names, used as the keys of every object.
+    - rows (iterable): The data rows.
+    - lines (bool): True to write one object per line (NDJSON) instead of a JSON array.
+
+    Returns:
+    - None
+    """
+    encode = json.JSONEncoder().encode
+    write = output_file.write
+    if lines:
+        for row in rows:
+            write(encode(dict(zip(header, row))))
+            write('\n')
+        return
+    separator = '[\n'
+    for row in rows:
+        write(separator)
+        write(encode(dict(zip(header, row))))
+        separator = ',\n'
+    write('[]\n' if separator == '[\n' else '\n]\n')
+
+
+@contextmanager
+def _atomic_output(file_path: str, buffer_size: int, compression: str, compression_level: int):
+    """
+    Opens a hidden temporary text file in the directory of file_path for writing. When the block
+    exits normally the file is flushed to disk and renamed over file_path; on an error it is removed.
+    """
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    handle, temporary_path = tempfile.mkstemp(dir=directory, prefix=f'.{file_name}.', suffix='.tmp')
+    try:
+        # mkstemp creates the file readable by its owner only; match a normally created file
+        os.chmod(temporary_path, 0o644)
+        if compression is None:
+            with open(handle, 'w', newline='', buffering=buffer_size) as output_file:
+                yield output_file
+                output_file.flush()
+                os.fsync(output_file.fileno())
+        else:
+            with open(handle, 'wb', buffering=buffer_size) as raw_file:
+                # The compressed stream leaves raw_file open, so it can be synced once the stream is finished
+                with open_compressed(raw_file, 'wt', compression, compression_level, newline='') as output_file:
+                    yield output_file
+                raw_file.flush()
+                os.fsync(raw_file.fileno())
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+class SuspiciousTransactionWriter:
+    """
+    A buffered writer that streams suspicious transactions to a CSV, JSON or NDJSON file as soon as they
+    are flagged, so they never have to be collected in memory. Pass its `write` method as the `suspicious_sink`
+    of a DataProcessor. Use it as a context manager so the file is flushed and closed at the end.
+
+    By default the rows are streamed into a hidden temporary file in the target directory that is
+    renamed over the target path when the writer is closed, like write_csv_atomically, so anyone
+    watching the output directory sees either the previous file or the complete new one. If the
+    `with` block raises, the temporary file is removed and the previous file is kept. Pass
+    atomic=False to append to the target path in place instead, e.g. for alerts that are read while
+    they are being written: the rows already in the file are kept, and the CSV header is only written
+    to a new or empty file. A JSON array cannot be appended to, so that mode needs 'csv' or 'ndjson'.
+
+    Attributes:
+    - file_path (str): The path to the file the suspicious transactions are written to.
+    - output_format (str): 'csv', 'json' or 'ndjson'.
+    - atomic (bool): Whether the file only appears at its path once the writer is closed.
+    - rows_written (int): The number of suspicious transactions written so far.
+    """
+
+    def __init__(self, file_path: str, buffer_size: int = 1024 * 1024, compression: str = None,
+                 compression_level: int = None, output_format: str = 'csv', atomic: bool = True) -> None:
+        """
+        Opens the file and writes the CSV header row, or the opening bracket of a JSON array.
+
+        Parameters:
+        - file_path (str): The path to the file where the suspicious transactions will be written.
+        - buffer_size (int): The size in bytes of the write buffer.
+        - compression (str): 'gz', 'xz' or 'bz2' to compress the file while it is written, or None.
+        - compression_level (int): The compression level, or None for the default of the format.
+        - output_format (str): 'csv', 'json' (an array closed by close) or 'ndjson' (one object per line).
+        - atomic (bool): True to write to a temporary file renamed over file_path on close; False to append
+          to file_path directly, so the rows can be read as soon as they are flushed.
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}. Use one of: {', '.join(OUTPUT_FORMATS)}.")
+        if not atomic and output_format == 'json':
+            raise ValueError("A JSON array cannot be appended to; use the 'ndjson' format or atomic=True.")
+        self.__file_path = file_path
+        self.__output_format = output_format
+        self.__atomic = atomic
+        # Holds the atomic output, whose exit syncs and renames (or removes) the temporary file
+        self.__atomic_output = ExitStack()
+        # An atomic writer always starts a new file; an appending one only when there is nothing to keep
+        new_file = atomic or not os.path.exists(file_path) or os.path.getsize(file_path) == 0
+        if atomic:
+            self.__output_file = self.__atomic_output.enter_context(
+                _atomic_output(file_path, buffer_size, compression, compression_level))
+        elif compression is None:
+            self.__output_file = open(file_path, 'a', newline='', buffering=buffer_size)
+        else:
+            # The compressors buffer their input, so no extra write buffer is needed.
+            # Appending adds a new compressed stream, which the readers decompress as one file.
+            self.__output_file = open_compressed(file_path, 'at', compression, compression_level, newline='')
+        if output_format == 'csv':
+            self.__writer = csv.writer(self.__output_file)
+            if new_file:
+                self.__writer.writerow(SUSPICIOUS_OUTPUT_COLUMNS)
+        else:
+            self.__encode = json.JSONEncoder().encode
+            if output_format == 'json':
+                self.__output_file.write('[')
+        self.__rows_written = 0
+
+    @property
+    def file_path(self):
+        """
+        Returns the path to the output file.
+
+        Returns:
+        - str: The path to the output file.
+        """
+        return self.__file_path
+
+    @property
+    def output_format(self):
+        """
+        Returns the format of the output file.
+
+        Returns:
+        - str: 'csv', 'json' or 'ndjson'.
+        """
+        return self.__output_format
+
+    @property
+    def atomic(self):
+        """
+        Returns whether the file only appears at its path once the writer is closed.
+
+        Returns:
+        - bool: True if the rows are written to a temporary file renamed on close.
+        """
+        return self.__atomic
+
+    @property
+    def rows_written(self):
+        """
+        Returns the number of suspicious transactions written so far.
+
+        Returns:
+        - int: The number of rows written, excluding the header.
+        """
+        return self.__rows_written
+
+    def write(self, transaction, fired_rules: list = None) -> None:
+        """
+        Writes one suspicious transaction to the buffer.
+
+    Parameters:
+    - transaction (dict or Transaction): The suspicious transaction.
+    - fired_rules (list): The names of the rules that flagged the transaction, written to the Fired rules
+      column. Matches the DataProcessor suspicious_sink signature, so the method can be used directly as one.
+    
+    Returns:
+    - None
+        """
+        row = [transaction[column] for column in SUSPICIOUS_TRANSACTION_COLUMNS] + [';'.join(fired_rules or ())]
+        if self.__output_format == 'csv':
+            self.__writer.writerow(row)
+        else:
+            record = self.__encode(dict(zip(SUSPICIOUS_OUTPUT_COLUMNS, row)))
+            if self.__output_format == 'ndjson':
+                self.__output_file.write(record + '\n')
+            else:
+                self.__output_file.write(('\n' if not self.__rows_written else ',\n') + record)
+        self.__rows_written += 1
+
+    def flush(self) -> None:
+        """
+        Flushes the buffered rows to the file.
+        """
+        self.__output_file.flush()
+
+    def close(self) -> None:
+        """
+        Flushes the buffered rows and closes the file, closing the JSON array first.
+        An atomic writer then moves the complete file to its path.
+        """
+        if self.__output_format == 'json' and not self.__output_file.closed:
+            self.__output_file.write('\n]\n' if self.__rows_written else ']\n')
+        if self.__atomic:
+            self.__atomic_output.close()
+        else:
+            self.__output_file.close()
+
+    def __enter__(self) -> "SuspiciousTransactionWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None and self.__atomic:
+            # Discard the incomplete file and keep the previous one
+            self.__atomic_output.__exit__(exc_type, exc_value, traceback)
+        else:
+            self.close()
@@ -0,0 +1,332 @@
+import json
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from data_processor.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class ProcessorSnapshot:
+    """
+    A read-only copy of the results of a DataProcessor at one point in time.
+
+    Readers only ever see complete snapshots: the account summaries and transaction statistics are
+    copied when the snapshot is built, so later updates by the processor do not change them. The
+    suspicious transactions are only ever appended to, so snapshots share one list of rows and each
+    snapshot just records how many of them it covers.
+
+    Attributes:
+        version (int): The number of the snapshot, increasing with every publish.
+        rows_processed (int): The number of rows processed when the snapshot was taken.
+        account_summaries (dict): The account summaries, keyed by account number.
+        transaction_statistics (dict): The total amount, transaction count and average amount of each
+            transaction type.
+        suspicious_count (int): The number of suspicious transactions in the snapshot.
+    """
+
+    def __init__(self, version: int, rows_processed: int, account_summaries: dict, transaction_statistics: dict,
+                 suspicious_rows: list, suspicious_count: int):
+        """
+        Initializes the snapshot. The dictionaries must not be modified afterwards.
+
+        Args:
+            version (int): The number of the snapshot.
+            rows_processed (int): The number of rows processed when the snapshot was taken.
+            account_summaries (dict): Copies of the account summaries, keyed by account number.
+            transaction_statistics (dict): Copies of the transaction statistics, with their average amount.
+            suspicious_rows (list): The suspicious transactions as dictionaries; may grow after the snapshot.
+            suspicious_count (int): The number of suspicious_rows covered by the snapshot.
+        """
+        self.__version = version
+        self.__rows_processed = rows_processed
+        self.__account_summaries = account_summaries
+        self.__accounts = list(account_summaries.values())
+        self.__transaction_statistics = transaction_statistics
+        self.__suspicious_rows = suspicious_rows
+        self.__suspicious_count = suspicious_count
+
+    @property
+    def version(self):
+        """
+        Gets the number of the snapshot.
+
+        Returns:
+            int: The version, increasing with every publish.
+        """
+        return self.__version
+
+    @property
+    def rows_processed(self):
+        """
+        Gets the number of rows processed when the snapshot was taken.
+
+        Returns:
+            int: The number of rows.
+        """
+        return self.__rows_processed
+
+    @property
+    def account_summaries(self):
+        """
+        Gets the account summaries.
+
+        Returns:
+            dict: The account summaries, keyed by account number.
+        """
+        return self.__account_summaries
+
+    @property
+    def transaction_statistics(self):
+        """
+        Gets the transaction statistics.
+
+        Returns:
+            dict: The total_amount, transaction_count and average_amount of each transaction type.
+        """
+        return self.__transaction_statistics
+
+    @property
+    def suspicious_count(self):
+        """
+        Gets the number of suspicious transactions in the snapshot.
+
+        Returns:
+            int: The number of suspicious transactions.
+        """
+        return self.__suspicious_count
+
+    def account_page(self, offset: int, limit: int) -> list:
+        """
+        Returns one page of the account summaries of the snapshot.
+
+        Args:
+            offset (int): The index of the first account of the page.
+            limit (int): The maximum number of accounts in the page.
+
+        Returns:
+            list: The account summaries, in the order the accounts first appeared.
+        """
+        return self.__accounts[offset:offset + limit]
+
+    def suspicious_page(self, offset: int, limit: int) -> list:
+        """
+        Returns one page of the suspicious transactions of the snapshot.
+
+        Args:
+            offset (int): The index of the first transaction of the page.
+            limit (int): The maximum number of transactions in the page.
+
+        Returns:
+            list: The suspicious transactions as dictionaries, in the order they were flagged.
+        """
+        return self.__suspicious_rows[offset:min(offset + limit, self.__suspicious_count)]
+
+
+class QueryService:
+    """
+    A small threaded HTTP service answering read-only JSON queries about the results of a DataProcessor.
+
+    The processor keeps ingesting in its own thread and calls `publish` whenever its results should
+    become visible. `publish` builds a new ProcessorSnapshot and swaps it in with a single
+    assignment, so readers never take a lock, never block the writer and never see a half-updated
+    account: each request reads the snapshot that was current when it started.
+
+    Endpoints (all GET):
+        /health: The snapshot version and the number of rows processed.
+        /accounts?offset=&limit=: A page of account summaries, in account order of first appearance.
+        /accounts/<account number>: One account summary, or 404.
+        /transaction-statistics: The total amount, count and average amount of every transaction type.
+        /transaction-statistics/<transaction type>/average: The average amount of one type, or 404.
+        /suspicious-transactions?offset=&limit=: A page of the suspicious transactions.
+
+    Attributes:
+        address (tuple): The (host, port) the service listens on.
+        snapshot (ProcessorSnapshot): The snapshot currently served, or None before the first publish.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8000):
+        """
+        Binds the service to an address. Requests are only served once `start` is called.
+
+        Args:
+            host (str): The interface to listen on. Defaults to the loopback interface.
+            port (int): The port to listen on; 0 picks a free port.
+        """
+        self.__server = ThreadingHTTPServer((host, port), _QueryRequestHandler)
+        self.__server.daemon_threads = True
+        self.__server.query_service = self
+        self.__thread = None
+        self.__snapshot = None
+        self.__suspicious_rows = []
+        # Serializes publishers only; readers never take it
+        self.__publish_lock = threading.Lock()
+
+    @property
+    def address(self):
+        """
+        Gets the address the service listens on.
+
+        Returns:
+            tuple: The (host, port) pair.
+        """
+        return self.__server.server_address[:2]
+
+    @property
+    def snapshot(self):
+        """
+        Gets the snapshot currently served.
+
+        Returns:
+            ProcessorSnapshot: The snapshot, or None before the first publish.
+        """
+        return self.__snapshot
+
+    def publish(self, data_processor) -> ProcessorSnapshot:
+        """
+        Takes a snapshot of the results of a processor and starts serving it.
+
+        Call it from the thread that feeds the processor, between two batches of rows, so the
+        processor is not modified while it is copied.
+
+        Args:
+            data_processor (DataProcessor): The processor whose results are published.
+
+        Returns:
+            ProcessorSnapshot: The new snapshot.
+        """
+        with self.__publish_lock:
+            # Keyed by string, as the account numbers are looked up from the URL path; results restored
+            # from older state may still hold the numbers of a JSON input
+            account_summaries = {str(account_number): dict(summary,
+                                                           currency_balances=dict(summary.get("currency_balances", {})))
+                                 for account_number, summary in data_processor.account_summaries.items()}
+            transaction_statistics = {
+                transaction_type: dict(statistics,
+                                       average_amount=data_processor.get_average_transaction_amount(transaction_type))
+                for transaction_type, statistics in data_processor.transaction_statistics.items()}
+
+            suspicious_transactions = data_processor.suspicious_transactions
+            if len(suspicious_transactions) < len(self.__suspicious_rows):
+                # Another processor: older snapshots keep the previous list
+                self.__suspicious_rows = []
+            # Only the transactions flagged since the previous publish are converted
+            self.__suspicious_rows.extend(
+                transaction.to_row() if isinstance(transaction, Transaction) else dict(transaction)
+                for transaction in suspicious_transactions[len(self.__suspicious_rows):])
+
+            version = self.__snapshot.version + 1 if self.__snapshot else 1
+            snapshot = ProcessorSnapshot(version, data_processor.counters["rows_processed"], account_summaries,
+                                         transaction_statistics, self.__suspicious_rows, len(self.__suspicious_rows))
+            self.__snapshot = snapshot
+        return snapshot
+
+    def start(self) -> None:
+        """
+        Starts serving requests in a background thread.
+        """
+        # A short poll interval lets stop() return promptly
+        self.__thread = threading.Thread(target=self.__server.serve_forever, kwargs={"poll_interval": 0.1},
+                                         name='query-service', daemon=True)
+        self.__thread.start()
+        logger.info("Query service listening on http://%s:%d", *self.address)
+
+    def stop(self) -> None:
+        """
+        Stops serving requests and releases the port.
+        """
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
+
+    def __enter__(self) -> "QueryService":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def handle_query(self, path: str, query: dict) -> tuple:
+        """
+        Answers one query from the current snapshot.
+
+        Args:
+            path (str): The decoded request path, e.g. '/accounts/1001'.
+            query (dict): The query string parameters, as returned by urllib.parse.parse_qs.
+
+        Returns:
+            tuple: The HTTP status and the JSON-serializable response body.
+        """
+        snapshot = self.__snapshot
+        if snapshot is None:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "No results have been published yet."}
+        parts = [part for part in path.split('/') if part]
+
+        if parts == ['health']:
+            return HTTPStatus.OK, {"snapshot_version": snapshot.version, "rows_processed": snapshot.rows_processed}
+        if parts == ['accounts']:
+            offset, limit = _page(query)
+            return HTTPStatus.OK, {"total": len(snapshot.account_summaries), "offset": offset, "limit": limit,
+                                   "items": snapshot.account_page(offset, limit)}
+        if len(parts) == 2 and parts[0] == 'accounts':
+            summary = snapshot.account_summaries.get(parts[1])
+            if summary is None:
+                return HTTPStatus.NOT_FOUND, {"error": f"Unknown account: {parts[1]}"}
+            return HTTPStatus.OK, summary
+        if parts == ['transaction-statistics']:
+            return HTTPStatus.OK, snapshot.transaction_statistics
+        if len(parts) == 3 and parts[0] == 'transaction-statistics' and parts[2] == 'average':
+            statistics = snapshot.transaction_statistics.get(parts[1])
+            if statistics is None:
+                return HTTPStatus.NOT_FOUND, {"error": f"Unknown transaction type: {parts[1]}"}
+            return HTTPStatus.OK, {"transaction_type": parts[1], "average_amount": statistics["average_amount"]}
+        if parts == ['suspicious-transactions']:
+            offset, limit = _page(query)
+            return HTTPStatus.OK, {"total": snapshot.suspicious_count, "offset": offset, "limit": limit,
+                                   "items": snapshot.suspicious_page(offset, limit)}
+        return HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {path}"}
+
+
+def _page(query: dict) -> tuple:
+    """
+    Reads the offset and limit query parameters.
+
+    Raises:
+        ValueError: If they are not integers, or out of range.
+    """
+    offset = int(query.get('offset', ['0'])[0])
+    limit = int(query.get('limit', [str(DEFAULT_PAGE_SIZE)])[0])
+    if offset < 0 or not 0 < limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"offset must be at least 0 and limit between 1 and {MAX_PAGE_SIZE}.")
+    return offset, limit
+
+
+class _QueryRequestHandler(BaseHTTPRequestHandler):
+    """
+    Turns GET requests into QueryService.handle_query calls and writes the JSON responses.
+    """
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        try:
+            status, body = self.server.query_service.handle_query(unquote(url.path), parse_qs(url.query))
+        except ValueError as error:
+            status, body = HTTPStatus.BAD_REQUEST, {"error": str(error)}
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        # Route access logs through logging instead of stderr
+        logger.debug("%s - %s", self.address_string(), format % args)
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from output_handler.account_store import AccountStore
+
+
+class TestAccountStore(unittest.TestCase):
+    """Tests for the SQLite account index."""
+
+    ACCOUNT_SUMMARIES = {'1001': {'account_number': '1001', 'balance': 50.5, 'total_deposits': 100.5, 'total_withdrawals': 50},
+                         1002: {'account_number': 1002, 'balance': 200, 'total_deposits': 200, 'total_withdrawals': 0}}
+
+    TRANSACTION_STATISTICS = {'deposit': {'total_amount': 300.5, 'transaction_count': 2},
+                              'withdrawal': {'total_amount': 50, 'transaction_count': 1}}
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = AccountStore(os.path.join(self.directory.name, 'accounts.db'))
+        self.store.load(self.ACCOUNT_SUMMARIES, self.TRANSACTION_STATISTICS, batch_size=1)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_get_account_summary(self):
+        self.assertEqual(self.store.get_account_summary(1001), {'account_number': '1001', 'balance': 50.5,
+                                                                'total_deposits': 100.5, 'total_withdrawals': 50.0})
+        self.assertEqual(self.store.get_account_summary('1002')['balance'], 200.0)
+        self.assertIsNone(self.store.get_account_summary('9999'))
+
+    def test_get_transaction_statistics(self):
+        statistics = self.store.get_transaction_statistics('deposit')
+        self.assertEqual(statistics['transaction_count'], 2)
+        self.assertEqual(statistics['average_amount'], 150.25)
+        self.assertIsNone(self.store.get_transaction_statistics('transfer'))
+
+    def test_reload_replaces_rows(self):
+        self.store.load({'1001': {'account_number': '1001', 'balance': 1, 'total_deposits': 1, 'total_withdrawals': 0}}, {})
+        self.assertEqual(self.store.get_account_summary('1001')['balance'], 1.0)
+        self.assertEqual(self.store.get_account_summary('1002')['balance'], 200.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
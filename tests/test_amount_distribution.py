@@ -0,0 +1,94 @@
+import bisect
+import json
+import random
+import statistics
+import unittest
+
+from data_processor.amount_distribution import AmountDistribution, TDigest
+
+
+class TestAmountDistribution(unittest.TestCase):
+
+    def setUp(self):
+        generator = random.Random(5)
+        self.amounts = [round(generator.lognormvariate(5, 1.2), 2) for _ in range(20000)]
+        self.sorted_amounts = sorted(self.amounts)
+
+    def rank_error(self, value, q):
+        return abs(bisect.bisect(self.sorted_amounts, value) / len(self.sorted_amounts) - q)
+
+    def test_exact_statistics(self):
+        distribution = AmountDistribution()
+        for amount in self.amounts:
+            distribution.add(amount)
+
+        self.assertEqual(distribution.count, len(self.amounts))
+        self.assertEqual(distribution.minimum, min(self.amounts))
+        self.assertEqual(distribution.maximum, max(self.amounts))
+        self.assertAlmostEqual(distribution.mean, statistics.fmean(self.amounts))
+        self.assertAlmostEqual(distribution.variance, statistics.pvariance(self.amounts), delta=1e-6)
+
+    def test_quantiles_are_accurate(self):
+        distribution = AmountDistribution()
+        distribution.add_many(self.amounts)
+
+        for q in (0.01, 0.5, 0.95, 0.99):
+            self.assertLess(self.rank_error(distribution.quantile(q), q), 0.005)
+        self.assertEqual(distribution.quantile(0), min(self.amounts))
+        self.assertEqual(distribution.quantile(1), max(self.amounts))
+
+    def test_batches_match_single_adds(self):
+        single = AmountDistribution()
+        for amount in self.amounts:
+            single.add(amount)
+        batched = AmountDistribution()
+        for start in range(0, len(self.amounts), 777):
+            batched.add_many(self.amounts[start:start + 777])
+
+        self.assertEqual(batched.to_dict(), single.to_dict())
+
+    def test_merged_shards_match_whole(self):
+        whole = AmountDistribution()
+        whole.add_many(self.amounts)
+        shards = [AmountDistribution() for _ in range(4)]
+        for index, shard in enumerate(shards):
+            shard.add_many(self.amounts[index * 5000:(index + 1) * 5000])
+        merged = AmountDistribution().merge(shards[0]).merge(shards[1]).merge(shards[2]).merge(shards[3])
+
+        self.assertEqual(merged.count, whole.count)
+        self.assertEqual((merged.minimum, merged.maximum), (whole.minimum, whole.maximum))
+        self.assertAlmostEqual(merged.mean, whole.mean)
+        self.assertAlmostEqual(merged.variance, whole.variance, delta=1e-6)
+        for q in (0.5, 0.95, 0.99):
+            self.assertLess(self.rank_error(merged.quantile(q), q), 0.005)
+
+    def test_memory_is_bounded(self):
+        digest = TDigest(compression=100)
+        digest.add_many(self.amounts * 5)
+
+        self.assertLess(digest.centroid_count, 100)
+
+    def test_round_trip_through_json(self):
+        distribution = AmountDistribution()
+        distribution.add_many(self.amounts[:1234])
+        restored = AmountDistribution.from_dict(json.loads(json.dumps(distribution.to_dict())))
+        restored.add_many(self.amounts[1234:])
+        distribution.add_many(self.amounts[1234:])
+
+        self.assertEqual(restored.to_dict(), distribution.to_dict())
+
+    def test_summary(self):
+        distribution = AmountDistribution()
+        self.assertEqual(distribution.summary(), {"count": 0, "min": None, "max": None, "mean": None,
+                                                  "std_dev": None, "p50": None, "p95": None, "p99": None})
+        distribution.add(10.0)
+        self.assertEqual(distribution.summary((0.5,)), {"count": 1, "min": 10.0, "max": 10.0, "mean": 10.0,
+                                                        "std_dev": 0.0, "p50": 10.0})
+
+    def test_invalid_quantile(self):
+        with self.assertRaises(ValueError):
+            AmountDistribution().quantile(1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
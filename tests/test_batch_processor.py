@@ -0,0 +1,76 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from data_processor.batch_processor import discover_input_files, process_directory
+from data_processor.data_processor import DataProcessor
+
+
+class TestBatchProcessor(unittest.TestCase):
+    """Tests for the asyncio driver that processes a directory of input files."""
+
+    HEADER = "Transaction ID,Account number,Date,Transaction type,Amount,Currency,Description\n"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.rows = []
+        for branch in range(4):
+            rows = [{"Transaction ID": str(branch * 10 + index), "Account number": str(1000 + index),
+                     "Date": "2023-03-01", "Transaction type": "deposit", "Amount": str(100 * (branch + 1)),
+                     "Currency": "XRP" if index == 0 else "CAD", "Description": "Branch deposit"} for index in range(3)]
+            self.rows.extend(rows)
+            if branch % 2:
+                with open(os.path.join(self.directory.name, f'branch_{branch}.json'), 'w') as json_file:
+                    json.dump(rows, json_file)
+            else:
+                with open(os.path.join(self.directory.name, f'branch_{branch}.csv'), 'w') as csv_file:
+                    csv_file.write(self.HEADER + ''.join(','.join(row.values()) + '\n' for row in rows))
+        with open(os.path.join(self.directory.name, 'notes.txt'), 'w') as other_file:
+            other_file.write('not an input file')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_discover_input_files(self):
+        names = [os.path.basename(path) for path in discover_input_files(self.directory.name)]
+        self.assertEqual(names, ['branch_0.csv', 'branch_1.json', 'branch_2.csv', 'branch_3.json'])
+
+    def test_compressed_files_are_processed(self):
+        with gzip.open(os.path.join(self.directory.name, 'branch_4.csv.gz'), 'wt') as compressed_file:
+            compressed_file.write(self.HEADER + "99,1001,2023-03-01,deposit,1,CAD,Archived\n")
+        self.assertEqual(os.path.basename(discover_input_files(self.directory.name)[-1]), 'branch_4.csv.gz')
+        merged = process_directory(self.directory.name, workers=2)
+        self.assertEqual(merged.account_summaries["1001"]["balance"], 1001.0)
+
+    def test_ndjson_files_are_processed(self):
+        with open(os.path.join(self.directory.name, 'branch_4.jsonl'), 'w') as ndjson_file:
+            ndjson_file.write(json.dumps(dict(self.rows[1], **{"Transaction ID": "99", "Amount": "1"})) + '\n')
+        self.assertEqual(os.path.basename(discover_input_files(self.directory.name)[-1]), 'branch_4.jsonl')
+        merged = process_directory(self.directory.name, workers=2)
+        self.assertEqual(merged.account_summaries["1001"]["balance"], 1001.0)
+
+    def test_json_account_numbers_merge_with_csv_ones(self):
+        # JSON inputs usually hold the account numbers as numbers, e.g. the repository's sample input
+        with open(os.path.join(self.directory.name, 'branch_4.json'), 'w') as json_file:
+            json.dump([dict(self.rows[1], **{"Transaction ID": 99, "Account number": 1001, "Amount": 1})], json_file)
+        merged = process_directory(self.directory.name, workers=2)
+        self.assertEqual(sorted(merged.account_summaries), ["1000", "1001", "1002"])
+        self.assertEqual(merged.account_summaries["1001"]["balance"], 1001.0)
+
+    def test_results_match_processing_all_rows_at_once(self):
+        expected = DataProcessor(self.rows).process_data()
+        merged = process_directory(self.directory.name, workers=2)
+        self.assertEqual(merged.account_summaries, expected["account_summaries"])
+        self.assertEqual(merged.transaction_statistics, expected["transaction_statistics"])
+        self.assertEqual([transaction["Transaction ID"] for transaction in merged.suspicious_transactions],
+                         ["0", "10", "20", "30"])
+
+    def test_empty_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            merged = process_directory(directory)
+        self.assertEqual(merged.account_summaries, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from benchmark.benchmark import STAGES, benchmark, compare, format_results
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_benchmark_measures_every_stage(self):
+        results = benchmark(300, 'csv', seed=2)
+
+        self.assertEqual(results['rows'], 300)
+        self.assertEqual(list(results['stages']), list(STAGES))
+        for name in ('input', 'processing', 'end_to_end'):
+            self.assertEqual(results['stages'][name]['rows'], 300)
+        for stage in results['stages'].values():
+            self.assertGreater(stage['rows_per_second'], 0)
+            self.assertGreater(stage['peak_memory_bytes'], 0)
+        self.assertIn('end_to_end', format_results(results))
+
+    def test_benchmark_without_memory_measurement(self):
+        results = benchmark(100, 'json', measure_memory=False)
+
+        self.assertIsNone(results['stages']['input']['peak_memory_bytes'])
+
+    def test_compare_reports_ratios(self):
+        stage = {'rows': 10, 'seconds': 1.0, 'rows_per_second': 10.0, 'peak_memory_bytes': 100}
+        baseline = {'stages': {'input': stage}}
+        results = {'stages': {'input': dict(stage, rows_per_second=20.0, peak_memory_bytes=50),
+                              'output': stage}}
+
+        self.assertEqual(compare(results, baseline),
+                         {'input': {'throughput_ratio': 2.0, 'memory_ratio': 0.5}})
+
+    def test_unsupported_format_raises(self):
+        with self.assertRaises(ValueError):
+            benchmark(10, 'xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
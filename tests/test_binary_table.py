@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from output_handler.binary_table import BinaryTableReader, FIXED_BYTES, FLOAT64, write_binary_table
+from output_handler.output_handler import OutputHandler
+
+
+class TestBinaryTable(unittest.TestCase):
+    """Tests for the binary columnar output format and its memory-mapped reader."""
+
+    ACCOUNT_SUMMARIES = {'1002': {'account_number': '1002', 'balance': 200.1, 'total_deposits': 200.1, 'total_withdrawals': 0},
+                         '1001': {'account_number': '1001', 'balance': 0.1 + 0.2, 'total_deposits': 100, 'total_withdrawals': 50},
+                         '999': {'account_number': '999', 'balance': -5.0, 'total_deposits': 0, 'total_withdrawals': 5.0}}
+
+    TRANSACTION_STATISTICS = {'deposit': {'total_amount': 300.5, 'transaction_count': 2},
+                              'withdrawal': {'total_amount': 55.0, 'transaction_count': 2}}
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_handler = OutputHandler(self.ACCOUNT_SUMMARIES, [], self.TRANSACTION_STATISTICS)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_account_lookup_by_binary_search(self):
+        file_path = os.path.join(self.directory.name, 'summaries.bin')
+        self.output_handler.write_account_summaries_to_binary(file_path)
+        with BinaryTableReader(file_path) as reader:
+            self.assertEqual(reader.row_count, 3)
+            self.assertEqual(reader.lookup('1001'), {'account_number': '1001', 'balance': 0.1 + 0.2,
+                                                     'total_deposits': 100.0, 'total_withdrawals': 50.0})
+            self.assertEqual(reader.lookup(999)['balance'], -5.0)
+            self.assertIsNone(reader.lookup('1003'))
+
+    def test_numeric_columns_are_memoryviews(self):
+        file_path = os.path.join(self.directory.name, 'statistics.bin')
+        self.output_handler.write_transaction_statistics_to_binary(file_path)
+        with BinaryTableReader(file_path) as reader:
+            counts = reader.column('transaction_count')
+            self.assertIsInstance(counts, memoryview)
+            self.assertEqual(counts.tolist(), [2, 2])
+            self.assertEqual(list(reader.column('transaction_type')), ['deposit', 'withdrawal'])
+            counts.release()
+
+    def test_empty_table(self):
+        file_path = os.path.join(self.directory.name, 'empty.bin')
+        write_binary_table(file_path, [('key', FIXED_BYTES, []), ('value', FLOAT64, [])], key_column='key')
+        with BinaryTableReader(file_path) as reader:
+            self.assertEqual(reader.row_count, 0)
+            self.assertIsNone(reader.lookup('1'))
+
+    def test_rejects_other_files(self):
+        file_path = os.path.join(self.directory.name, 'other.bin')
+        with open(file_path, 'wb') as other_file:
+            other_file.write(b'Account number,Balance\n')
+        with self.assertRaises(ValueError):
+            BinaryTableReader(file_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
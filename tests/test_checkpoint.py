@@ -0,0 +1,154 @@
+import json
+import os
+import tempfile
+import unittest
+from data_processor.checkpoint import load_checkpoint, process_incrementally
+from data_processor.data_processor import DataProcessor
+from data_processor.deduplicator import TransactionDeduplicator
+from input_handler.input_handler import InputHandler
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Tests for checkpointed incremental processing."""
+
+    HEADER = "Transaction ID,Account number,Date,Transaction type,Amount,Currency,Description\n"
+    FIRST_ROWS = ("1,1001,2023-03-01,deposit,1000,CAD,Salary\n"
+                  "2,1002,2023-03-01,deposit,1500,XRP,Crypto\n")
+    NEW_ROWS = ("3,1001,2023-03-02,withdrawal,200,CAD,Groceries\n"
+                "4,1003,2023-03-02,deposit,20000,CAD,Car Sale\n")
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.directory.name, 'input.csv')
+        self.checkpoint_path = os.path.join(self.directory.name, 'checkpoint.json')
+        with open(self.input_path, 'w') as input_file:
+            input_file.write(self.HEADER + self.FIRST_ROWS)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def append(self, text):
+        with open(self.input_path, 'a') as input_file:
+            input_file.write(text)
+
+    def test_resume_keeps_rollups(self):
+        process_incrementally(self.input_path, self.checkpoint_path, processor_options={"rollups": True})
+        self.append(self.NEW_ROWS)
+        resumed = process_incrementally(self.input_path, self.checkpoint_path, processor_options={"rollups": True})
+        self.assertEqual(resumed.rollups.monthly(), {
+            ("2023-03", "deposit"): {"total_amount": 22500.0, "transaction_count": 3},
+            ("2023-03", "withdrawal"): {"total_amount": 200.0, "transaction_count": 1}
+        })
+
+    def test_resume_only_processes_new_rows(self):
+        process_incrementally(self.input_path, self.checkpoint_path, processor_options={"amount_statistics": True})
+        self.append(self.NEW_ROWS)
+        resumed = process_incrementally(self.input_path, self.checkpoint_path,
+                                        processor_options={"amount_statistics": True})
+        expected = DataProcessor(InputHandler(self.input_path).iter_records()).process_data()
+        self.assertEqual(resumed.account_summaries, expected["account_summaries"])
+        self.assertEqual(resumed.transaction_statistics, expected["transaction_statistics"])
+        self.assertEqual(resumed.suspicious_transactions, expected["suspicious_transactions"])
+        self.assertEqual(resumed.get_amount_statistics()["currency"]["CAD"]["count"], 3)
+        self.assertEqual(resumed.get_amount_statistics()["transaction_type"]["deposit"]["max"], 20000.0)
+        _, inputs = load_checkpoint(self.checkpoint_path)
+        self.assertEqual(inputs[os.path.abspath(self.input_path)],
+                         {"offset": os.path.getsize(self.input_path), "last_transaction_id": "4"})
+
+    def test_partial_trailing_line_is_left_for_next_run(self):
+        self.append("3,1001,2023-03-02,withdrawal,2")
+        data_processor = process_incrementally(self.input_path, self.checkpoint_path)
+        self.assertEqual(data_processor.transaction_statistics["deposit"]["transaction_count"], 2)
+        self.assertNotIn("withdrawal", data_processor.transaction_statistics)
+        self.append("00,CAD,Groceries\n")
+        data_processor = process_incrementally(self.input_path, self.checkpoint_path)
+        self.assertEqual(data_processor.transaction_statistics["withdrawal"]["total_amount"], 200.0)
+
+    def test_no_new_rows_keeps_state(self):
+        process_incrementally(self.input_path, self.checkpoint_path)
+        data_processor = process_incrementally(self.input_path, self.checkpoint_path)
+        self.assertEqual(data_processor.account_summaries["1001"]["balance"], 1000.0)
+        self.assertEqual(len(data_processor.suspicious_transactions), 1)
+
+    def test_seen_ids_are_committed_with_the_checkpoint(self):
+        db_path = os.path.join(self.directory.name, 'seen.db')
+        deduplicator = TransactionDeduplicator(db_path, capacity=1000)
+        process_incrementally(self.input_path, self.checkpoint_path, processor_options={"deduplicator": deduplicator})
+        deduplicator.close()
+        # Rows 1 and 2 are resent: they are skipped, and the checkpointed results still count them once
+        self.append(self.FIRST_ROWS + self.NEW_ROWS)
+        with TransactionDeduplicator(db_path, capacity=1000) as deduplicator:
+            data_processor = process_incrementally(self.input_path, self.checkpoint_path,
+                                                   processor_options={"deduplicator": deduplicator})
+        self.assertEqual(data_processor.account_summaries["1002"]["balance"], 1500.0)
+        self.assertEqual(data_processor.counters["rows_processed"], 4)
+
+    def test_overlapping_file_under_new_name_is_merged(self):
+        db_path = os.path.join(self.directory.name, 'seen.db')
+        with TransactionDeduplicator(db_path, capacity=1000) as deduplicator:
+            process_incrementally(self.input_path, self.checkpoint_path,
+                                  processor_options={"deduplicator": deduplicator})
+        resent_path = os.path.join(self.directory.name, 'resent.csv')
+        with open(resent_path, 'w') as resent_file:
+            resent_file.write(self.HEADER + self.FIRST_ROWS + self.NEW_ROWS)
+        with TransactionDeduplicator(db_path, capacity=1000) as deduplicator:
+            data_processor = process_incrementally(resent_path, self.checkpoint_path,
+                                                   processor_options={"deduplicator": deduplicator})
+        self.assertEqual(data_processor.account_summaries["1001"]["balance"], 800.0)
+        self.assertEqual(data_processor.account_summaries["1002"]["balance"], 1500.0)
+        self.assertEqual(data_processor.counters["rows_processed"], 4)
+        _, inputs = load_checkpoint(self.checkpoint_path)
+        self.assertEqual(set(inputs), {os.path.abspath(self.input_path), os.path.abspath(resent_path)})
+
+    def test_shorter_file_keeps_results_with_deduplicator(self):
+        db_path = os.path.join(self.directory.name, 'seen.db')
+        self.append(self.NEW_ROWS)
+        with TransactionDeduplicator(db_path, capacity=1000) as deduplicator:
+            process_incrementally(self.input_path, self.checkpoint_path,
+                                  processor_options={"deduplicator": deduplicator})
+        with open(self.input_path, 'w') as input_file:
+            input_file.write(self.HEADER + self.FIRST_ROWS)
+        with TransactionDeduplicator(db_path, capacity=1000) as deduplicator:
+            data_processor = process_incrementally(self.input_path, self.checkpoint_path,
+                                                   processor_options={"deduplicator": deduplicator})
+        self.assertEqual(data_processor.account_summaries["1003"]["balance"], 20000.0)
+        self.assertEqual(data_processor.counters["rows_processed"], 4)
+
+    def test_shorter_file_resets_results_of_a_single_input(self):
+        self.append(self.NEW_ROWS)
+        process_incrementally(self.input_path, self.checkpoint_path)
+        with open(self.input_path, 'w') as input_file:
+            input_file.write(self.HEADER + self.FIRST_ROWS)
+        data_processor = process_incrementally(self.input_path, self.checkpoint_path)
+        self.assertNotIn("1003", data_processor.account_summaries)
+        self.assertEqual(data_processor.counters["rows_processed"], 2)
+
+    def test_shorter_file_among_several_inputs_is_rejected(self):
+        other_path = os.path.join(self.directory.name, 'other.csv')
+        with open(other_path, 'w') as other_file:
+            other_file.write(self.HEADER + self.NEW_ROWS)
+        process_incrementally(self.input_path, self.checkpoint_path)
+        process_incrementally(other_path, self.checkpoint_path)
+        with open(self.input_path, 'w') as input_file:
+            input_file.write(self.HEADER)
+        with self.assertRaises(ValueError):
+            process_incrementally(self.input_path, self.checkpoint_path)
+
+    def test_version_1_checkpoint_is_loaded(self):
+        process_incrementally(self.input_path, self.checkpoint_path)
+        with open(self.checkpoint_path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        position = checkpoint.pop("inputs")[os.path.abspath(self.input_path)]
+        checkpoint.update(version=1, input_file=os.path.abspath(self.input_path), **position)
+        with open(self.checkpoint_path, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        self.append(self.NEW_ROWS)
+        data_processor = process_incrementally(self.input_path, self.checkpoint_path)
+        self.assertEqual(data_processor.counters["rows_processed"], 4)
+
+    def test_missing_checkpoint(self):
+        self.assertEqual(load_checkpoint(self.checkpoint_path), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import random
+import tempfile
+import unittest
+from data_processor.data_processor import DataProcessor
+from data_processor.deduplicator import TransactionDeduplicator
+from data_processor.fx_rates import FXRateTable
+from data_processor.rule_engine import SuspiciousRuleEngine
+
+try:
+    import numpy
+    from data_processor.columnar_processor import ColumnarDataProcessor
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "NumPy is not installed")
+class TestColumnarDataProcessor(unittest.TestCase):
+    """Tests that the columnar engine produces the same results as DataProcessor."""
+
+    @staticmethod
+    def make_rows(count):
+        generator = random.Random(7)
+        return [{"Transaction ID": str(index), "Account number": str(1000 + generator.randrange(50)),
+                 "Date": "2023-03-01", "Transaction type": generator.choice(["deposit", "withdrawal", "transfer"]),
+                 "Amount": f"{generator.uniform(1, 15000):.2f}", "Currency": generator.choice(["CAD", "USD", "XRP", "LTC"]),
+                 "Description": "Generated"} for index in range(count)]
+
+    def test_results_match_row_processor(self):
+        rows = self.make_rows(5000)
+        expected = DataProcessor(rows).process_data()
+        actual = ColumnarDataProcessor(iter(rows), batch_size=333).process_data()
+        self.assertEqual(actual, expected)
+        self.assertEqual(list(actual["account_summaries"]), list(expected["account_summaries"]))
+
+    def test_untouched_totals_stay_integers(self):
+        rows = self.make_rows(200) + [{"Transaction ID": "t", "Account number": "9999", "Date": "2023-03-01",
+                                       "Transaction type": "transfer", "Amount": "10", "Currency": "CAD",
+                                       "Description": "Transfer only"}]
+        expected = DataProcessor(rows).process_data()
+        actual = ColumnarDataProcessor(rows, batch_size=64).process_data()
+        # The CSV writer formats 0 and 0.0 differently, so the types must match too
+        self.assertEqual({account: [repr(value) for value in summary.values()]
+                          for account, summary in actual["account_summaries"].items()},
+                         {account: [repr(value) for value in summary.values()]
+                          for account, summary in expected["account_summaries"].items()})
+        self.assertEqual(repr(actual["account_summaries"]["9999"]["balance"]), '0')
+
+    def test_numeric_account_numbers_become_strings(self):
+        rows = [dict(row, **{"Account number": int(row["Account number"])}) for row in self.make_rows(300)]
+        expected = DataProcessor(rows).process_data()
+        actual = ColumnarDataProcessor(rows, batch_size=100).process_data()
+        self.assertEqual(actual["account_summaries"], expected["account_summaries"])
+        self.assertTrue(all(isinstance(account, str) for account in actual["account_summaries"]))
+
+    def test_currency_balances_match_row_processor(self):
+        rows = self.make_rows(3000)
+        for index, row in enumerate(rows):
+            row["Date"] = f"2023-03-{index % 28 + 1:02d}"
+        fx_rates = FXRateTable({("USD", "2023-03-01"): 1.35, ("USD", "2023-03-15"): 1.31,
+                                ("XRP", "2023-03-01"): 0.5, ("LTC", "2023-03-01"): 95.0})
+        expected = DataProcessor(rows, fx_rates=fx_rates).process_data()
+        actual = ColumnarDataProcessor(rows, batch_size=400, fx_rates=fx_rates).process_data()
+        self.assertEqual(actual["account_summaries"], expected["account_summaries"])
+        summary = next(iter(actual["account_summaries"].values()))
+        self.assertIn("normalized_balance", summary)
+        self.assertAlmostEqual(sum(summary["currency_balances"].values()), summary["balance"])
+
+    def test_duplicates_are_skipped_like_row_processor(self):
+        rows = self.make_rows(1000)
+        resent = rows + rows[:300]
+        with tempfile.TemporaryDirectory() as directory:
+            with TransactionDeduplicator(os.path.join(directory, 'row.db')) as deduplicator:
+                expected = DataProcessor(resent, deduplicator=deduplicator).process_data()
+            with TransactionDeduplicator(os.path.join(directory, 'columnar.db')) as deduplicator:
+                actual = ColumnarDataProcessor(resent, batch_size=128, deduplicator=deduplicator).process_data()
+        self.assertEqual(actual["account_summaries"], expected["account_summaries"])
+        self.assertEqual(actual["account_summaries"], DataProcessor(rows).process_data()["account_summaries"])
+
+    def test_amount_statistics_match_row_processor(self):
+        rows = self.make_rows(3000)
+        expected = DataProcessor(rows, amount_statistics=True)
+        expected.process_data()
+        actual = ColumnarDataProcessor(rows, batch_size=250, amount_statistics=True)
+        actual.process_data()
+        for dimension in ("transaction_type", "currency"):
+            self.assertEqual({key: distribution.to_dict() for key, distribution in actual.amount_statistics[dimension].items()},
+                             {key: distribution.to_dict() for key, distribution in expected.amount_statistics[dimension].items()})
+
+    def test_amount_statistics_are_opt_in(self):
+        processor = ColumnarDataProcessor(self.make_rows(100), batch_size=32)
+        processor.process_data()
+        self.assertIsNone(processor.amount_statistics)
+
+    def test_configured_rules_match_row_processor(self):
+        rows = self.make_rows(2000)
+        rule_engine = SuspiciousRuleEngine({"large_transaction_threshold": 12000, "currency_thresholds": {"USD": 9000},
+                                            "transaction_type_limits": {"withdrawal": 8000},
+                                            "keyword_rules": {"generated": ["generated"]}})
+        expected = DataProcessor(rows, rule_engine=rule_engine)
+        expected.process_data()
+        actual = ColumnarDataProcessor(rows, batch_size=500, rule_engine=rule_engine)
+        actual.process_data()
+        self.assertEqual(actual.suspicious_transactions, expected.suspicious_transactions)
+        self.assertEqual(actual.suspicious_transaction_rules, expected.suspicious_transaction_rules)
+        self.assertEqual(actual.counters, expected.counters)
+
+    def test_suspicious_transactions_keep_input_order(self):
+        rows = self.make_rows(200)
+        result = ColumnarDataProcessor(rows, batch_size=64).process_data()
+        identifiers = [transaction["Transaction ID"] for transaction in result["suspicious_transactions"]]
+        self.assertEqual(identifiers, sorted(identifiers, key=int))
+
+    def test_empty_input(self):
+        result = ColumnarDataProcessor([]).process_data()
+        self.assertEqual(result, {"account_summaries": {}, "suspicious_transactions": [],
+                                  "transaction_statistics": {}})
+
+    def test_invalid_batch_size(self):
+        with self.assertRaises(ValueError):
+            ColumnarDataProcessor([], batch_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
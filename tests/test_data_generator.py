@@ -0,0 +1,59 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from data_generator.data_generator import COLUMNS, CURRENCIES, TRANSACTION_TYPES, TransactionGenerator
+from input_handler.input_handler import InputHandler
+
+
+class TestTransactionGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_same_seed_generates_same_rows(self):
+        rows = list(TransactionGenerator(seed=7).iter_rows(500, batch_size=64))
+        self.assertEqual(rows, list(TransactionGenerator(seed=7).iter_rows(500, batch_size=64)))
+        self.assertNotEqual(rows, list(TransactionGenerator(seed=8).iter_rows(500, batch_size=64)))
+
+    def test_rows_are_realistic(self):
+        rows = list(TransactionGenerator(seed=1, account_count=1000, large_amount_share=0.05).iter_rows(5000))
+        self.assertEqual(len(rows), 5000)
+        self.assertEqual([row['Transaction ID'] for row in rows[:3]], ['1', '2', '3'])
+        self.assertEqual(list(rows[0]), COLUMNS)
+        self.assertTrue({row['Currency'] for row in rows} <= set(CURRENCIES))
+        self.assertTrue({row['Transaction type'] for row in rows} <= set(TRANSACTION_TYPES))
+        self.assertEqual([row['Date'] for row in rows], sorted(row['Date'] for row in rows))
+        # Skewed activity: the busiest account makes far more than its uniform share of transactions
+        busiest = Counter(row['Account number'] for row in rows).most_common(1)[0][1]
+        self.assertGreater(busiest, 50)
+        large = sum(1 for row in rows if float(row['Amount']) > 10000)
+        self.assertTrue(150 < large < 350)
+
+    def test_written_csv_and_json_files_read_back(self):
+        generator = TransactionGenerator(seed=3)
+        csv_path = os.path.join(self.temp_dir.name, 'input.csv')
+        json_path = os.path.join(self.temp_dir.name, 'input.json')
+        generator.write_csv(csv_path, 250)
+        generator.write_json(json_path, 250)
+
+        expected = list(generator.iter_rows(250))
+        with open(csv_path, newline='') as csv_file:
+            self.assertEqual(list(csv.DictReader(csv_file)), expected)
+        with open(json_path) as json_file:
+            self.assertEqual(json.load(json_file), expected)
+        self.assertEqual(list(InputHandler(json_path).iter_records()), expected)
+
+    def test_invalid_account_count_raises(self):
+        with self.assertRaises(ValueError):
+            TransactionGenerator(account_count=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -128,6 +128,56 @@ class TestDataProcessor(unittest.TestCase):
         self.assertEqual(expected_average_deposit, average_deposit)
         self.assertEqual(expected_average_withdrawal, average_withdrawal)
 
+    # process_data: Test to verify that rows are parsed once into records and aggregated correctly.
+    def test_process_data_with_parsed_records(self):
+        data_processor = DataProcessor(iter(self.INPUT_DATA))
+        result = data_processor.process_data()
+        self.assertEqual(result["account_summaries"]["1001"]["balance"], 1000.0)
+        self.assertEqual(result["transaction_statistics"]["deposit"]["total_amount"], 2500.0)
+        self.assertEqual(result["suspicious_transactions"], [])
+
+    # merge: Test to verify that partial results are combined into the results of the whole input.
+    def test_merge_partial_results(self):
+        first = DataProcessor(self.INPUT_DATA[:1], amount_statistics=True)
+        first.process_data()
+        second = DataProcessor(self.INPUT_DATA[1:] + [
+            {"Transaction ID": "3", "Account number": "1001", "Date": "2023-03-02", "Transaction type": "withdrawal",
+             "Amount": "200", "Currency": "XRP", "Description": "Crypto"}], amount_statistics=True)
+        second.process_data()
+        merged = DataProcessor.from_results({"account_summaries": {}, "suspicious_transactions": [],
+                                             "transaction_statistics": {}}).merge(first).merge(second)
+        self.assertEqual(merged.account_summaries["1001"]["balance"], 800.0)
+        self.assertEqual(merged.account_summaries["1002"]["total_deposits"], 1500.0)
+        self.assertEqual(merged.transaction_statistics["deposit"]["transaction_count"], 2)
+        self.assertEqual(len(merged.suspicious_transactions), 1)
+        # The merged processor must not share summaries with the merged ones
+        self.assertIsNot(merged.account_summaries["1002"], second.account_summaries["1002"])
+        self.assertIsNot(merged.account_summaries["1002"]["currency_balances"],
+                         second.account_summaries["1002"]["currency_balances"])
+        self.assertEqual(merged.account_summaries["1001"]["currency_balances"], {"CAD": 1000.0, "XRP": -200.0})
+        amount_statistics = merged.get_amount_statistics()
+        self.assertEqual(amount_statistics["transaction_type"]["deposit"]["count"], 2)
+        self.assertEqual(amount_statistics["currency"]["XRP"]["max"], 200.0)
+
+    # get_amount_statistics: Test to verify the amount distributions per transaction type and currency.
+    def test_get_amount_statistics(self):
+        data_processor = DataProcessor(self.INPUT_DATA, amount_statistics=True)
+        data_processor.process_data()
+        amount_statistics = data_processor.get_amount_statistics(quantiles=(0.5,))
+        deposits = amount_statistics["transaction_type"]["deposit"]
+        self.assertEqual((deposits["count"], deposits["min"], deposits["max"]), (2, 1000.0, 1500.0))
+        self.assertEqual(deposits["mean"], 1250.0)
+        self.assertEqual(deposits["std_dev"], 250.0)
+        self.assertEqual(deposits["p50"], 1250.0)
+        self.assertEqual(list(amount_statistics["currency"]), ["CAD"])
+
+    # get_amount_statistics: Test to verify the amount distributions are only kept when enabled.
+    def test_amount_statistics_are_opt_in(self):
+        data_processor = DataProcessor(self.INPUT_DATA)
+        data_processor.process_data()
+        self.assertIsNone(data_processor.amount_statistics)
+        self.assertEqual(data_processor.get_amount_statistics(), {})
+
         # New test to verify logging behavior
     def test_process_data_logs_info(self):
         # Prepare the input data for this specific test
@@ -147,7 +197,53 @@ class TestDataProcessor(unittest.TestCase):
         # Verify that "Data Processing Complete" is logged
         self.assertTrue(any("Data Processing Complete" in message for message in log.output),
                         "Data Processing Complete message not found in logs.") 
-        
+
+
+    # Test to verify that per-row progress is aggregated into counters rather than logged row by row.
+    def test_process_data_counts_rows_and_suspicious_reasons(self):
+        test_input_data = [
+            {"Transaction ID": "1", "Account number": "1001", "Date": "2023-03-01",
+             "Transaction type": "deposit", "Amount": "20000", "Currency": "XRP", "Description": "Crypto"},
+            {"Transaction ID": "2", "Account number": "1002", "Date": "2023-03-01",
+             "Transaction type": "deposit", "Amount": "50", "Currency": "CAD", "Description": "Salary"},
+            {"Transaction ID": "3", "Account number": "1002", "Date": "2023-03-02",
+             "Transaction type": "withdrawal", "Amount": "12000", "Currency": "CAD", "Description": "Car"}
+        ]
+        data_processor = DataProcessor(test_input_data, log_interval=2)
+        with self.assertLogs(level='INFO') as log:
+            data_processor.process_data()
+        self.assertEqual(data_processor.counters["rows_processed"], 3)
+        self.assertEqual(data_processor.counters["suspicious_transactions"], 2)
+        self.assertEqual(data_processor.counters["suspicious_reasons"],
+                         {"large_transaction": 2, "uncommon_currency": 1})
+        progress_messages = [message for message in log.output if "Processed" in message]
+        self.assertEqual(len(progress_messages), 2)
+        self.assertFalse(any("Account summary updated" in message for message in log.output))
+
+    # Test to verify that a suspicious sink receives flagged transactions instead of the list.
+    def test_suspicious_sink_receives_flagged_transactions(self):
+        flagged = []
+        large_transaction = {"Transaction ID": "11", "Account number": "1001", "Date": "2023-03-13",
+                             "Transaction type": "deposit", "Amount": "12000", "Currency": "CAD",
+                             "Description": "Car Sale"}
+        data_processor = DataProcessor(self.INPUT_DATA + [large_transaction],
+                                       suspicious_sink=lambda transaction, rules: flagged.append((transaction, rules)))
+        data_processor.process_data()
+        self.assertEqual(data_processor.suspicious_transactions, [])
+        self.assertEqual(len(flagged), 1)
+        self.assertEqual(flagged[0][0]["Transaction ID"], "11")
+        self.assertEqual(flagged[0][1], ["large_transaction"])
+        self.assertEqual(data_processor.counters["suspicious_transactions"], 1)
+
+    # Test to verify that suspicious transactions are kept as the rows that were passed in.
+    def test_suspicious_transactions_keep_input_rows(self):
+        large_transaction = {"Transaction ID": "11", "Account number": "1001", "Date": "2023-03-13",
+                             "Transaction type": "deposit", "Amount": "12000", "Currency": "CAD",
+                             "Description": "Car Sale"}
+        data_processor = DataProcessor(self.INPUT_DATA + [large_transaction])
+        data_processor.process_data()
+        self.assertIs(data_processor.suspicious_transactions[0], large_transaction)
+        self.assertEqual(data_processor.account_summaries["1001"]["balance"], 13000.0)
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+
+from data_processor.data_processor import DataProcessor
+from data_processor.deduplicator import BloomFilter, TransactionDeduplicator
+
+
+def make_row(transaction_id, amount=100):
+    return {"Transaction ID": str(transaction_id), "Account number": "1001", "Date": "2023-03-01",
+            "Transaction type": "deposit", "Amount": str(amount), "Currency": "CAD", "Description": "Test"}
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom_filter = BloomFilter(10000, 0.01)
+        for item in range(10000):
+            bloom_filter.add(f"id-{item}")
+        self.assertTrue(all(f"id-{item}" in bloom_filter for item in range(10000)))
+        false_positives = sum(f"other-{item}" in bloom_filter for item in range(10000))
+        self.assertLess(false_positives, 250)
+        self.assertLess(bloom_filter.size_in_bytes, 12500)
+
+    def test_save_and_load(self):
+        bloom_filter = BloomFilter(100)
+        self.assertFalse(bloom_filter.add("a"))
+        self.assertTrue(bloom_filter.add("a"))
+        bloom_filter.metadata["seen_count"] = 1
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ids.bloom')
+            bloom_filter.save(path)
+            loaded = BloomFilter.load(path)
+            with open(path, 'ab') as filter_file:
+                filter_file.write(b'x')
+            with self.assertRaises(ValueError):
+                BloomFilter.load(path)
+        self.assertIn("a", loaded)
+        self.assertNotIn("b", loaded)
+        self.assertEqual(loaded.item_count, 1)
+        self.assertEqual(loaded.metadata, {"seen_count": 1})
+
+
+class TestTransactionDeduplicator(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, 'seen.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_duplicates_within_a_run_are_skipped(self):
+        with TransactionDeduplicator(self.db_path, capacity=1000) as deduplicator:
+            rows = [make_row(1), make_row(2), make_row(1), {"Transaction ID": "", "Amount": "1"}, make_row(2)]
+            kept = list(deduplicator.filter(rows))
+            self.assertEqual([row["Transaction ID"] for row in kept], ["1", "2", ""])
+            self.assertEqual(deduplicator.duplicates, 2)
+
+    def test_false_positives_are_confirmed_before_skipping(self):
+        # A tiny, saturated filter reports almost everything as a probable hit
+        with TransactionDeduplicator(self.db_path, capacity=1, error_rate=0.5, batch_size=7) as deduplicator:
+            self.assertFalse(any(deduplicator.is_duplicate(str(item)) for item in range(500)))
+            self.assertTrue(all(deduplicator.is_duplicate(str(item)) for item in range(500)))
+
+    def test_seen_ids_survive_between_runs(self):
+        with TransactionDeduplicator(self.db_path, capacity=1000) as deduplicator:
+            list(deduplicator.filter([make_row(1), make_row(2)]))
+        with TransactionDeduplicator(self.db_path, capacity=1000) as deduplicator:
+            kept = list(deduplicator.filter([make_row(2), make_row(3)]))
+        self.assertEqual([row["Transaction ID"] for row in kept], ["3"])
+
+    def test_filter_is_rebuilt_when_out_of_date(self):
+        with TransactionDeduplicator(self.db_path, capacity=1000) as deduplicator:
+            deduplicator.is_duplicate("1")
+        # Simulate a crash: the ID was committed but the filter was never saved
+        os.remove(self.db_path + '.bloom')
+        with self.assertLogs('data_processor.deduplicator', 'WARNING'):
+            with TransactionDeduplicator(self.db_path, capacity=1000) as reopened:
+                self.assertIn("1", reopened.bloom_filter)
+                self.assertTrue(reopened.is_duplicate("1"))
+
+    def test_ids_are_only_kept_once_flushed(self):
+        deduplicator = TransactionDeduplicator(self.db_path, capacity=1000, batch_size=2)
+        list(deduplicator.filter([make_row(1), make_row(2)]))
+        deduplicator.flush()
+        # Simulate a crash before the results of the next rows were saved, after a batch reached the database
+        list(deduplicator.filter([make_row(3), make_row(4), make_row(5)]))
+        deduplicator.close()
+        with TransactionDeduplicator(self.db_path, capacity=1000) as reopened:
+            kept = list(reopened.filter([make_row(item) for item in range(1, 6)]))
+        self.assertEqual([row["Transaction ID"] for row in kept], ["3", "4", "5"])
+
+    def test_ids_are_discarded_when_processing_fails(self):
+        with self.assertRaises(RuntimeError):
+            with TransactionDeduplicator(self.db_path, capacity=1000) as deduplicator:
+                list(deduplicator.filter([make_row(1)]))
+                raise RuntimeError("processing failed")
+        with TransactionDeduplicator(self.db_path, capacity=1000) as reopened:
+            self.assertFalse(reopened.is_duplicate("1"))
+
+    def test_processors_skip_resent_transactions(self):
+        first_file = [make_row(1, 100), make_row(2, 200)]
+        resent_file = [make_row(2, 200), make_row(3, 300)]
+        with TransactionDeduplicator(self.db_path) as deduplicator:
+            DataProcessor(first_file, deduplicator=deduplicator).process_data()
+            data_processor = DataProcessor(resent_file, deduplicator=deduplicator)
+            data_processor.process_data()
+        self.assertEqual(data_processor.account_summaries["1001"]["balance"], 300.0)
+        self.assertEqual(data_processor.counters["rows_processed"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
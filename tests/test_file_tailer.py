@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from input_handler.file_tailer import FileTailer
+
+
+class TestFileTailer(unittest.TestCase):
+
+    HEADER = "Transaction ID,Account number,Amount\n"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'feed.csv')
+        self.tailer = FileTailer(self.file_path)
+
+    def tearDown(self):
+        self.tailer.close()
+        self.directory.cleanup()
+
+    def write(self, text, mode='a'):
+        with open(self.file_path, mode) as feed:
+            feed.write(text)
+
+    def ids(self, rows):
+        return [row["Transaction ID"] for row in rows]
+
+    def test_waits_for_file_to_exist(self):
+        self.assertEqual(self.tailer.read_rows(), [])
+        self.write(self.HEADER + "1,1001,10\n")
+        self.assertEqual(self.tailer.read_rows(), [{"Transaction ID": "1", "Account number": "1001", "Amount": "10"}])
+
+    def test_partial_trailing_line_is_kept_until_complete(self):
+        self.write(self.HEADER + "1,1001,10\n2,10", 'w')
+        self.assertEqual(self.ids(self.tailer.read_rows()), ["1"])
+        self.assertEqual(self.tailer.read_rows(), [])
+        self.write("02,20\n3,1003,30\n")
+        rows = self.tailer.read_rows()
+        self.assertEqual(self.ids(rows), ["2", "3"])
+        self.assertEqual(rows[0]["Account number"], "1002")
+        self.assertEqual(self.tailer.offset, os.path.getsize(self.file_path))
+
+    def test_rotation_reads_rest_of_old_file_then_new_file(self):
+        self.write(self.HEADER + "1,1001,10\n", 'w')
+        self.assertEqual(self.ids(self.tailer.read_rows()), ["1"])
+        os.rename(self.file_path, self.file_path + '.1')
+        with open(self.file_path + '.1', 'a') as rotated:
+            rotated.write("2,1002,20")
+        # Until the new file appears the old one is still followed
+        self.assertEqual(self.tailer.read_rows(), [])
+        self.write(self.HEADER + "3,1003,30\n", 'w')
+        self.assertEqual(self.ids(self.tailer.read_rows()), ["2", "3"])
+        self.assertEqual(self.tailer.rotations, 1)
+
+    def test_truncation_starts_over(self):
+        self.write(self.HEADER + "1,1001,10\n2,1002,20\n", 'w')
+        self.assertEqual(self.ids(self.tailer.read_rows()), ["1", "2"])
+        self.write(self.HEADER, 'w')
+        self.assertEqual(self.tailer.read_rows(), [])
+        self.assertEqual(self.tailer.rotations, 1)
+        self.write("3,1003,30\n")
+        self.assertEqual(self.ids(self.tailer.read_rows()), ["3"])
+
+    def test_read_size_bounds_each_read(self):
+        self.write(self.HEADER + "".join(f"{index},1001,10\n" for index in range(100)), 'w')
+        tailer = FileTailer(self.file_path, read_size=64)
+        with tailer:
+            batches = []
+            while True:
+                rows = tailer.read_rows()
+                if not rows:
+                    break
+                batches.append(self.ids(rows))
+        self.assertGreater(len(batches), 1)
+        self.assertEqual(sum(batches, []), [str(index) for index in range(100)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from data_processor.data_processor import DataProcessor
+from data_processor.fx_rates import FXRateTable
+
+
+class TestFXRateTable(unittest.TestCase):
+
+    RATES = {("USD", "2023-03-01"): 1.35, ("USD", "2023-03-03"): 1.30, ("XRP", "2023-03-01"): 0.5}
+
+    def setUp(self):
+        self.fx_rates = FXRateTable(self.RATES)
+
+    def test_rate_uses_latest_rate_on_or_before_date(self):
+        self.assertEqual(self.fx_rates.rate("USD", "2023-03-01"), 1.35)
+        self.assertEqual(self.fx_rates.rate("USD", "2023-03-02"), 1.35)
+        self.assertEqual(self.fx_rates.rate("USD", "2023-04-01"), 1.30)
+        self.assertEqual(self.fx_rates.rate("CAD", "1999-01-01"), 1.0)
+        self.assertEqual(self.fx_rates.convert(100, "XRP", "2023-03-05"), 50.0)
+
+    def test_lookups_are_cached(self):
+        for _ in range(100):
+            self.fx_rates.rate("USD", "2023-03-02")
+        self.assertEqual(self.fx_rates.rate.cache_info().hits, 99)
+
+    def test_missing_rate_raises(self):
+        with self.assertRaises(KeyError):
+            self.fx_rates.rate("LTC", "2023-03-01")
+        with self.assertRaises(KeyError):
+            self.fx_rates.rate("USD", "2023-02-28")
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'rates.csv')
+            with open(path, 'w') as rates_file:
+                rates_file.write("Date,Currency,Rate\n2023-03-01,EUR,1.45\n2023-03-01,CAD,0.68\n")
+            fx_rates = FXRateTable.from_file(path, base_currency='USD')
+            with open(path, 'a') as rates_file:
+                rates_file.write("2023-03-02,EUR,not a rate\n")
+            with self.assertRaises(ValueError):
+                FXRateTable.from_file(path)
+
+        self.assertEqual(fx_rates.base_currency, 'USD')
+        self.assertEqual(fx_rates.rate("CAD", "2023-03-09"), 0.68)
+        with self.assertRaises(FileNotFoundError):
+            FXRateTable.from_file(path)
+
+    def test_pickle_keeps_rates(self):
+        restored = pickle.loads(pickle.dumps(self.fx_rates))
+        self.assertEqual(restored.rate("USD", "2023-03-04"), 1.30)
+
+    def test_processor_normalizes_balances(self):
+        rows = [
+            {"Transaction ID": "1", "Account number": "1001", "Date": "2023-03-01", "Transaction type": "deposit",
+             "Amount": "100", "Currency": "USD", "Description": "Salary"},
+            {"Transaction ID": "2", "Account number": "1001", "Date": "2023-03-03", "Transaction type": "withdrawal",
+             "Amount": "40", "Currency": "USD", "Description": "Rent"},
+            {"Transaction ID": "3", "Account number": "1001", "Date": "2023-03-03", "Transaction type": "deposit",
+             "Amount": "10", "Currency": "CAD", "Description": "Refund"},
+            {"Transaction ID": "4", "Account number": "1001", "Date": "2023-03-03", "Transaction type": "transfer",
+             "Amount": "5", "Currency": "XRP", "Description": "Transfer"}
+        ]
+        data_processor = DataProcessor(rows, fx_rates=self.fx_rates)
+        data_processor.process_data()
+        summary = data_processor.account_summaries["1001"]
+
+        self.assertEqual(summary["currency_balances"], {"USD": 60.0, "CAD": 10.0})
+        self.assertAlmostEqual(summary["normalized_balance"], 100 * 1.35 - 40 * 1.30 + 10)
+        self.assertNotIn("normalized_balance", DataProcessor([]).new_account_summary("1001"))
+
+    def test_missing_rate_leaves_normalized_balance_empty(self):
+        rows = [
+            {"Transaction ID": "1", "Account number": "1001", "Date": "2023-03-01", "Transaction type": "deposit",
+             "Amount": "100", "Currency": "USD", "Description": "Salary"},
+            {"Transaction ID": "2", "Account number": "1002", "Date": "2023-03-02", "Transaction type": "deposit",
+             "Amount": "50", "Currency": "EUR", "Description": "No rate"},
+            {"Transaction ID": "3", "Account number": "1002", "Date": "2023-03-02", "Transaction type": "deposit",
+             "Amount": "20", "Currency": "EUR", "Description": "No rate"},
+            {"Transaction ID": "4", "Account number": "1003", "Date": "2023-02-01", "Transaction type": "deposit",
+             "Amount": "20", "Currency": "USD", "Description": "Before the first rate"}
+        ]
+        data_processor = DataProcessor(rows, fx_rates=self.fx_rates)
+        with self.assertLogs('data_processor.data_processor', 'WARNING') as logs:
+            data_processor.process_data()
+
+        summaries = data_processor.account_summaries
+        self.assertAlmostEqual(summaries["1001"]["normalized_balance"], 135.0)
+        self.assertIsNone(summaries["1002"]["normalized_balance"])
+        self.assertIsNone(summaries["1003"]["normalized_balance"])
+        # The rest of the summary is still updated
+        self.assertEqual(summaries["1002"]["balance"], 70.0)
+        self.assertEqual(data_processor.counters["missing_fx_rates"], 3)
+        # One warning per currency, not per row
+        self.assertEqual(sum('exchange rate' in message for message in logs.output), 2)
+
+        try:
+            from data_processor.columnar_processor import ColumnarDataProcessor
+        except ImportError:
+            return
+        columnar = ColumnarDataProcessor(rows, fx_rates=self.fx_rates)
+        columnar.process_data()
+        self.assertEqual(columnar.account_summaries, summaries)
+        self.assertEqual(columnar.counters, data_processor.counters)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,11 @@
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
 import unittest
 from unittest.mock import mock_open, patch, Mock
+from input_handler.compression import open_compressed
 from input_handler.input_handler import InputHandler
 
 class TestInputHandler(unittest.TestCase):
@@ -11,6 +17,7 @@ class TestInputHandler(unittest.TestCase):
         self.handler_empty_csv = InputHandler('empty.csv')
         self.handler_missing_csv = InputHandler('missing.csv')
         self.handler_invalid_extension = InputHandler('invalid.txt')
+        self.handler_valid_json = InputHandler('valid.json')
 
     def test_get_file_format_with_extension(self):
         """Verify that the correct file extension is returned."""
@@ -51,5 +58,102 @@ class TestInputHandler(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.handler_invalid_extension.read_input_data()
 
+    def test_iter_records_valid_csv(self):
+        """Verify that the rows of a CSV file are yielded one at a time."""
+        mock_data = "name,age\nJohn,30\nJane,25"
+        with patch('builtins.open', mock_open(read_data=mock_data), create=True):
+            records = self.handler_valid_csv.iter_records()
+            self.assertEqual(next(records), {'name': 'John', 'age': '30'})
+            self.assertEqual(list(records), [{'name': 'Jane', 'age': '25'}])
+
+    def test_iter_records_valid_json_in_small_chunks(self):
+        """Verify that a JSON array is decoded element by element across chunk boundaries."""
+        mock_data = ' [ {"name": "John", "age": 30},\n {"name": "Jane", "age": 25} ] '
+        with patch('builtins.open', mock_open(read_data=mock_data), create=True):
+            data = list(self.handler_valid_json.iter_json_records(chunk_size=4))
+            self.assertEqual(data, [{'name': 'John', 'age': 30}, {'name': 'Jane', 'age': 25}])
+
+    def test_iter_records_json_not_an_array(self):
+        """Verify that ValueError is raised when the top-level JSON value is not an array."""
+        with patch('builtins.open', mock_open(read_data='{"name": "John"}'), create=True):
+            with self.assertRaises(ValueError):
+                list(self.handler_valid_json.iter_records())
+
+    def test_iter_records_invalid_extension(self):
+        """Verify that ValueError is raised when a file with an invalid extension is streamed."""
+        with self.assertRaises(ValueError):
+            self.handler_invalid_extension.iter_records()
+
+    def test_get_file_format_skips_compression_extension(self):
+        """Verify that the format of a compressed file is the extension before the compression extension."""
+        self.assertEqual(InputHandler('archive/input.csv.gz').get_file_format(), 'csv')
+        self.assertEqual(InputHandler('input.json.XZ').get_file_format(), 'json')
+        self.assertEqual(InputHandler('input.bz2').get_file_format(), '')
+        self.assertEqual(InputHandler('input.csv.bz2').get_compression(), 'bz2')
+        self.assertIsNone(self.handler_with_extension.get_compression())
+
+    def test_compressed_files_are_decompressed_while_streamed(self):
+        """Verify that gzip, xz and bz2 files are read like their uncompressed versions."""
+        csv_data = "name,age\nJohn,30\nJane,25\n"
+        json_data = '[{"name": "John", "age": 30}, {"name": "Jane", "age": 25}]'
+        with tempfile.TemporaryDirectory() as directory:
+            for module, extension in ((gzip, 'gz'), (lzma, 'xz'), (bz2, 'bz2')):
+                csv_path = os.path.join(directory, f'input.csv.{extension}')
+                json_path = os.path.join(directory, f'input.json.{extension}')
+                with module.open(csv_path, 'wt') as csv_file:
+                    csv_file.write(csv_data)
+                with module.open(json_path, 'wt') as json_file:
+                    json_file.write(json_data)
+
+                self.assertEqual(InputHandler(csv_path).read_input_data(),
+                                 [{'name': 'John', 'age': '30'}, {'name': 'Jane', 'age': '25'}])
+                self.assertEqual(list(InputHandler(json_path).iter_json_records(chunk_size=8)),
+                                 [{'name': 'John', 'age': 30}, {'name': 'Jane', 'age': 25}])
+                self.assertEqual(InputHandler(json_path).read_input_data()[1]['name'], 'Jane')
+
+    def test_compression_level_is_checked_per_format(self):
+        """Verify that bz2 rejects level 0 before creating the file, while gzip and xz accept it."""
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                open_compressed(os.path.join(directory, 'output.csv.bz2'), 'wt', 'bz2', 0)
+            self.assertEqual(os.listdir(directory), [])
+            for extension in ('gz', 'xz'):
+                with open_compressed(os.path.join(directory, f'output.csv.{extension}'), 'wt', extension, 0) as output_file:
+                    output_file.write('name\n')
+            with self.assertRaises(ValueError):
+                open_compressed(os.path.join(directory, 'output.csv.gz'), 'wt', 'gz', 10)
+
+    def test_compressed_csv_cannot_be_read_by_byte_range(self):
+        """Verify that the byte-offset readers reject compressed files."""
+        handler = InputHandler('input.csv.gz')
+        with self.assertRaises(ValueError):
+            handler.get_csv_shards(2)
+        with self.assertRaises(ValueError):
+            list(handler.iter_csv_range())
+
+    def test_missing_compressed_file(self):
+        """Verify that FileNotFoundError is raised for a non-existent compressed file."""
+        with self.assertRaises(FileNotFoundError):
+            list(InputHandler('missing.csv.gz').iter_records())
+
+    def test_ndjson_records_are_read_one_line_at_a_time(self):
+        """Verify that .ndjson and .jsonl files yield one record per line and skip blank lines."""
+        ndjson_data = '{"name": "John", "age": 30}\n\n{"name": "Jane", "age": 25}'
+        with tempfile.TemporaryDirectory() as directory:
+            for file_name, opener in (('input.ndjson', open), ('input.jsonl', open), ('input.ndjson.gz', gzip.open)):
+                path = os.path.join(directory, file_name)
+                with opener(path, 'wt') as ndjson_file:
+                    ndjson_file.write(ndjson_data)
+
+                self.assertEqual(list(InputHandler(path).iter_records()),
+                                 [{'name': 'John', 'age': 30}, {'name': 'Jane', 'age': 25}])
+                self.assertEqual(len(InputHandler(path).read_input_data()), 2)
+
+    def test_ndjson_malformed_line(self):
+        """Verify that a malformed line raises ValueError naming the line."""
+        with patch("builtins.open", mock_open(read_data='{"name": "John"}\n{"name": \n')):
+            with self.assertRaisesRegex(ValueError, 'line 2'):
+                list(InputHandler('input.ndjson').iter_records())
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from data_processor.data_processor import DataProcessor
+from data_processor.live_processor import LiveProcessor
+from input_handler.input_handler import InputHandler
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingWriter:
+
+    def __init__(self):
+        self.rows = []
+        self.flushes = 0
+
+    def write(self, transaction, fired_rules=None):
+        self.rows.append((transaction["Transaction ID"], fired_rules))
+
+    def flush(self):
+        self.flushes += 1
+
+
+class TestLiveProcessor(unittest.TestCase):
+
+    HEADER = "Transaction ID,Account number,Date,Transaction type,Amount,Currency,Description\n"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'feed.csv')
+        with open(self.file_path, 'w') as feed:
+            feed.write(self.HEADER)
+        self.snapshots = []
+        self.clock = FakeClock()
+        self.alerts = RecordingWriter()
+        self.live_processor = LiveProcessor(self.file_path, DataProcessor([]), self.publish, self.alerts,
+                                            snapshot_interval=5, snapshot_rows=3, clock=self.clock)
+
+    def tearDown(self):
+        self.live_processor.tailer.close()
+        self.directory.cleanup()
+
+    def publish(self, data_processor):
+        self.snapshots.append({account: dict(summary) for account, summary in data_processor.account_summaries.items()})
+
+    def append(self, *rows):
+        with open(self.file_path, 'a') as feed:
+            for transaction_id, account_number, amount in rows:
+                feed.write(f"{transaction_id},{account_number},2023-03-01,deposit,{amount},CAD,Deposit\n")
+
+    def test_incremental_results_match_batch_processing(self):
+        self.append(("1", "1001", 100), ("2", "1002", 20000))
+        self.assertEqual(self.live_processor.poll(), 2)
+        self.append(("3", "1001", 50))
+        self.assertEqual(self.live_processor.poll(), 1)
+        expected = DataProcessor(InputHandler(self.file_path).iter_records()).process_data()
+        data_processor = self.live_processor.data_processor
+        self.assertEqual(data_processor.account_summaries, expected["account_summaries"])
+        self.assertEqual(data_processor.transaction_statistics, expected["transaction_statistics"])
+        self.assertEqual(data_processor.suspicious_transactions, expected["suspicious_transactions"])
+
+    def test_suspicious_transactions_are_alerted_in_the_same_poll(self):
+        self.append(("1", "1001", 100), ("2", "1002", 20000))
+        self.live_processor.poll()
+        self.assertEqual(self.alerts.rows, [("2", ["large_transaction"])])
+        self.assertEqual(self.alerts.flushes, 1)
+        self.assertEqual(self.snapshots, [])
+        self.append(("3", "1001", 50))
+        self.live_processor.poll()
+        self.assertEqual(len(self.alerts.rows), 1)
+        self.assertEqual(self.alerts.flushes, 1)
+
+    def test_snapshots_follow_row_and_time_cadence(self):
+        self.append(("1", "1001", 100))
+        self.live_processor.poll()
+        self.assertEqual(self.snapshots, [])
+        self.append(("2", "1001", 100), ("3", "1001", 100))
+        self.live_processor.poll()
+        self.assertEqual(len(self.snapshots), 1)
+        self.assertEqual(self.snapshots[0]["1001"]["balance"], 300.0)
+
+        self.append(("4", "1001", 100))
+        self.live_processor.poll()
+        self.clock.now = 4.9
+        self.live_processor.poll()
+        self.assertEqual(len(self.snapshots), 1)
+        self.clock.now = 5.0
+        self.live_processor.poll()
+        self.assertEqual(self.live_processor.snapshots, 2)
+        # Nothing changed since the last snapshot, so no new one is published
+        self.clock.now = 20.0
+        self.live_processor.poll()
+        self.assertEqual(self.live_processor.snapshots, 2)
+
+    def test_run_until_stopped(self):
+        stop_event = threading.Event()
+        live_processor = LiveProcessor(self.file_path, DataProcessor([]), self.publish, self.alerts,
+                                       poll_interval=0.01, snapshot_interval=60)
+        thread = threading.Thread(target=live_processor.run, args=(stop_event,))
+        thread.start()
+        try:
+            self.append(("1", "1001", 20000))
+            deadline = time.monotonic() + 5
+            while not self.alerts.rows and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.alerts.rows, [("1", ["large_transaction"])])
+        finally:
+            stop_event.set()
+            thread.join()
+        # Rows not published yet are published when following stops
+        self.assertEqual(self.snapshots[-1]["1001"]["balance"], 20000.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from data_processor import logging_setup
+
+
+class TestLoggingSetup(unittest.TestCase):
+    """Tests for the queue-based background log writer."""
+
+    def setUp(self):
+        self.root = logging.getLogger()
+        self.saved_handlers = self.root.handlers[:]
+        self.saved_level = self.root.level
+        self.root.handlers = []
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        logging_setup.shutdown_logging()
+        for handler in self.root.handlers:
+            handler.close()
+        self.root.handlers = self.saved_handlers
+        self.root.setLevel(self.saved_level)
+        self.directory.cleanup()
+
+    def test_records_are_written_by_listener(self):
+        log_file = os.path.join(self.directory.name, 'test.log')
+        logging_setup.configure_logging(logging.WARNING, '%(levelname)s %(message)s', log_file)
+        self.assertIsInstance(self.root.handlers[0], logging_setup.DeferredFormatQueueHandler)
+        logging.getLogger('data_processor.test').warning("Suspicious transaction: %s", 42)
+        logging_setup.shutdown_logging()
+        with open(log_file) as log:
+            self.assertEqual(log.read(), "WARNING Suspicious transaction: 42\n")
+
+    def test_records_are_formatted_by_listener(self):
+        formatted_in = []
+
+        class Argument:
+            def __str__(self):
+                formatted_in.append(threading.current_thread())
+                return 'argument'
+
+        log_file = os.path.join(self.directory.name, 'test.log')
+        logging_setup.configure_logging(logging.WARNING, '%(message)s', log_file)
+        logging.getLogger('data_processor.test').warning("Suspicious transaction: %s", Argument())
+        logging_setup.shutdown_logging()
+        self.assertEqual(len(formatted_in), 1)
+        self.assertIsNot(formatted_in[0], threading.current_thread())
+        with open(log_file) as log:
+            self.assertEqual(log.read(), "Suspicious transaction: argument\n")
+
+    def test_existing_handlers_are_kept(self):
+        handler = logging.NullHandler()
+        self.root.addHandler(handler)
+        logging_setup.configure_logging(logging.INFO)
+        self.assertEqual(self.root.handlers, [handler])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,13 @@
+import gzip
+import json
+import lzma
+import os
+import tempfile
 import unittest
 from unittest import TestCase
 from unittest.mock import patch, mock_open
-from output_handler.output_handler import OutputHandler
+from input_handler.input_handler import InputHandler
+from output_handler.output_handler import OutputHandler, SuspiciousTransactionWriter, write_json_atomically
 
 
 class TestOutputHandler(TestCase):
@@ -64,6 +70,282 @@ class TestOutputHandler(TestCase):
         mock_csv_writer.return_value.writerow.assert_called()
         self.assertEqual(mock_csv_writer.return_value.writerow.call_count, len(self.TRANSACTION_STATISTICS) + 1)
 
+    @patch("output_handler.output_handler.csv.writer")
+    @patch("output_handler.output_handler.open", new_callable=mock_open)
+    def test_suspicious_transaction_writer_streams_rows(self, mock_open, mock_csv_writer):
+        # Arrange
+        file_path = "test_suspicious_transactions.csv"
+
+        # Act
+        with SuspiciousTransactionWriter(file_path, buffer_size=4096, atomic=False) as writer:
+            for transaction in self.SUSPICIOUS_TRANSACTIONS:
+                writer.write(transaction, ["uncommon_currency"])
+
+        # Assert
+        mock_open.assert_called_once_with(file_path, 'a', newline='', buffering=4096)
+        self.assertEqual(mock_csv_writer.return_value.writerow.call_count, len(self.SUSPICIOUS_TRANSACTIONS) + 1)
+        self.assertEqual(writer.rows_written, len(self.SUSPICIOUS_TRANSACTIONS))
+        mock_open.return_value.close.assert_called_once()
+
+    def test_suspicious_transaction_writer_appends_in_place(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'alerts.csv')
+            # A restart keeps the alerts already written and does not repeat the header
+            for _ in range(2):
+                with SuspiciousTransactionWriter(path, atomic=False) as writer:
+                    writer.write(self.SUSPICIOUS_TRANSACTIONS[0], ["uncommon_currency"])
+            with open(path) as alerts_file:
+                lines = alerts_file.read().splitlines()
+            self.assertEqual(len(lines), 3)
+            self.assertTrue(lines[0].startswith('Transaction ID,'))
+            with self.assertRaises(ValueError):
+                SuspiciousTransactionWriter(os.path.join(directory, 'alerts.json'), output_format='json', atomic=False)
+
+    def test_suspicious_transaction_writer_replaces_file_on_close(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'suspicious.csv')
+            with open(path, 'w') as previous_file:
+                previous_file.write('previous')
+
+            # Rows are streamed to a hidden file; the target is only replaced on close
+            with SuspiciousTransactionWriter(path) as writer:
+                writer.write(self.SUSPICIOUS_TRANSACTIONS[0], ["uncommon_currency"])
+                writer.flush()
+                with open(path) as suspicious_file:
+                    self.assertEqual(suspicious_file.read(), 'previous')
+                self.assertEqual(len(os.listdir(directory)), 2)
+            self.assertEqual(os.listdir(directory), ['suspicious.csv'])
+            with open(path) as suspicious_file:
+                self.assertEqual(len(suspicious_file.read().splitlines()), 2)
+
+            # An error inside the block keeps the previous file
+            with self.assertRaises(RuntimeError):
+                with SuspiciousTransactionWriter(path, output_format='json') as writer:
+                    writer.write(self.SUSPICIOUS_TRANSACTIONS[0])
+                    raise RuntimeError('interrupted')
+            self.assertEqual(os.listdir(directory), ['suspicious.csv'])
+            with open(path) as suspicious_file:
+                self.assertTrue(suspicious_file.read().startswith('Transaction ID,'))
+
+    def test_write_all_writes_every_output_atomically(self):
+        # Arrange
+        output_handler = OutputHandler(self.ACCOUNT_SUMMARIES, self.SUSPICIOUS_TRANSACTIONS, self.TRANSACTION_STATISTICS)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, name) for name in ('summaries.csv', 'suspicious.csv', 'statistics.csv')]
+
+            # Act
+            output_handler.write_all(*paths)
+
+            # Assert
+            self.assertEqual(sorted(os.listdir(directory)), ['statistics.csv', 'summaries.csv', 'suspicious.csv'])
+            with open(paths[0]) as summaries_file:
+                self.assertEqual(summaries_file.read().splitlines(),
+                                 ['Account number,Balance,Total Deposits,Total Withdrawals', '1001,50,100,50', '1002,200,200,0'])
+            with open(paths[2]) as statistics_file:
+                self.assertEqual(len(statistics_file.read().splitlines()), len(self.TRANSACTION_STATISTICS) + 1)
+
+    def test_suspicious_transactions_list_fired_rules(self):
+        # Arrange
+        suspicious_transactions = self.SUSPICIOUS_TRANSACTIONS * 2
+        output_handler = OutputHandler(self.ACCOUNT_SUMMARIES, suspicious_transactions, self.TRANSACTION_STATISTICS,
+                                       suspicious_transaction_rules=[["large_transaction", "uncommon_currency"]])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'suspicious.csv')
+
+            # Act
+            output_handler.write_all(None, path, None)
+
+            # Assert
+            with open(path) as suspicious_file:
+                lines = suspicious_file.read().splitlines()
+        self.assertEqual(lines[0].rsplit(',', 1)[1], 'Fired rules')
+        self.assertEqual(lines[1], '1,1001,2023-03-14,deposit,250,XRP,crypto investment,large_transaction;uncommon_currency')
+        # Transactions without recorded rules get an empty column
+        self.assertTrue(lines[2].endswith('crypto investment,'))
+
+    def test_write_all_compresses_outputs(self):
+        # Arrange
+        output_handler = OutputHandler(self.ACCOUNT_SUMMARIES, self.SUSPICIOUS_TRANSACTIONS, self.TRANSACTION_STATISTICS,
+                                       compression='gz', compression_level=1)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, name) for name in ('summaries.csv.gz', 'suspicious.csv.gz', 'statistics.csv.gz')]
+
+            # Act
+            output_handler.write_all(*paths)
+
+            # Assert
+            self.assertEqual(sorted(os.listdir(directory)), ['statistics.csv.gz', 'summaries.csv.gz', 'suspicious.csv.gz'])
+            with gzip.open(paths[0], 'rt', newline='') as summaries_file:
+                self.assertEqual(summaries_file.read().splitlines(),
+                                 ['Account number,Balance,Total Deposits,Total Withdrawals', '1001,50,100,50', '1002,200,200,0'])
+
+    def test_unsupported_compression_level_is_rejected_before_writing(self):
+        with self.assertRaises(ValueError):
+            OutputHandler(self.ACCOUNT_SUMMARIES, self.SUSPICIOUS_TRANSACTIONS, self.TRANSACTION_STATISTICS,
+                          compression='bz2', compression_level=0)
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ValueError):
+                SuspiciousTransactionWriter(os.path.join(directory, 'suspicious.csv.bz2'), compression='bz2',
+                                            compression_level=0)
+            # The temporary file of the atomic writer is removed
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_write_to_csv_and_stream_compressed(self):
+        # Arrange
+        output_handler = OutputHandler(self.ACCOUNT_SUMMARIES, self.SUSPICIOUS_TRANSACTIONS, self.TRANSACTION_STATISTICS,
+                                       compression='xz')
+        with tempfile.TemporaryDirectory() as directory:
+            statistics_path = os.path.join(directory, 'statistics.csv.xz')
+            suspicious_path = os.path.join(directory, 'suspicious.csv.xz')
+
+            # Act
+            output_handler.write_transaction_statistics_to_csv(statistics_path)
+            with SuspiciousTransactionWriter(suspicious_path, compression='xz', compression_level=0) as writer:
+                for transaction in self.SUSPICIOUS_TRANSACTIONS:
+                    writer.write(transaction)
+
+            # Assert
+            with lzma.open(statistics_path, 'rt') as statistics_file:
+                self.assertEqual(len(statistics_file.read().splitlines()), len(self.TRANSACTION_STATISTICS) + 1)
+            with lzma.open(suspicious_path, 'rt') as suspicious_file:
+                self.assertEqual(len(suspicious_file.read().splitlines()), len(self.SUSPICIOUS_TRANSACTIONS) + 1)
+        self.assertEqual(output_handler.compression, 'xz')
+
+    def test_write_all_writes_currency_balances_and_normalized_balance(self):
+        # Arrange
+        account_summaries = {'1001': {'account_number': '1001', 'balance': 50, 'total_deposits': 100,
+                                      'total_withdrawals': 50, 'currency_balances': {'CAD': 80, 'USD': -30},
+                                      'normalized_balance': 39.5}}
+        output_handler = OutputHandler(account_summaries, [], {})
+        with tempfile.TemporaryDirectory() as directory:
+            summaries_path = os.path.join(directory, 'summaries.csv')
+            balances_path = os.path.join(directory, 'balances.csv')
+
+            # Act
+            output_handler.write_all(summaries_path, None, None, currency_balances_file=balances_path)
+
+            # Assert
+            with open(summaries_path) as summaries_file:
+                self.assertEqual(summaries_file.read().splitlines(),
+                                 ['Account number,Balance,Total Deposits,Total Withdrawals,Normalized Balance',
+                                  '1001,50,100,50,39.5'])
+            with open(balances_path) as balances_file:
+                self.assertEqual(balances_file.read().splitlines(),
+                                 ['Account number,Currency,Balance', '1001,CAD,80', '1001,USD,-30'])
+
+    def test_write_all_writes_amount_statistics(self):
+        # Arrange
+        amount_statistics = {"transaction_type": {"deposit": {"count": 2, "min": 100.0, "max": 200.0, "mean": 150.0,
+                                                              "std_dev": 50.0, "p50": 150.0, "p95": 195.0, "p99": 199.0}},
+                             "currency": {}}
+        output_handler = OutputHandler(self.ACCOUNT_SUMMARIES, self.SUSPICIOUS_TRANSACTIONS, self.TRANSACTION_STATISTICS,
+                                       amount_statistics)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'amounts.csv')
+
+            # Act
+            output_handler.write_all(None, None, None, amount_statistics_file=path)
+
+            # Assert
+            with open(path) as amounts_file:
+                self.assertEqual(amounts_file.read().splitlines(),
+                                 ['Dimension,Key,Count,Min,Max,Mean,Standard deviation,P50,P95,P99',
+                                  'transaction_type,deposit,2,100.0,200.0,150.0,50.0,150.0,195.0,199.0'])
+
+    def test_write_all_keeps_previous_file_on_error(self):
+        # Arrange
+        output_handler = OutputHandler(self.ACCOUNT_SUMMARIES, [{"Transaction ID": "1"}], self.TRANSACTION_STATISTICS)
+        with tempfile.TemporaryDirectory() as directory:
+            suspicious_path = os.path.join(directory, 'suspicious.csv')
+            with open(suspicious_path, 'w') as previous_file:
+                previous_file.write('previous')
+
+            # Act
+            with self.assertRaises(KeyError):
+                output_handler.write_all(None, suspicious_path, None)
+
+            # Assert
+            self.assertEqual(os.listdir(directory), ['suspicious.csv'])
+            with open(suspicious_path) as suspicious_file:
+                self.assertEqual(suspicious_file.read(), 'previous')
+
+
+    def test_write_all_writes_json_and_ndjson(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            for output_format in ('json', 'ndjson'):
+                output_handler = OutputHandler(self.ACCOUNT_SUMMARIES, self.SUSPICIOUS_TRANSACTIONS,
+                                               self.TRANSACTION_STATISTICS, output_format=output_format,
+                                               suspicious_transaction_rules=[["uncommon_currency"]])
+                paths = [os.path.join(directory, f'{name}.{output_format}')
+                         for name in ('summaries', 'suspicious', 'statistics')]
+
+                # Act
+                output_handler.write_all(*paths)
+
+                # Assert
+                self.assertEqual(list(InputHandler(paths[0]).iter_records()), [
+                    {'Account number': '1001', 'Balance': 50, 'Total Deposits': 100, 'Total Withdrawals': 50},
+                    {'Account number': '1002', 'Balance': 200, 'Total Deposits': 200, 'Total Withdrawals': 0}])
+                # Suspicious transactions are written in the input format, so they can be read back as input
+                self.assertEqual(InputHandler(paths[1]).read_input_data(),
+                                 [dict(self.SUSPICIOUS_TRANSACTIONS[0], **{'Fired rules': 'uncommon_currency'})])
+                with open(paths[2]) as statistics_file:
+                    contents = statistics_file.read()
+                if output_format == 'json':
+                    self.assertEqual(len(json.loads(contents)), len(self.TRANSACTION_STATISTICS))
+                else:
+                    self.assertEqual(len(contents.splitlines()), len(self.TRANSACTION_STATISTICS))
+                self.assertEqual(output_handler.output_format, output_format)
+
+    def test_write_to_json_and_stream_json(self):
+        # Arrange
+        output_handler = OutputHandler(self.ACCOUNT_SUMMARIES, [], self.TRANSACTION_STATISTICS, compression='gz')
+        with tempfile.TemporaryDirectory() as directory:
+            empty_path = os.path.join(directory, 'empty.json.gz')
+            statistics_path = os.path.join(directory, 'statistics.ndjson.gz')
+            suspicious_paths = [os.path.join(directory, f'suspicious.{output_format}')
+                                for output_format in ('json', 'ndjson')]
+
+            # Act
+            output_handler.write_suspicious_transactions_to_json(empty_path)
+            output_handler.write_transaction_statistics_to_json(statistics_path, lines=True)
+            for path in suspicious_paths:
+                with SuspiciousTransactionWriter(path, output_format=path.rsplit('.', 1)[1]) as writer:
+                    for transaction in self.SUSPICIOUS_TRANSACTIONS * 2:
+                        writer.write(transaction, ["large_transaction", "uncommon_currency"])
+
+            # Assert
+            with gzip.open(empty_path, 'rt') as empty_file:
+                self.assertEqual(json.load(empty_file), [])
+            self.assertEqual(InputHandler(statistics_path).read_input_data()[0],
+                             {'Transaction type': 'deposit', 'Total amount': 300, 'Transaction count': 2})
+            for path in suspicious_paths:
+                self.assertEqual(InputHandler(path).read_input_data(), [
+                    dict(self.SUSPICIOUS_TRANSACTIONS[0], **{'Fired rules': 'large_transaction;uncommon_currency'})] * 2)
+
+    def test_write_json_atomically_keeps_previous_file_on_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.json')
+            with open(path, 'w') as previous_file:
+                previous_file.write('previous')
+
+            def failing_rows():
+                yield [1, 2]
+                raise RuntimeError('interrupted')
+
+            with self.assertRaises(RuntimeError):
+                write_json_atomically(path, ['a', 'b'], failing_rows())
+
+            self.assertEqual(os.listdir(directory), ['table.json'])
+            with open(path) as table_file:
+                self.assertEqual(table_file.read(), 'previous')
+
+    def test_unsupported_output_format(self):
+        with self.assertRaises(ValueError):
+            OutputHandler(self.ACCOUNT_SUMMARIES, self.SUSPICIOUS_TRANSACTIONS, self.TRANSACTION_STATISTICS,
+                          output_format='xml')
+
 
 if __name__ == "__main__":
     unittest.main()
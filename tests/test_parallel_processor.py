@@ -0,0 +1,51 @@
+import os
+import random
+import tempfile
+import unittest
+from data_processor.data_processor import DataProcessor
+from data_processor.parallel_processor import process_file_in_parallel
+from input_handler.input_handler import InputHandler
+
+
+class TestParallelProcessor(unittest.TestCase):
+    """Tests for sharded processing of a CSV file with a process pool."""
+
+    HEADER = "Transaction ID,Account number,Date,Transaction type,Amount,Currency,Description\n"
+
+    def setUp(self):
+        generator = random.Random(11)
+        lines = [f"{index},{1000 + generator.randrange(20)},2023-03-01,"
+                 f"{generator.choice(['deposit', 'withdrawal', 'transfer'])},{generator.randrange(1, 15000)},"
+                 f"{generator.choice(['CAD', 'USD', 'XRP'])},Generated\n" for index in range(1, 501)]
+        handle, self.file_path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w') as csv_file:
+            csv_file.write(self.HEADER + ''.join(lines))
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def test_shards_cover_every_row_once(self):
+        input_handler = InputHandler(self.file_path)
+        shards = input_handler.get_csv_shards(7)
+        self.assertEqual(len(shards), 7)
+        identifiers = [row['Transaction ID'] for start, end in shards
+                       for row in input_handler.iter_csv_range(start, end)]
+        self.assertEqual(identifiers, [str(index) for index in range(1, 501)])
+
+    def test_parallel_results_match_sequential(self):
+        expected = DataProcessor(InputHandler(self.file_path).iter_records()).process_data()
+        merged = process_file_in_parallel(self.file_path, workers=3)
+        self.assertEqual(merged.account_summaries.keys(), expected["account_summaries"].keys())
+        for account_number, summary in expected["account_summaries"].items():
+            for key in ("balance", "total_deposits", "total_withdrawals"):
+                self.assertAlmostEqual(merged.account_summaries[account_number][key], summary[key])
+        self.assertEqual(merged.suspicious_transactions, expected["suspicious_transactions"])
+        self.assertEqual(merged.transaction_statistics, expected["transaction_statistics"])
+
+    def test_rejects_json_input(self):
+        with self.assertRaises(ValueError):
+            process_file_in_parallel("input.json", workers=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from data_processor.data_processor import DataProcessor
+from input_handler.input_handler import InputHandler
+from query_service.query_service import QueryService
+
+
+def make_row(transaction_id, account_number, transaction_type, amount, currency="CAD"):
+    return {"Transaction ID": str(transaction_id), "Account number": account_number, "Date": "2023-03-01",
+            "Transaction type": transaction_type, "Amount": str(amount), "Currency": currency,
+            "Description": "Test"}
+
+
+class TestQueryService(unittest.TestCase):
+
+    def setUp(self):
+        self.data_processor = DataProcessor([])
+        self.data_processor.process_rows([make_row(1, "1001", "deposit", 1000), make_row(2, "1001", "withdrawal", 200),
+                                          make_row(3, "1002", "deposit", 20000), make_row(4, "1003", "deposit", 5, "XRP")])
+        self.query_service = QueryService(port=0)
+        self.query_service.start()
+
+    def tearDown(self):
+        self.query_service.stop()
+
+    def get(self, path):
+        host, port = self.query_service.address
+        try:
+            with urlopen(f"http://{host}:{port}{path}") as response:
+                return response.status, json.loads(response.read())
+        except HTTPError as error:
+            return error.code, json.loads(error.read())
+
+    def test_unavailable_before_first_publish(self):
+        self.assertEqual(self.get("/accounts/1001")[0], 503)
+
+    def test_accounts(self):
+        self.query_service.publish(self.data_processor)
+        status, summary = self.get("/accounts/1001")
+        self.assertEqual(status, 200)
+        self.assertEqual(summary["balance"], 800.0)
+        self.assertEqual(self.get("/accounts/9999")[0], 404)
+        status, page = self.get("/accounts?offset=1&limit=1")
+        self.assertEqual(page["total"], 3)
+        self.assertEqual([account["account_number"] for account in page["items"]], ["1002"])
+
+    def test_accounts_read_from_json_input(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, 'input.json')
+            with open(input_path, 'w') as input_file:
+                json.dump([{"Transaction ID": 1, "Account number": 1001, "Date": "2023-03-01",
+                            "Transaction type": "deposit", "Amount": 1200, "Currency": "CAD", "Description": "Salary"}],
+                          input_file)
+            data_processor = DataProcessor(InputHandler(input_path).iter_records())
+            data_processor.process_data()
+        self.query_service.publish(data_processor)
+        status, summary = self.get("/accounts/1001")
+        self.assertEqual(status, 200)
+        self.assertEqual(summary["balance"], 1200.0)
+
+    def test_accounts_restored_with_numeric_keys(self):
+        summary = {"account_number": 1001, "balance": 5, "total_deposits": 5, "total_withdrawals": 0}
+        self.query_service.publish(DataProcessor.from_results({"account_summaries": {1001: summary},
+                                                               "suspicious_transactions": [],
+                                                               "transaction_statistics": {}}))
+        self.assertEqual(self.get("/accounts/1001")[0], 200)
+
+    def test_transaction_statistics_and_averages(self):
+        self.query_service.publish(self.data_processor)
+        status, statistics = self.get("/transaction-statistics")
+        self.assertEqual(statistics["deposit"], {"total_amount": 21005.0, "transaction_count": 3,
+                                                 "average_amount": 21005.0 / 3})
+        status, average = self.get("/transaction-statistics/withdrawal/average")
+        self.assertEqual(average, {"transaction_type": "withdrawal", "average_amount": 200.0})
+        self.assertEqual(self.get("/transaction-statistics/transfer/average")[0], 404)
+
+    def test_suspicious_transactions_are_paginated(self):
+        self.query_service.publish(self.data_processor)
+        status, page = self.get("/suspicious-transactions?offset=1&limit=5")
+        self.assertEqual(page["total"], 2)
+        self.assertEqual([row["Transaction ID"] for row in page["items"]], ["4"])
+        self.assertEqual(self.get("/suspicious-transactions?limit=0")[0], 400)
+        self.assertEqual(self.get("/suspicious-transactions?offset=x")[0], 400)
+
+    def test_snapshots_are_not_changed_by_later_processing(self):
+        snapshot = self.query_service.publish(self.data_processor)
+        self.data_processor.process_rows([make_row(5, "1001", "deposit", 50000)])
+        self.assertEqual(snapshot.account_summaries["1001"]["balance"], 800.0)
+        self.assertEqual(snapshot.suspicious_count, 2)
+        self.assertEqual(len(snapshot.suspicious_page(0, 10)), 2)
+        self.assertEqual(self.get("/accounts/1001")[1]["balance"], 800.0)
+
+        self.query_service.publish(self.data_processor)
+        self.assertEqual(self.get("/accounts/1001")[1]["balance"], 50800.0)
+        self.assertEqual(self.get("/suspicious-transactions")[1]["total"], 3)
+        self.assertEqual(self.get("/health")[1], {"snapshot_version": 2, "rows_processed": 5})
+
+    def test_readers_see_consistent_accounts_while_ingesting(self):
+        self.query_service.publish(self.data_processor)
+        stop_event = threading.Event()
+
+        def ingest():
+            transaction_id = 100
+            while not stop_event.is_set():
+                rows = []
+                for _ in range(50):
+                    transaction_id += 1
+                    rows.append(make_row(transaction_id, "1001", "deposit" if transaction_id % 3 else "withdrawal", 10))
+                self.data_processor.process_rows(rows)
+                self.query_service.publish(self.data_processor)
+
+        writer = threading.Thread(target=ingest)
+        writer.start()
+        try:
+            for _ in range(50):
+                summary = self.get("/accounts/1001")[1]
+                self.assertEqual(summary["balance"], summary["total_deposits"] - summary["total_withdrawals"])
+        finally:
+            stop_event.set()
+            writer.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import unittest
+
+from data_generator.data_generator import TransactionGenerator
+from data_processor.data_processor import DataProcessor
+from data_processor.rollups import TransactionRollups
+
+
+class TestTransactionRollups(unittest.TestCase):
+
+    ROWS = [
+        {"Transaction ID": "1", "Account number": "1001", "Date": "2023-03-01", "Transaction type": "deposit",
+         "Amount": "100", "Currency": "CAD", "Description": "Salary"},
+        {"Transaction ID": "2", "Account number": "1001", "Date": "2023-03-01", "Transaction type": "deposit",
+         "Amount": "50", "Currency": "CAD", "Description": "Refund"},
+        {"Transaction ID": "3", "Account number": "1002", "Date": "2023-03-15", "Transaction type": "deposit",
+         "Amount": "25", "Currency": "CAD", "Description": "Bonus"},
+        {"Transaction ID": "4", "Account number": "1001", "Date": "2023-04-02", "Transaction type": "withdrawal",
+         "Amount": "30", "Currency": "CAD", "Description": "Rent"}
+    ]
+
+    def test_daily_and_monthly_rollups(self):
+        data_processor = DataProcessor(self.ROWS, rollups=True)
+        data_processor.process_data()
+        rollups = data_processor.rollups
+
+        self.assertEqual(rollups.daily(), {
+            ("2023-03-01", "1001", "deposit"): {"total_amount": 150.0, "transaction_count": 2},
+            ("2023-03-15", "1002", "deposit"): {"total_amount": 25.0, "transaction_count": 1},
+            ("2023-04-02", "1001", "withdrawal"): {"total_amount": 30.0, "transaction_count": 1}
+        })
+        self.assertEqual(rollups.monthly(), {
+            ("2023-03", "deposit"): {"total_amount": 175.0, "transaction_count": 3},
+            ("2023-04", "withdrawal"): {"total_amount": 30.0, "transaction_count": 1}
+        })
+        self.assertEqual(rollups.rollup(lambda key: key[1]), {
+            "1001": {"total_amount": 180.0, "transaction_count": 3},
+            "1002": {"total_amount": 25.0, "transaction_count": 1}
+        })
+
+    def test_rollups_are_opt_in(self):
+        data_processor = DataProcessor(self.ROWS)
+        data_processor.process_data()
+
+        self.assertIsNone(data_processor.rollups)
+        self.assertEqual(data_processor.observers, [])
+
+    def test_merged_shards_match_whole(self):
+        rows = list(TransactionGenerator(seed=9, account_count=300).iter_rows(5000))
+        whole = DataProcessor(rows, rollups=True)
+        whole.process_data()
+        first = DataProcessor(rows[:2000], rollups=True)
+        first.process_data()
+        second = DataProcessor(rows[2000:], rollups=True)
+        second.process_data()
+        merged = DataProcessor.from_results(first.get_state()).merge(second)
+
+        self.assertEqual(len(merged.rollups), len(whole.rollups))
+        self.assertEqual(merged.rollups.daily(), whole.rollups.daily())
+        self.assertEqual(merged.rollups.monthly().keys(), whole.rollups.monthly().keys())
+        for key, totals in whole.rollups.monthly().items():
+            self.assertAlmostEqual(merged.rollups.monthly()[key]["total_amount"], totals["total_amount"], places=6)
+
+    def test_round_trip_through_json(self):
+        rollups = TransactionRollups()
+        for row in self.ROWS:
+            rollups.observe(row)
+        restored = TransactionRollups.from_dict(json.loads(json.dumps(rollups.to_dict())))
+
+        self.assertEqual(restored.daily(), rollups.daily())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from data_processor.data_processor import DataProcessor
+from data_processor.rule_engine import SuspiciousRuleEngine
+
+
+class TestSuspiciousRuleEngine(unittest.TestCase):
+    """Tests for the compiled suspicious transaction rules."""
+
+    CONFIG = {
+        "large_transaction_threshold": 10000,
+        "currency_thresholds": {"USD": 5000},
+        "uncommon_currencies": ["XRP", "LTC"],
+        "transaction_type_limits": {"withdrawal": 3000},
+        "keyword_rules": {"gambling": ["casino", "online bet"], "crypto": ["bitcoin"]}
+    }
+
+    def make_row(self, amount, currency="CAD", transaction_type="deposit", description="Salary"):
+        return {"Transaction ID": "1", "Account number": "1001", "Date": "2023-03-01",
+                "Transaction type": transaction_type, "Amount": str(amount), "Currency": currency,
+                "Description": description}
+
+    def setUp(self):
+        self.rule_engine = SuspiciousRuleEngine(self.CONFIG)
+
+    def test_per_currency_threshold_overrides_default(self):
+        self.assertEqual(self.rule_engine.evaluate(self.make_row(6000, "USD")), ["large_transaction"])
+        self.assertEqual(self.rule_engine.evaluate(self.make_row(6000, "CAD")), [])
+
+    def test_transaction_type_limit(self):
+        self.assertEqual(self.rule_engine.evaluate(self.make_row(3500, transaction_type="withdrawal")),
+                         ["transaction_type_limit"])
+
+    def test_keyword_rules_match_whole_words_ignoring_case(self):
+        self.assertEqual(self.rule_engine.evaluate(self.make_row(10, description="Casino night, BITCOIN")),
+                         ["gambling", "crypto"])
+        self.assertEqual(self.rule_engine.evaluate(self.make_row(10, description="Casinos")), [])
+
+    def test_all_fired_rules_are_reported(self):
+        self.assertEqual(self.rule_engine.evaluate(self.make_row(20000, "XRP", "withdrawal")),
+                         ["large_transaction", "uncommon_currency", "transaction_type_limit"])
+
+    def test_unknown_configuration_key(self):
+        with self.assertRaises(ValueError):
+            SuspiciousRuleEngine({"thresholds": 1})
+
+    def test_data_processor_records_fired_rules(self):
+        data_processor = DataProcessor([self.make_row(100), self.make_row(6000, "USD")], rule_engine=self.rule_engine)
+        data_processor.process_data()
+        self.assertEqual(len(data_processor.suspicious_transactions), 1)
+        self.assertEqual(data_processor.suspicious_transaction_rules, [["large_transaction"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import random
+import unittest
+
+from data_generator.data_generator import TransactionGenerator
+from data_processor.data_processor import DataProcessor
+from data_processor.sketches import (DailyActiveAccounts, ExactDistinctCounter, ExactTopK, HyperLogLog, SpaceSaving,
+                                     TopAccounts)
+
+
+class TestSpaceSaving(unittest.TestCase):
+
+    def setUp(self):
+        generator = random.Random(11)
+        # Zipf-like stream: key i has weight proportional to 1 / i
+        self.stream = [(f"k{int(1 / generator.random()) % 5000}", generator.uniform(1, 100)) for _ in range(50000)]
+
+    def build(self, counter, stream):
+        for key, weight in stream:
+            counter.add(key, weight)
+        return counter
+
+    def test_estimates_are_within_error_bounds(self):
+        sketch = self.build(SpaceSaving(200), self.stream)
+        exact = dict((key, weight) for key, weight, _ in self.build(ExactTopK(), self.stream).top(10 ** 6))
+
+        self.assertAlmostEqual(sketch.total_weight, sum(weight for _, weight in self.stream))
+        for key, estimate, error in sketch.top(200):
+            self.assertLessEqual(error, sketch.error_bound + 1e-6)
+            self.assertGreaterEqual(estimate + 1e-6, exact[key])
+            self.assertLessEqual(estimate - error, exact[key] + 1e-6)
+        # Every key heavier than the error bound is monitored
+        monitored = {key for key, _, _ in sketch.top(200)}
+        self.assertTrue({key for key, weight in exact.items() if weight > sketch.error_bound} <= monitored)
+
+    def test_top_keys_match_exact(self):
+        sketch = self.build(SpaceSaving(200), self.stream)
+        exact = self.build(ExactTopK(), self.stream)
+
+        self.assertEqual([key for key, _, _ in sketch.top(10)], [key for key, _, _ in exact.top(10)])
+
+    def test_merge_keeps_upper_bounds(self):
+        first = self.build(SpaceSaving(200), self.stream[:25000])
+        second = self.build(SpaceSaving(200), self.stream[25000:])
+        merged = first.merge(second)
+        exact = dict((key, weight) for key, weight, _ in self.build(ExactTopK(), self.stream).top(10 ** 6))
+
+        for key, estimate, error in merged.top(50):
+            self.assertGreaterEqual(estimate + 1e-6, exact[key])
+            self.assertLessEqual(estimate - error, exact[key] + 1e-6)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            SpaceSaving(0)
+
+
+class TestHyperLogLog(unittest.TestCase):
+
+    def test_estimate_is_within_error(self):
+        sketch = HyperLogLog(12)
+        for number in range(100000):
+            sketch.add(str(number))
+            sketch.add(str(number))
+
+        self.assertLess(abs(sketch.count() - 100000) / 100000, 4 * sketch.relative_error)
+
+    def test_small_counts_are_nearly_exact(self):
+        sketch = HyperLogLog()
+        exact = ExactDistinctCounter()
+        for number in range(300):
+            sketch.add(number)
+            exact.add(number)
+
+        self.assertLessEqual(abs(sketch.count() - exact.count()), 3)
+
+    def test_merge_equals_union(self):
+        first, second, union = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+        for number in range(5000):
+            (first if number % 2 else second).add(number)
+            union.add(number)
+
+        self.assertEqual(first.merge(second).count(), union.count())
+        with self.assertRaises(ValueError):
+            first.merge(HyperLogLog(12))
+
+
+class TestObservers(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = list(TransactionGenerator(seed=4, account_count=2000).iter_rows(20000))
+
+    def process(self, *observers):
+        DataProcessor(self.rows, observers=list(observers)).process_data()
+
+    def test_top_accounts_match_exact_mode(self):
+        approximate = TopAccounts(10, capacity=500)
+        exact = TopAccounts(10, exact=True)
+        self.process(approximate, exact)
+
+        self.assertEqual([account["account_number"] for account in approximate.top()],
+                         [account["account_number"] for account in exact.top()])
+        for estimated, actual in zip(approximate.top(), exact.top()):
+            self.assertGreaterEqual(estimated["volume"] + 1e-6, actual["volume"])
+            self.assertLessEqual(estimated["volume"] - estimated["max_overestimate"], actual["volume"] + 1e-6)
+
+    def test_daily_active_accounts_match_exact_mode(self):
+        approximate = DailyActiveAccounts(precision=12)
+        exact = DailyActiveAccounts(exact=True)
+        self.process(approximate, exact)
+
+        approximate_counts, exact_counts = approximate.counts(), exact.counts()
+        self.assertEqual(list(approximate_counts), list(exact_counts))
+        for day, count in exact_counts.items():
+            self.assertLess(abs(approximate_counts[day] - count), max(3, 4 * approximate.relative_error * count))
+
+    def test_observers_merge_across_shards(self):
+        first, second = DailyActiveAccounts(exact=True), DailyActiveAccounts(exact=True)
+        whole = DailyActiveAccounts(exact=True)
+        DataProcessor(self.rows[:10000], observers=[first]).process_data()
+        DataProcessor(self.rows[10000:], observers=[second]).process_data()
+        self.process(whole)
+
+        self.assertEqual(first.merge(second).counts(), whole.counts())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+from benchmark.stage_profiler import StageProfiler
+
+
+class TestStageProfiler(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.profiler = StageProfiler()
+
+    def tearDown(self):
+        self.profiler.stop()
+        self.temp_dir.cleanup()
+
+    def test_stage_records_time_rows_and_memory(self):
+        with self.profiler.stage('read') as stage:
+            data = [str(number) for number in range(10000)]
+            stage["rows"] = len(data)
+
+        measurement = self.profiler.stages['read']
+        self.assertEqual(measurement['rows'], 10000)
+        self.assertGreater(measurement['wall_seconds'], 0)
+        self.assertGreaterEqual(measurement['cpu_seconds'], 0)
+        self.assertGreater(measurement['rows_per_second'], 0)
+        self.assertGreater(measurement['peak_memory_bytes'], 10000 * 40)
+
+    def test_stage_without_rows_has_no_throughput(self):
+        with self.profiler.stage('write'):
+            pass
+
+        self.assertIsNone(self.profiler.stages['write']['rows_per_second'])
+
+    def test_profiled_stage_saves_statistics_and_metrics(self):
+        profile_file = os.path.join(self.temp_dir.name, 'process.prof')
+        with self.profiler.stage('process', profile_file) as stage:
+            stage["rows"] = sum(1 for _ in sorted(range(1000), key=str))
+
+        self.assertTrue(os.path.exists(profile_file))
+        self.assertTrue(self.profiler.top_functions('process'))
+
+        metrics_file = os.path.join(self.temp_dir.name, 'metrics.json')
+        self.profiler.write_metrics(metrics_file)
+        with open(metrics_file) as file:
+            metrics = json.load(file)
+        self.assertEqual(list(metrics['stages']), ['process'])
+        self.assertIn('process', metrics['top_functions'])
+        self.assertAlmostEqual(metrics['total_wall_seconds'], metrics['stages']['process']['wall_seconds'])
+
+    def test_timed_rows_are_taken_out_of_the_consuming_stage(self):
+        def slow_rows():
+            for number in range(50):
+                time.sleep(0.002)
+                yield number
+
+        with self.profiler.stage('process') as stage:
+            stage["rows"] = sum(1 for _ in self.profiler.timed_rows('read', slow_rows()))
+
+        read = self.profiler.stages['read']
+        process = self.profiler.stages['process']
+        self.assertEqual(read['rows'], 50)
+        self.assertGreaterEqual(read['wall_seconds'], 0.1)
+        self.assertIsNone(read['peak_memory_bytes'])
+        self.assertEqual(read['streamed_into'], 'process')
+        self.assertLess(process['wall_seconds'], read['wall_seconds'])
+        self.assertEqual(list(self.profiler.stages), ['read', 'process'])
+
+    def test_stop_ends_tracing(self):
+        self.profiler.stop()
+
+        self.assertFalse(tracemalloc.is_tracing())
+
+
+if __name__ == '__main__':
+    unittest.main()
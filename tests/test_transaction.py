@@ -0,0 +1,34 @@
+import unittest
+from data_processor.transaction import Transaction, as_transaction
+
+
+class TestTransaction(unittest.TestCase):
+    """Tests for the Transaction record parsed once at ingest."""
+
+    ROW = {"Transaction ID": "1", "Account number": "1001", "Date": "2023-03-01",
+           "Transaction type": "deposit", "Amount": "1000", "Currency": "CAD", "Description": "Salary"}
+
+    def test_from_row_parses_amount(self):
+        record = Transaction.from_row(self.ROW)
+        self.assertEqual(record.amount, 1000.0)
+        self.assertIsInstance(record.amount, float)
+        self.assertEqual(record.transaction_type, "deposit")
+
+    def test_column_access_and_to_row(self):
+        record = Transaction.from_row(self.ROW)
+        self.assertEqual(record['Account number'], "1001")
+        self.assertEqual(record.to_row(), {**self.ROW, "Amount": 1000.0})
+        with self.assertRaises(KeyError):
+            record['Missing']
+
+    def test_as_transaction_does_not_reparse(self):
+        record = Transaction.from_row(self.ROW)
+        self.assertIs(as_transaction(record), record)
+
+    def test_record_has_no_instance_dict(self):
+        record = Transaction.from_row(self.ROW)
+        self.assertFalse(hasattr(record, '__dict__'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from data_processor.data_processor import DataProcessor
+from data_processor.velocity_detector import VelocityDetector
+
+
+class TestVelocityDetector(unittest.TestCase):
+    """Tests for the sliding-window velocity detector."""
+
+    @staticmethod
+    def make_row(account_number, day, amount, transaction_type="deposit"):
+        return {"Transaction ID": "1", "Account number": account_number, "Date": day,
+                "Transaction type": transaction_type, "Amount": str(amount), "Currency": "CAD",
+                "Description": "Cash"}
+
+    def test_structuring_within_one_day_is_flagged(self):
+        detector = VelocityDetector(window_days=1, max_total=20000)
+        self.assertFalse(detector.observe(self.make_row("1001", "2023-03-01", 9500)))
+        self.assertFalse(detector.observe(self.make_row("1001", "2023-03-01", 9500)))
+        self.assertTrue(detector.observe(self.make_row("1001", "2023-03-01", 9500)))
+        self.assertEqual(detector.flagged_accounts["1001"]["transaction_count"], 3)
+        self.assertEqual(detector.flagged_accounts["1001"]["total_amount"], 28500.0)
+
+    def test_transactions_leave_the_window(self):
+        detector = VelocityDetector(window_days=2, max_count=2)
+        detector.observe(self.make_row("1001", "2023-03-01", 100))
+        detector.observe(self.make_row("1001", "2023-03-02", 100))
+        # 2023-03-01 has left the two-day window by 2023-03-03
+        self.assertFalse(detector.observe(self.make_row("1001", "2023-03-03", 100)))
+        self.assertTrue(detector.observe(self.make_row("1001", "2023-03-03", 100)))
+        self.assertEqual(detector.flagged_accounts["1001"]["window_end"], "2023-03-03")
+
+    def test_other_transaction_types_are_ignored(self):
+        detector = VelocityDetector(max_count=1)
+        detector.observe(self.make_row("1001", "2023-03-01", 100, "withdrawal"))
+        detector.observe(self.make_row("1001", "2023-03-01", 100, "withdrawal"))
+        self.assertEqual(detector.flagged_accounts, {})
+
+    def test_idle_accounts_are_pruned(self):
+        detector = VelocityDetector(window_days=1, max_count=5, prune_interval=2)
+        detector.observe(self.make_row("1001", "2023-03-01", 100))
+        detector.observe(self.make_row("1002", "2023-03-02", 100))
+        self.assertEqual(detector.tracked_account_count, 1)
+
+    def test_requires_a_limit(self):
+        with self.assertRaises(ValueError):
+            VelocityDetector(window_days=1)
+
+    def test_runs_as_data_processor_observer(self):
+        detector = VelocityDetector(max_count=1)
+        rows = [self.make_row("1001", "2023-03-01", 10), self.make_row("1001", "2023-03-01", 10),
+                self.make_row("1002", "2023-03-01", 10)]
+        DataProcessor(iter(rows), observers=[detector]).process_data()
+        self.assertEqual(list(detector.flagged_accounts), ["1001"])
+
+
+if __name__ == "__main__":
+    unittest.main()